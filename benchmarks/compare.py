@@ -0,0 +1,62 @@
+"""
+Compares the line by line comparison of outputs used before with `oicompare.compare`, on big outputs
+(numbers separated by spaces and line breaks). The second file differs from the first one only in whitespace,
+so both files are read to the end.
+
+Usage: python benchmarks/compare.py [--size MB] [--line-length N]
+"""
+import os
+import re
+import time
+import argparse
+import tempfile
+import itertools
+
+from sinol_make.helpers import oicompare
+
+
+def line_by_line(file1_path, file2_path):
+    with open(file1_path, "r") as file1, open(file2_path, "r") as file2:
+        for line1, line2 in itertools.zip_longest(file1, file2, fillvalue=""):
+            if re.sub(r'[\s\0]+', ' ', line1).strip() != re.sub(r'[\s\0]+', ' ', line2).strip():
+                return False
+    return True
+
+
+METHODS = {
+    "line by line": line_by_line,
+    "chunked": oicompare.compare,
+}
+
+
+def write_output(path, lines, numbers_in_line, separator, line_end):
+    with open(path, "w") as f:
+        for line in range(lines):
+            f.write(separator.join(str((line * numbers_in_line + i) * 7919 % 1000003)
+                                   for i in range(numbers_in_line)) + line_end)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100, help="size of the output in MB")
+    parser.add_argument("--line-length", type=int, default=1, help="numbers in every line")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file1 = os.path.join(tmpdir, "file1.out")
+        file2 = os.path.join(tmpdir, "file2.out")
+        # Numbers have 6 digits on average.
+        lines = args.size * 1024 * 1024 // (7 * args.line_length)
+        write_output(file1, lines, args.line_length, " ", "\n")
+        write_output(file2, lines, args.line_length, "  \t", " \r\n")
+        print(f"Comparing outputs of {os.path.getsize(file1) / 1024 / 1024:.0f}MB and "
+              f"{os.path.getsize(file2) / 1024 / 1024:.0f}MB with {args.line_length} numbers in every line.")
+        for name, method in METHODS.items():
+            start = time.perf_counter()
+            same = method(file1, file2)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>12}: {elapsed:6.2f}s (same: {same})")
+
+
+if __name__ == "__main__":
+    main()
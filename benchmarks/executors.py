@@ -0,0 +1,46 @@
+"""
+Compares the per-execution overhead of the executors measuring time without sio2jail, by running
+a program which exits immediately many times, as happens for packages with thousands of tiny tests.
+
+Usage: python benchmarks/executors.py [--runs N] [--program PATH]
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+from sinol_make.executors.time import TimeExecutor
+from sinol_make.executors.wait4 import Wait4Executor
+from sinol_make.executors.detailed import DetailedExecutor
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=2000, help="number of executions")
+    parser.add_argument("--program", default=shutil.which("true"), help="program to execute")
+    args = parser.parse_args()
+
+    executors = {
+        "detailed": DetailedExecutor(),
+        "wait4": Wait4Executor(),
+    }
+    if shutil.which("time") is not None:
+        executors["time"] = TimeExecutor()
+    else:
+        print("GNU time is not installed, skipping the time executor.")
+
+    executable = os.path.basename(args.program)
+    print(f"Running `{args.program}` {args.runs} times.")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result_file = os.path.join(tmpdir, "result")
+        for name, executor in executors.items():
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                executor.execute([args.program], 1000, 5, 262144, result_file, executable, tmpdir)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>10}: {elapsed:7.3f} s, {elapsed / args.runs * 1000:7.3f} ms per execution")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compares hashing files read whole with the chunked and parallel hashing used by `util.get_files_md5`.
+Every method is run in a separate process, so its peak memory usage can be measured.
+
+Usage: python benchmarks/hashing.py [--files N] [--size MB]
+"""
+import os
+import sys
+import time
+import hashlib
+import argparse
+import resource
+import tempfile
+import subprocess
+
+from sinol_make import util
+
+
+def whole_file(files):
+    for file in files:
+        with open(file, "rb") as f:
+            hashlib.md5(f.read()).hexdigest()
+
+
+def chunked(files):
+    for file in files:
+        util._calculate_file_md5(file)
+
+
+def chunked_parallel(files):
+    util.get_files_md5(files)
+
+
+METHODS = {
+    "whole file": whole_file,
+    "chunked": chunked,
+    "chunked, parallel": chunked_parallel,
+}
+
+
+def run_method(method, files):
+    start = time.perf_counter()
+    METHODS[method](files)
+    elapsed = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{elapsed} {peak_rss_mb}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=8, help="number of files")
+    parser.add_argument("--size", type=int, default=256, help="size of every file in MB")
+    parser.add_argument("--method", choices=METHODS.keys(), help=argparse.SUPPRESS)
+    parser.add_argument("paths", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.method is not None:
+        run_method(args.method, args.paths)
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = []
+        for i in range(args.files):
+            files.append(os.path.join(tmpdir, f"test{i}.in"))
+            with open(files[-1], "wb") as f:
+                for _ in range(args.size):
+                    f.write(os.urandom(1024 * 1024))
+
+        total_mb = args.files * args.size
+        print(f"Hashing {args.files} files, {total_mb} MB in total.")
+        for method in METHODS:
+            # Run in the temporary directory, so the hash index of a package isn't used.
+            output = subprocess.check_output([sys.executable, os.path.abspath(__file__), "--method", method, *files],
+                                             cwd=tmpdir)
+            elapsed, peak_rss_mb = map(float, output.split())
+            print(f"{method:>20}: {elapsed:7.3f} s, {total_mb / elapsed:8.1f} MB/s, peak RSS {peak_rss_mb:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compares looking up limits with `package_util.get_time_limit` and `package_util.get_memory_limit`
+for every test and solution with building the table returned by `package_util.get_limits` once.
+
+Usage: python benchmarks/limits.py [--tests N] [--solutions N]
+"""
+import os
+import time
+import argparse
+import tempfile
+
+import yaml
+
+from sinol_make.helpers import package_util
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tests", type=int, default=500, help="number of tests")
+    parser.add_argument("--solutions", type=int, default=50, help="number of solutions")
+    args = parser.parse_args()
+
+    groups = 10
+    config = {
+        "title": "Benchmark",
+        "sinol_task_id": "abc",
+        "time_limit": 1000,
+        "memory_limit": 262144,
+        "time_limits": {str(group): 1000 * group for group in range(1, groups + 1)},
+        "override_limits": {"py": {"time_limit": 5000}},
+        "scores": {group: 100 // groups for group in range(1, groups + 1)},
+    }
+    tests = [f"in/abc{test % groups + 1}{chr(ord('a') + test // groups % 26)}{test // groups // 26}.in"
+             for test in range(args.tests)]
+    langs = [("cpp", "py", "c")[solution % 3] for solution in range(args.solutions)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        with open("config.yml", "w") as f:
+            yaml.dump(config, f)
+
+        start = time.perf_counter()
+        for lang in langs:
+            for test in tests:
+                package_util.get_time_limit(test, config, lang, "abc")
+                package_util.get_memory_limit(test, config, lang, "abc")
+        per_call = time.perf_counter() - start
+
+        start = time.perf_counter()
+        limits = package_util.get_limits(tests, langs, config, "abc")
+        for lang in langs:
+            for test in tests:
+                limits[lang][test]
+        table = time.perf_counter() - start
+
+    print(f"{args.tests} tests, {args.solutions} solutions, every limit looked up once:")
+    print(f"  get_time_limit / get_memory_limit: {per_call:8.3f} s")
+    print(f"  get_limits table:                  {table:8.3f} s ({per_call / table:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compares total compilation time of C++ solutions including `bits/stdc++.h` with and without the precompiled
+header built by `helpers/pch.py`. The time with the precompiled header includes building it from scratch.
+
+Usage: python benchmarks/pch.py [--solutions N] [--compilation-flags default|oioioi|weak]
+"""
+import os
+import time
+import argparse
+import tempfile
+
+from sinol_make.helpers import compile, pch
+from sinol_make.helpers.cache import create_cache_dirs
+
+
+def compile_all(solutions, compilation_flags):
+    start = time.time()
+    for solution in solutions:
+        with open(os.path.splitext(solution)[0] + ".compile.log", "w") as log:
+            compile.compile(solution, os.path.splitext(solution)[0] + ".e", compile_log=log,
+                            compilation_flags=compilation_flags)
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--solutions", type=int, default=30, help="number of solutions")
+    parser.add_argument("--compilation-flags", default="default", help="group of compilation flags")
+    args = parser.parse_args()
+
+    for name, enabled in [("without precompiled header", "0"), ("with precompiled header", "1")]:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.chdir(tmpdir)
+            create_cache_dirs()
+            os.environ["XDG_CACHE_HOME"] = os.path.join(tmpdir, "user-cache")
+            os.environ[pch.PCH_VARIABLE] = enabled
+            solutions = []
+            for i in range(args.solutions):
+                solutions.append(os.path.join(tmpdir, f"abc{i}.cpp"))
+                with open(solutions[-1], "w") as f:
+                    f.write("#include <bits/stdc++.h>\nusing namespace std;\n"
+                            f"int main() {{ vector<long long> v({i + 1}); iota(v.begin(), v.end(), 0); "
+                            "cout << accumulate(v.begin(), v.end(), 0LL) << endl; }\n")
+            total = compile_all(solutions, args.compilation_flags)
+            print(f"{name:>27}: {total:6.2f}s total, {total / args.solutions:5.2f}s per solution")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Simulates running executions on a pool with the order used by `run` before (solution by solution, test by test)
+and with longest-processing-time-first order used by `Command.schedule_executions`, and compares their
+makespans with the ideal time (total work divided by the number of cpus).
+
+Usage: python benchmarks/scheduling.py [--cpus N] [--solutions N] [--tests N]
+"""
+import heapq
+import random
+import argparse
+
+
+def makespan(times, cpus):
+    """
+    Returns the time after which a pool with `cpus` workers, which take the next task when they are free,
+    finishes all tasks.
+    """
+    workers = [0.0] * cpus
+    for time in times:
+        heapq.heappush(workers, heapq.heappop(workers) + time)
+    return max(workers)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cpus", type=int, default=32, help="number of cpus")
+    parser.add_argument("--solutions", type=int, default=12, help="number of solutions")
+    parser.add_argument("--tests", type=int, default=60, help="number of tests")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    # Tests grow in size, solutions differ in speed and the slowest ones time out on the biggest tests.
+    time_limit = 2.0
+    executions = []
+    for solution in range(args.solutions):
+        slowness = random.uniform(0.05, 3)
+        for test in range(args.tests):
+            size = (test + 1) / args.tests
+            executions.append(min(slowness * size ** 2 * time_limit, 2 * time_limit))
+
+    ideal = max(sum(executions) / args.cpus, max(executions))
+    print(f"{len(executions)} executions on {args.cpus} cpus, ideal makespan {ideal:.2f}s.")
+    for name, order in [("solution by solution", executions),
+                        ("longest first", sorted(executions, reverse=True))]:
+        span = makespan(order, args.cpus)
+        print(f"{name:>22}: makespan {span:7.2f}s, {100 * ideal / span:5.1f}% of ideal")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,22 @@
 # PYTHON_ARGCOMPLETE_OK
+import os
 import sys
 import argparse
 import traceback
-import argcomplete
+from typing import Iterable, Union
 
-from sinol_make import util, sio2jail
-from sinol_make.helpers import cache, oicompare
-
-# Required for side effects
-from sinol_make.task_type.normal import NormalTaskType # noqa
-from sinol_make.task_type.interactive import InteractiveTaskType # noqa
+from sinol_make import util
 
 
 __version__ = "1.9.15"
 
 
-def configure_parsers():
+def configure_parsers(commands: Union[Iterable[str], None] = None):
+    """
+    Creates the parser of arguments.
+    :param commands: Names of commands for which all arguments are configured. Modules of other commands
+                     aren't imported, they are only listed in the help. If None, all commands are configured.
+    """
     parser = argparse.ArgumentParser(
         prog='sinol-make',
         description='Tool for creating and testing sio2 tasks',
@@ -28,16 +29,24 @@ def configure_parsers():
     )
     subparsers.required = False
 
-    commands = util.get_commands()
-
-    for command in commands:
-        command.configure_subparser(subparsers)
+    # Completion needs arguments of all commands.
+    if commands is None or "_ARGCOMPLETE" in os.environ:
+        commands = util.get_command_names()
+    for name, (_, help) in util.COMMANDS.items():
+        if name in commands:
+            util.get_command(name).configure_subparser(subparsers)
+        else:
+            subparsers.add_parser(name, help=help)
 
-    argcomplete.autocomplete(parser)
+    if "_ARGCOMPLETE" in os.environ:
+        import argcomplete
+        argcomplete.autocomplete(parser)
     return parser
 
 
 def check_sio2jail():
+    from sinol_make import sio2jail
+
     if sio2jail.sio2jail_supported() and not sio2jail.check_sio2jail():
         print(util.warning('Up to date `sio2jail` in `~/.local/bin/` not found, installing new version...'))
         try:
@@ -53,41 +62,42 @@ def check_sio2jail():
 
 
 def main_exn():
-    parser = configure_parsers()
     arguments = []
     curr_args = []
-    commands = util.get_commands()
-    commands_dict = {command.get_name(): command for command in commands}
-    commands_short_dict = {command.get_short_name(): command for command in commands if command.get_short_name()}
+    short_names = {short_name: name for name, (short_name, _) in util.COMMANDS.items() if short_name}
     for arg in sys.argv[1:]:
-        if arg in commands_dict.keys() and not (len(curr_args) > 0 and curr_args[0] == 'init'):
+        if arg in util.COMMANDS and not (len(curr_args) > 0 and curr_args[0] == 'init'):
             if curr_args:
                 arguments.append(curr_args)
             curr_args = [arg]
-        elif arg in commands_short_dict.keys() and not (len(curr_args) > 0 and curr_args[0] == 'init'):
+        elif arg in short_names and not (len(curr_args) > 0 and curr_args[0] == 'init'):
             if curr_args:
                 arguments.append(curr_args)
-            curr_args = [commands_short_dict[arg].get_name()]
+            curr_args = [short_names[arg]]
         else:
             curr_args.append(arg)
     if curr_args:
         arguments.append(curr_args)
+    # Only modules of the commands which are run are imported.
+    parser = configure_parsers([curr_args[0] for curr_args in arguments])
     if not arguments:
         parser.print_help()
         exit(1)
+    # Arguments of all commands are parsed before anything is checked or run, so `--help` and
+    # mistakes in arguments are reported right away.
+    all_args = [parser.parse_args(curr_args) for curr_args in arguments]
+    if any(args.command is None for args in all_args):
+        parser.print_help()
+        exit(1)
+
+    from sinol_make.helpers import oicompare
     check_sio2jail()
     oicompare.check_and_download()
-
-    for curr_args in arguments:
-        args = parser.parse_args(curr_args)
-        command = commands_dict.get(args.command, None)
-        if command:
-            if len(arguments) > 1:
-                print(f' {command.get_name()} command '.center(util.get_terminal_size()[1], '='))
-            command.run(args)
-        else:
-            parser.print_help()
-            exit(1)
+    for args in all_args:
+        command = util.get_command(args.command)
+        if len(all_args) > 1:
+            print(f' {command.get_name()} command '.center(util.get_terminal_size()[1], '='))
+        command.run(args)
 
 
 def main():
@@ -1,13 +1,13 @@
 import os
+import functools
 import subprocess
 import threading
 from typing import Dict, List
-import multiprocessing as mp
 
 from sinol_make import util, contest_types
 from sinol_make.commands.chkwer import chkwer_util
 from sinol_make.commands.outgen import outgen_util
-from sinol_make.helpers import package_util, parsers, compiler, compile, printer, paths
+from sinol_make.helpers import cache, package_util, parsers, compiler, compile, printer, paths, pool
 from sinol_make.interfaces.BaseCommand import BaseCommand
 from sinol_make.structs.chkwer_structs import TestResult, ChkwerExecution, TableData, RunResult
 
@@ -36,14 +36,25 @@ class Command(BaseCommand):
                             help='test to run, for example in/abc{0,1}*')
         parser.add_argument('--cerr', action='store_true', help='capture cerr output')
         parsers.add_cpus_argument(parser, 'number of cpus to use when verifying tests')
+        parsers.add_workdir_argument(parser)
         parsers.add_compilation_arguments(parser)
         return parser
 
-    def compile(self, file_path, exe_path, args, name, compilation_flags):
-        print(f'Compiling {name}... ', end='')
+    def start_compilation(self, file_path, exe_path, args, compilation_flags):
+        """
+        Starts compiling the file on the shared pool. The result is printed by `finish_compilation`.
+        """
         compilers = compiler.verify_compilers(args, [file_path])
-        exe, compile_log_path = compile.compile_file(file_path, exe_path, compilers, compilation_flags,
-                                                     use_sanitizers=self.args.sanitize, use_extras=False)
+        return compile.compile_file_async(file_path, exe_path, compilers, self.cpus, compilation_flags,
+                                          use_sanitizers=self.args.sanitize, use_extras=False)
+
+    @staticmethod
+    def finish_compilation(compilation, name):
+        """
+        Waits for the compilation started by `start_compilation` and returns the path to the executable.
+        """
+        exe, compile_log_path = compilation.get()
+        print(f'Compiling {name}... ', end='')
         if exe is None:
             print(util.error('ERROR'))
             compile.print_compile_log(compile_log_path)
@@ -52,7 +63,8 @@ class Command(BaseCommand):
             print(util.info('OK'))
         return exe
 
-    def run_test(self, execution: ChkwerExecution) -> RunResult:
+    @staticmethod
+    def run_test(task_type, execution: ChkwerExecution) -> RunResult:
         """
         Verifies a test and returns the result of chkwer on this test.
         """
@@ -60,7 +72,7 @@ class Command(BaseCommand):
         with open(execution.in_test_path, 'r') as inf, open(output_file, 'w') as outf:
             process = subprocess.Popen([execution.model_exe], stdin=inf, stdout=outf, stderr=subprocess.PIPE)
             _, stderr = process.communicate()
-        ok, points, comment, checker_stderr = self.task_type.check_output(execution.in_test_path, output_file, execution.out_test_path)
+        ok, points, comment, checker_stderr = task_type.check_output(execution.in_test_path, output_file, execution.out_test_path)
 
         return RunResult(execution.in_test_path, ok, int(points), comment, stderr.decode('utf-8'))
 
@@ -83,10 +95,10 @@ class Command(BaseCommand):
 
         keyboard_interrupt = False
         try:
-            with mp.Pool(self.cpus) as pool:
-                for i, result in enumerate(pool.imap(self.run_test, executions)):
-                    table_data.results[result.test_path].set_results(result.points, result.ok, result.comment, result.stderr)
-                    table_data.i = i
+            run_test = functools.partial(self.run_test, self.task_type)
+            for i, result in enumerate(pool.imap(run_test, executions, self.cpus)):
+                table_data.results[result.test_path].set_results(result.points, result.ok, result.comment, result.stderr)
+                table_data.i = i
         except KeyboardInterrupt:
             keyboard_interrupt = True
 
@@ -116,6 +128,9 @@ class Command(BaseCommand):
         else:
             print('Will run on tests: ' + util.bold(', '.join(self.tests)))
         util.change_stack_size_to_unlimited()
+        cache.setup_workdir(package_util.get_workdir(args), sum(
+            os.path.getsize(package_util.get_out_from_in(test)) for test in self.tests
+            if os.path.exists(package_util.get_out_from_in(test))))
 
         additional_files = self.task_type.additional_files_to_compile()
         if len(additional_files) == 0:
@@ -124,10 +139,12 @@ class Command(BaseCommand):
             util.exit_with_error("More than one file to compile found. How is that possible?")
         checker_info = additional_files[0]
         model_solution = outgen_util.get_correct_solution(self.task_id)
-        self.checker_executable = self.compile(checker_info[0], checker_info[1], args, "checker",
-                                               args.compile_mode)
-        self.model_executable = self.compile(model_solution, package_util.get_executable(model_solution), args,
-                                             "model solution", args.compile_mode)
+        # The checker and the model solution are compiled at the same time.
+        checker_compilation = self.start_compilation(checker_info[0], checker_info[1], args, args.compile_mode)
+        model_compilation = self.start_compilation(model_solution, package_util.get_executable(model_solution),
+                                                   args, args.compile_mode)
+        self.checker_executable = self.finish_compilation(checker_compilation, "checker")
+        self.model_executable = self.finish_compilation(model_compilation, "model solution")
         print()
 
         results = self.run_and_print_table(args)
@@ -2,6 +2,7 @@ import argparse
 
 from sinol_make import util
 from sinol_make.commands.ingen import Command as IngenCommand
+from sinol_make.commands.ingen.ingen_util import uses_parallel_ingen
 from sinol_make.commands.outgen import Command as OutgenCommand
 from sinol_make.helpers import parsers, package_util
 from sinol_make.interfaces.BaseCommand import BaseCommand
@@ -34,10 +35,12 @@ class Command(BaseCommand):
                             help='path to ingen source file, for example prog/abcingen.cpp')
         parser.add_argument('-i', '--only-inputs', action='store_true', help='generate input files only')
         parser.add_argument('-o', '--only-outputs', action='store_true', help='generate output files only')
-        parsers.add_cpus_argument(parser, 'number of cpus to use to generate output files')
+        parsers.add_cpus_argument(parser, 'number of cpus to use to generate output files '
+                                          '(and input files, if `sinol_parallel_ingen` is set in config.yml)')
         parser.add_argument('-n', '--no-validate', default=False, action='store_true',
                             help='do not validate test contents')
         parsers.add_overwrite_argument(parser)
+        parsers.add_workdir_argument(parser)
         parsers.add_compilation_arguments(parser)
         return parser
 
@@ -53,14 +56,22 @@ class Command(BaseCommand):
             self.ins = True
             self.outs = True
 
+        outgen_command = OutgenCommand()
+        on_generated = None
+        if self.ins and self.outs and self.task_type.run_outgen():
+            # The correct solution is compiled while ingen is compiled and run.
+            outgen_command.start_compilation(args)
+            # Outputs of inputs generated one by one are generated as soon as their inputs are ready.
+            if uses_parallel_ingen():
+                on_generated = outgen_command.prepare_pipelined_generation()
+
         if self.ins:
             command = IngenCommand()
-            command.run(args)
+            command.run(args, on_generated=on_generated)
 
         if not self.task_type.run_outgen():
             print(util.warning("Outgen is not supported for this task type."))
             return
 
         if self.outs:
-            command = OutgenCommand()
-            command.run(args)
+            outgen_command.run(args)
@@ -3,7 +3,8 @@ import glob
 import os
 
 from sinol_make import util
-from sinol_make.commands.ingen.ingen_util import get_ingen, compile_ingen, run_ingen
+from sinol_make.commands.ingen.ingen_util import get_ingen, compile_ingen, run_ingen, run_ingen_parallel, \
+    uses_parallel_ingen
 from sinol_make.helpers import parsers, package_util, paths
 from sinol_make.interfaces.BaseCommand import BaseCommand
 
@@ -30,7 +31,8 @@ class Command(BaseCommand):
                             help='path to ingen source file, for example prog/abcingen.cpp')
         parser.add_argument('-n', '--no-validate', default=False, action='store_true',
                             help='do not validate test contents')
-        parsers.add_cpus_argument(parser, 'number of cpus used for validating tests')
+        parsers.add_cpus_argument(parser, 'number of cpus used for generating (if `sinol_parallel_ingen` is set '
+                                          'in config.yml) and validating tests')
         parsers.add_compilation_arguments(parser)
         return parser
 
@@ -60,7 +62,11 @@ class Command(BaseCommand):
                     for test in to_delete:
                         os.remove(os.path.join(os.getcwd(), "in", test))
 
-    def run(self, args: argparse.Namespace):
+    def run(self, args: argparse.Namespace, on_generated=None):
+        """
+        :param on_generated: Function called with the path of every input file as soon as it is generated.
+                             It's only called if the package's ingen generates tests one by one.
+        """
         args = util.init_package_command(args)
 
         self.args = args
@@ -83,7 +89,11 @@ class Command(BaseCommand):
             pass
         dates = {os.path.basename(test): os.path.getmtime(test) for test in previous_tests}
 
-        if run_ingen(self.ingen_exe):
+        if uses_parallel_ingen():
+            success = run_ingen_parallel(self.ingen_exe, self.args.cpus, on_generated=on_generated)
+        else:
+            success = run_ingen(self.ingen_exe)
+        if success:
             print(util.info('Successfully generated input files.'))
         else:
             util.exit_with_error('Failed to generate input files.')
@@ -1,11 +1,14 @@
 import stat
+import shlex
 import subprocess
 
 import argparse
 import os
+from typing import Callable, List, Tuple, Union
 
 from sinol_make import util
-from sinol_make.helpers import package_util, compiler, compile
+from sinol_make.helpers import package_util, compiler, compile, pool
+from sinol_make.structs.gen_structs import InputGenerationArguments
 
 
 def ingen_exists(task_id):
@@ -68,6 +71,24 @@ def compile_ingen(ingen_path: str, args: argparse.Namespace, compilation_flags='
     return ingen_exe
 
 
+def _make_executable(ingen_exe):
+    """
+    Makes shell script ingens executable. Returns True if the ingen is a shell script.
+    """
+    is_shell = os.path.splitext(ingen_exe)[1] == '.sh'
+    if is_shell:
+        st = os.stat(ingen_exe)
+        os.chmod(ingen_exe, st.st_mode | stat.S_IEXEC)
+    return is_shell
+
+
+def _ingen_command(ingen_exe, arguments: List[str], is_shell):
+    # Shell ingens are run through the shell, same as when they are run without arguments.
+    if is_shell:
+        return shlex.join([ingen_exe] + arguments)
+    return [ingen_exe] + arguments
+
+
 def run_ingen(ingen_exe, working_dir=None):
     """
     Runs ingen and generates all input files.
@@ -78,10 +99,7 @@ def run_ingen(ingen_exe, working_dir=None):
     if working_dir is None:
         working_dir = os.path.join(os.getcwd(), 'in')
 
-    is_shell = os.path.splitext(ingen_exe)[1] == '.sh'
-    if is_shell:
-        st = os.stat(ingen_exe)
-        os.chmod(ingen_exe, st.st_mode | stat.S_IEXEC)
+    is_shell = _make_executable(ingen_exe)
 
     print(util.bold(' Ingen output '.center(util.get_terminal_size()[1], '=')))
     process = subprocess.Popen([ingen_exe], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
@@ -109,3 +127,85 @@ def run_ingen(ingen_exe, working_dir=None):
                            '--no-fsanitize flag.'))
 
     return exit_code == 0
+
+
+def uses_parallel_ingen(config=None):
+    """
+    Returns True if the package's ingen supports generating tests one by one (`sinol_parallel_ingen` key
+    in config.yml). Such an ingen prints names of all input files it generates, one per line,
+    when run with `--list` and generates only the given input file when run with `--only <name>`.
+    """
+    if config is None:
+        config = package_util.get_config()
+    return bool(config.get('sinol_parallel_ingen', False))
+
+
+def list_ingen_tests(ingen_exe, working_dir) -> Union[List[str], None]:
+    """
+    Runs ingen with `--list` and returns names of the input files it generates
+    or None if ingen failed.
+    """
+    is_shell = _make_executable(ingen_exe)
+    process = subprocess.run(_ingen_command(ingen_exe, ['--list'], is_shell), stdout=subprocess.PIPE,
+                             stderr=subprocess.PIPE, cwd=working_dir, shell=is_shell)
+    if process.returncode != 0:
+        print(util.error('Ingen failed to list input files:'))
+        print(process.stderr.decode('utf-8'), end='\n\n')
+        return None
+    return [line.strip() for line in process.stdout.decode('utf-8').splitlines() if line.strip()]
+
+
+def generate_input(arguments: InputGenerationArguments) -> Tuple[int, str, str]:
+    """
+    Generates a single input file with ingen.
+    :param arguments: arguments for input generation (type InputGenerationArguments)
+    :return: tuple of ingen's exit code, stdout and stderr
+    """
+    is_shell = os.path.splitext(arguments.ingen_exe)[1] == '.sh'
+    process = subprocess.run(_ingen_command(arguments.ingen_exe, ['--only', arguments.test], is_shell),
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=arguments.working_dir,
+                             shell=is_shell)
+    return process.returncode, process.stdout.decode('utf-8'), process.stderr.decode('utf-8')
+
+
+def run_ingen_parallel(ingen_exe, cpus, working_dir=None, on_generated: Callable[[str], None] = None):
+    """
+    Runs ingen separately for every input file it generates, on `cpus` cpus.
+    :param ingen_exe: path to ingen executable
+    :param cpus: number of cpus to use
+    :param working_dir: working directory for ingen. If None, then {os.getcwd()}/in is used.
+    :param on_generated: function called with the path of every input file as soon as it is generated,
+                         for example to start generating its output.
+    :return: True if ingen was successful, False otherwise
+    """
+    if working_dir is None:
+        working_dir = os.path.join(os.getcwd(), 'in')
+
+    tests = list_ingen_tests(ingen_exe, working_dir)
+    if tests is None:
+        return False
+    print(f'Generating {len(tests)} input files on {cpus} cpus.')
+    arguments = [InputGenerationArguments(ingen_exe, test, working_dir) for test in tests]
+    success = True
+    sanitizer_error = False
+    # Tasks are submitted lazily, so outputs of already generated inputs don't wait for all inputs.
+    for i, (exit_code, stdout, stderr), _ in pool.imap_unordered(generate_input, arguments, cpus, lazy=True):
+        test = tests[i]
+        if stdout:
+            print(stdout, end='' if stdout.endswith('\n') else '\n')
+        if stderr:
+            print(util.error(f'Ingen error output on {test}:'))
+            print(stderr, end='\n\n')
+        sanitizer_error = sanitizer_error or util.has_sanitizer_error(stdout + stderr, exit_code)
+        input_path = os.path.join(working_dir, test)
+        if exit_code != 0 or not os.path.exists(input_path):
+            print(util.error(f'Failed to generate input file {test}'))
+            success = False
+        elif on_generated is not None:
+            on_generated(input_path)
+
+    if sanitizer_error:
+        print(util.warning('Warning: if ingen failed due to sanitizer errors, you can either run '
+                           '`sudo sysctl vm.mmap_rnd_bits=28` to fix this or disable sanitizers with the '
+                           '--no-fsanitize flag.'))
+    return success
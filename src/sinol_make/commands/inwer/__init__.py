@@ -4,13 +4,12 @@ import signal
 import threading
 import argparse
 import os
-import multiprocessing as mp
 from functools import cmp_to_key
 from typing import Dict, List
 
 from sinol_make import util, contest_types
 from sinol_make.structs.inwer_structs import TestResult, InwerExecution, VerificationResult, TableData
-from sinol_make.helpers import package_util, printer, paths, parsers
+from sinol_make.helpers import package_util, printer, paths, parsers, pool
 from sinol_make.interfaces.BaseCommand import BaseCommand
 from sinol_make.commands.inwer import inwer_util
 
@@ -88,12 +87,11 @@ class Command(BaseCommand):
         keyboard_interrupt = False
         sanitizer_error = False
         try:
-            with mp.Pool(self.cpus) as pool:
-                for i, result in enumerate(pool.imap(self.verify_test, executions)):
-                    table_data.results[result.test_path].set_results(result.valid, result.output)
-                    table_data.i = i
-                    if util.has_sanitizer_error(result.output, 0 if result.valid else 1):
-                        sanitizer_error = True
+            for i, result in enumerate(pool.imap(self.verify_test, executions, self.cpus)):
+                table_data.results[result.test_path].set_results(result.valid, result.output)
+                table_data.i = i
+                if util.has_sanitizer_error(result.output, 0 if result.valid else 1):
+                    sanitizer_error = True
         except KeyboardInterrupt:
             keyboard_interrupt = True
 
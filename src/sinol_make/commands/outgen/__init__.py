@@ -2,14 +2,15 @@ import argparse
 import glob
 import os
 import yaml
+import functools
 
-from typing import Dict, List, Tuple, Union
-import multiprocessing as mp
+from typing import Callable, Dict, List, Tuple, Union
 
 from sinol_make import util
-from sinol_make.commands.outgen.outgen_util import get_correct_solution, compile_correct_solution, generate_output
+from sinol_make.commands.outgen.outgen_util import get_correct_solution, compile_correct_solution, generate_output, \
+    start_correct_solution_compilation, finish_correct_solution_compilation
 from sinol_make.structs.gen_structs import OutputGenerationArguments, OutputVerificationArguments
-from sinol_make.helpers import parsers, package_util, cache, compile, compiler, paths
+from sinol_make.helpers import parsers, package_util, cache, compile, compiler, paths, pool
 from sinol_make.interfaces.BaseCommand import BaseCommand
 
 
@@ -18,6 +19,14 @@ class Command(BaseCommand):
     Class for `gen` command.
     """
 
+    def __init__(self):
+        self.correct_solution_exe = None
+        # Compilation of the correct solution started by `start_compilation`.
+        self.correct_solution_compilation = None
+        # Outputs whose generation was started while the inputs were generated,
+        # mapping the output's path to the md5 sum of its input and the pending result.
+        self.pregenerated = {}
+
     def get_name(self):
         return "outgen"
 
@@ -31,6 +40,7 @@ class Command(BaseCommand):
         parser.add_argument('-n', '--no-validate', default=False, action='store_true',
                             help='do not validate test contents')
         parsers.add_overwrite_argument(parser)
+        parsers.add_workdir_argument(parser)
         parsers.add_compilation_arguments(parser)
         return parser
 
@@ -63,24 +73,23 @@ class Command(BaseCommand):
         Exits with an error if any of the output files couldn't be generated.
         :return: Dictionary mapping the basename of each generated output to its md5 sum.
         """
-        with mp.Pool(self.args.cpus) as pool:
-            results = []
-            md5_sums = {}
-            for i, (result, stderr, md5_sum) in enumerate(pool.imap(generate_output, arguments)):
-                results.append(result)
-                output_file = os.path.basename(arguments[i].output_test)
-                if stderr:
-                    print(util.error(f'Outgen stderr on {output_file}:'))
-                    print(stderr.decode('utf-8'), end='\n\n')
-                if result:
-                    md5_sums[output_file] = md5_sum
-                    print(f'Successfully generated output file {output_file}')
-                else:
-                    print(util.error(f'Failed to generate output file {output_file}'))
-
-            if not all(results):
-                util.exit_with_error('Failed to generate some output files.')
-            return md5_sums
+        results = []
+        md5_sums = {}
+        for i, (result, stderr, md5_sum) in enumerate(pool.imap(generate_output, arguments, self.args.cpus)):
+            results.append(result)
+            output_file = os.path.basename(arguments[i].output_test)
+            if stderr:
+                print(util.error(f'Outgen stderr on {output_file}:'))
+                print(stderr.decode('utf-8'), end='\n\n')
+            if result:
+                md5_sums[output_file] = md5_sum
+                print(f'Successfully generated output file {output_file}')
+            else:
+                print(util.error(f'Failed to generate output file {output_file}'))
+
+        if not all(results):
+            util.exit_with_error('Failed to generate some output files.')
+        return md5_sums
 
     def calculate_md5_sums(self, tests=None):
         """
@@ -100,14 +109,13 @@ class Command(BaseCommand):
         except (yaml.YAMLError, OSError):
             pass
 
-        md5_sums = {}
+        md5_sums = {os.path.basename(file): md5 for file, md5 in util.get_files_md5(tests).items()}
         outputs_to_generate = []
         from_inputs = []
         for file in tests:
             basename = os.path.basename(file)
             output_basename = os.path.splitext(os.path.basename(basename))[0] + '.out'
             output_path = os.path.join(os.getcwd(), 'out', output_basename)
-            md5_sums[basename] = util.get_file_md5(file)
 
             if old_md5_sums is None or old_md5_sums.get(basename, '') != md5_sums[basename]:
                 outputs_to_generate.append(output_path)
@@ -191,29 +199,43 @@ class Command(BaseCommand):
                 to_verify.append((input, output))
         return to_generate, to_verify
 
-    def compile_checker(self):
+    def start_checker_compilation(self):
         """
-        Compiles the checker, if the package has one.
+        Starts compiling the checker, if the package has one, on the shared pool.
+        :return: List of pairs (name of the compiled file, compilation) for `finish_checker_compilation`.
         """
+        compilations = []
         for additional_file in self.task_type.additional_files_to_compile():
             file_path, exe_path, name = additional_file[0], additional_file[1], additional_file[2]
-            print(f'Compiling {name}... ', end='')
             compilers = compiler.verify_compilers(self.args, [file_path])
-            exe, compile_log_path = compile.compile_file(file_path, exe_path, compilers, self.args.compile_mode,
-                                                         use_sanitizers=self.args.sanitize, use_extras=False)
+            compilations.append((name, compile.compile_file_async(file_path, exe_path, compilers, self.args.cpus,
+                                                                  self.args.compile_mode,
+                                                                  use_sanitizers=self.args.sanitize,
+                                                                  use_extras=False)))
+        return compilations
+
+    @staticmethod
+    def finish_checker_compilation(compilations):
+        """
+        Waits for the compilations started by `start_checker_compilation`.
+        """
+        for name, compilation in compilations:
+            exe, compile_log_path = compilation.get()
+            print(f'Compiling {name}... ', end='')
             if exe is None:
                 print(util.error('ERROR'))
                 util.exit_with_error(f'Failed {name} compilation.',
                                      lambda: compile.print_compile_log(compile_log_path))
             print(util.info('OK'))
 
-    def verify_output(self, arguments: OutputVerificationArguments) -> Tuple[str, bool, str]:
+    @staticmethod
+    def verify_output(task_type, arguments: OutputVerificationArguments) -> Tuple[str, bool, str]:
         """
         Checks whether the output file which wasn't generated by sinol-make is correct.
         :return: Tuple of the verified output file, whether it is correct and the checker's comment.
         """
-        ok, points, comment, _ = self.task_type.check_output(arguments.input_test, arguments.output_test,
-                                                             arguments.model_output_test)
+        ok, points, comment, _ = task_type.check_output(arguments.input_test, arguments.output_test,
+                                                        arguments.model_output_test)
         return arguments.output_test, ok and points == 100, comment
 
     def verify_outputs(self, to_verify: List[Tuple[str, str]]):
@@ -226,25 +248,27 @@ class Command(BaseCommand):
         print(f'{len(to_verify)} output files were not generated by sinol-make and won\'t be overwritten.')
         print(f'Generating the correct solution\'s outputs for them on {self.args.cpus} cpus.')
         self.task_type = package_util.get_task_type('time', None)
+        # The checker is compiled while the outputs are generated.
+        checker_compilations = self.start_checker_compilation()
         arguments = [OutputGenerationArguments(self.correct_solution_exe, input,
                                                paths.get_outgen_path(os.path.basename(output)))
                      for input, output in to_verify]
         self.run_generation(arguments)
-        self.compile_checker()
+        self.finish_checker_compilation(checker_compilations)
 
         print(f'Verifying {len(to_verify)} output files which were not generated by sinol-make.')
 
         executions = [OutputVerificationArguments(input, output, generation.output_test)
                       for (input, output), generation in zip(to_verify, arguments)]
         wrong = []
-        with mp.Pool(self.args.cpus) as pool:
-            for output, ok, comment in pool.imap(self.verify_output, executions):
-                if ok:
-                    print(util.info(f'Output file {os.path.basename(output)} is correct, leaving it unchanged.'))
-                else:
-                    wrong.append((output, comment))
-                    print(util.error(f'Output file {os.path.basename(output)} is wrong.'
-                                     + (f' Checker comment: {comment}' if comment else '')))
+        verify_output = functools.partial(self.verify_output, self.task_type)
+        for output, ok, comment in pool.imap(verify_output, executions, self.args.cpus):
+            if ok:
+                print(util.info(f'Output file {os.path.basename(output)} is correct, leaving it unchanged.'))
+            else:
+                wrong.append((output, comment))
+                print(util.error(f'Output file {os.path.basename(output)} is wrong.'
+                                 + (f' Checker comment: {comment}' if comment else '')))
 
         if wrong:
             util.exit_with_error(
@@ -254,17 +278,95 @@ class Command(BaseCommand):
                 f'run this command with the --overwrite flag.')
         print(util.info('All output files which were not generated by sinol-make are correct.'))
 
+    def start_compilation(self, args: argparse.Namespace):
+        """
+        Starts compiling the correct solution on the shared pool, so that it's compiled while ingen
+        is compiled and run. `run` then waits for it instead of compiling the solution.
+        """
+        self.args = util.init_package_command(args)
+        self.task_id = package_util.get_task_id()
+        # Compiling the solution marks it as unchanged, so it has to be checked for changes first.
+        cache.check_correct_solution(self.task_id)
+        self.correct_solution_compilation = start_correct_solution_compilation(
+            get_correct_solution(self.task_id), self.args, self.args.cpus, self.args.compile_mode,
+            use_sanitizers=self.args.sanitize)
+
+    def get_correct_solution_exe(self):
+        """
+        Returns path to the compiled correct solution, compiling it or waiting for the compilation
+        started by `start_compilation` if needed.
+        """
+        if self.correct_solution_exe is None:
+            if self.correct_solution_compilation is not None:
+                self.correct_solution_exe = finish_correct_solution_compilation(self.correct_solution_compilation)
+            else:
+                self.correct_solution_exe = compile_correct_solution(self.correct_solution, self.args,
+                                                                     self.args.compile_mode,
+                                                                     use_sanitizers=self.args.sanitize)
+        return self.correct_solution_exe
+
+    def prepare_pipelined_generation(self) -> Callable[[str], None]:
+        """
+        Prepares generating outputs while ingen is still generating the inputs, after `start_compilation`.
+        Returns a function, which should be called with the path of every input file as soon as it is
+        generated. It starts generating the output on the shared pool if the input changed and the output
+        can be overwritten. `run` then doesn't generate these outputs again.
+        """
+        util.change_stack_size_to_unlimited()
+        generated_outputs = self.load_generated_outputs()
+        if generated_outputs is None:
+            generated_outputs = self.create_generated_outputs()
+
+        def on_generated(input_path):
+            md5_sums, outputs_to_generate, from_inputs = self.calculate_md5_sums([input_path])
+            if self.args.overwrite:
+                to_generate = list(zip(from_inputs, outputs_to_generate))
+            else:
+                to_generate, _ = self.split_outputs(outputs_to_generate, from_inputs, generated_outputs)
+            for input, output in to_generate:
+                arguments = OutputGenerationArguments(self.get_correct_solution_exe(), input, output)
+                self.pregenerated[output] = (md5_sums[os.path.basename(input)],
+                                             pool.apply_async(generate_output, (arguments,), self.args.cpus))
+
+        return on_generated
+
+    def collect_pregenerated_outputs(self, md5_sums: Dict[str, str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Waits for the outputs started by `prepare_pipelined_generation`.
+        Exits with an error if any of them couldn't be generated.
+        :param md5_sums: Md5 sums of the current input files.
+        :return: Tuple of a dictionary mapping the basename of each generated output to its md5 sum
+                 and a list of paths of outputs which are up to date with their inputs.
+        """
+        generated = {}
+        up_to_date = []
+        failed = False
+        for output, (input_md5, async_result) in self.pregenerated.items():
+            result, stderr, md5_sum = async_result.get()
+            output_file = os.path.basename(output)
+            if stderr:
+                print(util.error(f'Outgen stderr on {output_file}:'))
+                print(stderr.decode('utf-8'), end='\n\n')
+            if not result:
+                print(util.error(f'Failed to generate output file {output_file}'))
+                failed = True
+                continue
+            # The output was written by sinol-make, so it can be overwritten if its input changed since.
+            generated[output_file] = md5_sum
+            if md5_sums.get(os.path.splitext(output_file)[0] + '.in') == input_md5:
+                up_to_date.append(output)
+        self.pregenerated = {}
+        if failed:
+            util.exit_with_error('Failed to generate some output files.')
+        if up_to_date:
+            print(f'Generated {len(up_to_date)} output files while generating the input files.')
+        return generated, up_to_date
+
     def clean_cache(self, inputs):
         """
         Cleans cache for the given input files.
         """
-        md5_sums = [util.get_file_md5(file) for file in inputs]
-        for solution in glob.glob(paths.get_cache_path("md5sums", "*")):
-            sol_cache = cache.get_cache_file(solution)
-            for input in md5_sums:
-                if input in sol_cache.tests:
-                    del sol_cache.tests[input]
-            sol_cache.save(solution)
+        cache.remove_results_cache(list(util.get_files_md5(inputs).values()))
 
     def run(self, args: argparse.Namespace):
         args = util.init_package_command(args)
@@ -283,20 +385,25 @@ class Command(BaseCommand):
         generated_outputs = self.load_generated_outputs()
         if generated_outputs is None:
             generated_outputs = self.create_generated_outputs()
+        pregenerated, up_to_date = self.collect_pregenerated_outputs(md5_sums)
+        if pregenerated:
+            generated_outputs.update(pregenerated)
+            self.save_generated_outputs(generated_outputs)
 
         if self.args.overwrite:
             to_generate = list(zip(from_inputs, outputs_to_generate))
             to_verify = []
         else:
             to_generate, to_verify = self.split_outputs(outputs_to_generate, from_inputs, generated_outputs)
+        to_generate = [(input, output) for input, output in to_generate if output not in up_to_date]
+        # Outputs which can't be overwritten are generated in the outgen directory and compared.
+        cache.setup_workdir(package_util.get_workdir(self.args), sum(os.path.getsize(output) for _, output in to_verify))
 
         if len(outputs_to_generate) == 0:
             print(util.info('All output files are up to date.'))
         else:
             self.clean_cache(from_inputs)
-            self.correct_solution_exe = compile_correct_solution(self.correct_solution, self.args,
-                                                                 self.args.compile_mode,
-                                                                 use_sanitizers=self.args.sanitize)
+            self.get_correct_solution_exe()
             if to_generate:
                 generated_outputs.update(self.generate_outputs([output for _, output in to_generate],
                                                                [input for input, _ in to_generate]))
@@ -26,8 +26,34 @@ def compile_correct_solution(solution_path: str, args: argparse.Namespace, compi
     Compiles correct solution and returns path to compiled executable.
     """
     compilers = compiler.verify_compilers(args, [solution_path])
-    correct_solution_exe, compile_log_path = compile.compile_file(solution_path, package_util.get_executable(solution_path), compilers,
-                                                                  compilation_flags, use_sanitizers=use_sanitizers)
+    return check_correct_solution_compilation(*compile.compile_file(
+        solution_path, package_util.get_executable(solution_path), compilers, compilation_flags,
+        use_sanitizers=use_sanitizers))
+
+
+def start_correct_solution_compilation(solution_path: str, args: argparse.Namespace, processes: int,
+                                       compilation_flags='default', use_sanitizers='no'):
+    """
+    Starts compiling correct solution on the shared pool. The path to the compiled executable
+    is returned by `finish_correct_solution_compilation`.
+    """
+    compilers = compiler.verify_compilers(args, [solution_path])
+    return compile.compile_file_async(solution_path, package_util.get_executable(solution_path), compilers,
+                                      processes, compilation_flags, use_sanitizers=use_sanitizers)
+
+
+def finish_correct_solution_compilation(compilation):
+    """
+    Waits for the compilation started by `start_correct_solution_compilation`
+    and returns path to compiled executable.
+    """
+    return check_correct_solution_compilation(*compilation.get())
+
+
+def check_correct_solution_compilation(correct_solution_exe, compile_log_path):
+    """
+    Exits with an error if correct solution failed to compile, returns path to compiled executable otherwise.
+    """
     if correct_solution_exe is None:
         util.exit_with_error('Failed compilation of correct solution.',
                                   lambda: compile.print_compile_log(compile_log_path))
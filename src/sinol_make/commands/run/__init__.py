@@ -8,17 +8,19 @@ import os
 import collections
 import sys
 import math
+import time
+import functools
+import copy
 import dictdiffer
-import multiprocessing as mp
-from io import StringIO
-from typing import Dict
+from typing import Dict, List, Union
 
 from sinol_make import contest_types, util, sio2jail
+from sinol_make.executors import cgroups
 from sinol_make.structs.run_structs import ExecutionData, PrintData
-from sinol_make.structs.cache_structs import CacheTest, CacheFile
+from sinol_make.structs.cache_structs import CacheTest
 from sinol_make.interfaces.BaseCommand import BaseCommand
 from sinol_make.interfaces.Errors import CompilationError, UnknownContestType
-from sinol_make.helpers import compile, compiler, package_util, printer, paths, cache, parsers
+from sinol_make.helpers import compile, compiler, package_util, printer, paths, cache, parsers, pool
 from sinol_make.structs.status_structs import Status, ResultChange, PointsChange, ValidationResult, ExecutionResult, \
     TotalPointsChange
 
@@ -48,6 +50,7 @@ def color_time(time, limit):
 def colorize_status(status):
     if status == Status.OK: return util.bold(util.color_green(status))
     if status == Status.PENDING: return util.warning(status)
+    if status == Status.SKIPPED: return util.color_gray(status.value)
     return util.error(status)
 
 
@@ -61,7 +64,7 @@ def colorize_points(points, min_points, max_points):
 
 
 def update_group_status(group_status, new_status):
-    order = [Status.CE, Status.TL, Status.ML, Status.RE, Status.WA, Status.OK, Status.PENDING]
+    order = [Status.CE, Status.TL, Status.ML, Status.RE, Status.WA, Status.OK, Status.SKIPPED, Status.PENDING]
     if order.index(new_status) < order.index(group_status):
         return new_status
     return group_status
@@ -103,206 +106,268 @@ def calculate_group_result(contest, own_results, prerequisite_results, group_max
     return combined_points, combined_status, True
 
 
-def print_view(term_width, term_height, task_id, program_groups_scores, all_results, print_data: PrintData, names, executions,
-               groups, scores, tests, possible_score, cpus, hide_memory, config, contest, args):
-    width = term_width - 11  # First column has 6 characters, the " | " separator has 3 characters and 2 for margin
-    # First column has 11 characters and each solution has 13 characters and the " | " separator has 3 characters
-    programs_in_row = width // 16
-    if programs_in_row == 0:
-        return ["Terminal window is too small to display the results."], None, None
-
-    previous_stdout = sys.stdout
-    output = StringIO()
-    sys.stdout = output
-
-    program_scores = collections.defaultdict(int)
-    # program_times and program_memory are dictionaries of tuples (max, limit),
-    # where max is the maximum time/memory used by a program and
-    # limit is the time/memory limit of the test that caused the maximum
-    # time/memory usage.
-    program_times = collections.defaultdict(lambda: (-1, 0))
-    program_memory = collections.defaultdict(lambda: (-1, 0))
-
-    dependencies = package_util.get_subtask_dependencies(config)
-    any_group_lowered = False
-
-    time_sum = 0
-    for solution in names:
-        lang = package_util.get_file_lang(solution)
-        for test in tests:
-            time_sum += package_util.get_time_limit(test, config, lang, task_id, args)
-
-    time_remaining = (len(executions) - print_data.i - 1) * 2 * time_sum / cpus / 1000.0
-    title = 'Done %4d/%4d. Time remaining (in the worst case): %5d seconds.' \
-            % (print_data.i + 1, len(executions), time_remaining)
-    title = title.center(term_width)
-    margin = "  "
-    for program_ix in range(0, len(names), programs_in_row):
-        program_group = names[program_ix:program_ix + programs_in_row]
-
-        def print_table_end():
-            print("-" * 8, end="-+-")
-            for i in range(len(program_group)):
-                if i != len(program_group) - 1:
-                    print("-" * 13, end="-+-")
-                else:
-                    print("-" * 13, end="-+")
-            print()
-
-        print_table_end()
-
-        print(margin + "groups", end=" | ")
-        next_row = {solution: solution for solution in program_group}
-        first = True
-        while next_row != {}:
-            if first:
-                first = False
-            else:
-                print(margin + " " * 6, end=" | ")
-
-            for solution in program_group:
-                if solution in next_row:
-                    to_print = next_row[solution]
-                    if len(to_print) > 13:
-                        print(to_print[:13], end=" | ")
-                        next_row[solution] = to_print[13:]
-                    else:
-                        print(to_print.ljust(13), end=" | ")
-                        del next_row[solution]
-                else:
-                    print(" " * 13, end=" | ")
-            print()
+class ResultsView:
+    """
+    Table with results of `run`, printed while the solutions are running and after they finish.
+    Text of every cell of the table is kept between redraws. New results are only queued with
+    `add_result` and when the table is printed, only the cells and lines affected by them are computed
+    again, so a redraw costs as much as the results that arrived since the previous one.
+    Also fills `program_groups_scores` with scores of the groups.
+    """
 
-        print(8 * "-", end=" | ")
-        for program in program_group:
-            print(13 * "-", end=" | ")
-        print()
+    def __init__(self, task_id, program_groups_scores, all_results, print_data: PrintData, names, executions,
+                 groups, scores, tests, possible_score, cpus, hide_memory, config, contest, limits):
+        self.program_groups_scores = program_groups_scores
+        self.all_results = all_results
+        self.print_data = print_data
+        self.names = names
+        self.executions = executions
+        self.groups = groups
+        self.scores = scores
+        self.tests = tests
+        self.possible_score = possible_score
+        self.cpus = cpus
+        self.hide_memory = hide_memory
+        self.contest = contest
+        self.limits = limits
+        self.program_indexes = {program: i for i, program in enumerate(names)}
+        self.langs = {program: package_util.get_file_lang(program) for program in names}
+        self.test_groups = {test: package_util.get_group(test, task_id) for test in tests}
+        self.test_ids = {test: package_util.extract_test_id(test, task_id) for test in tests}
+        self.dependencies = package_util.get_subtask_dependencies(config)
+        # Groups which have to be scored again when a result in the group changes.
+        self.dependent_groups = collections.defaultdict(set)
         for group in groups:
-            print(margin + "%6s" % group, end=" | ")
-            for program in program_group:
-                lang = package_util.get_file_lang(program)
-                results = all_results[program][group]
-                # Tests of the groups this group depends on. Groups that were not run are skipped.
-                prerequisite_results = {}
-                for prerequisite in dependencies.get(group, []):
-                    prerequisite_results.update(all_results[program].get(prerequisite, {}))
-
-                for test in results:
-                    status = results[test].Status
-                    if results[test].Time is not None:
-                        if program_times[program][0] < results[test].Time:
-                            program_times[program] = (results[test].Time, package_util.get_time_limit(test, config,
-                                                                                                      lang, task_id, args))
-                    elif status == Status.TL:
-                        program_times[program] = (2 * package_util.get_time_limit(test, config, lang, task_id, args),
-                                                  package_util.get_time_limit(test, config, lang, task_id, args))
-                    if results[test].Memory is not None:
-                        if program_memory[program][0] < results[test].Memory:
-                            program_memory[program] = (results[test].Memory, package_util.get_memory_limit(test, config,
-                                                                                                           lang, task_id, args))
-                    elif status == Status.ML:
-                        program_memory[program] = (2 * package_util.get_memory_limit(test, config, lang, task_id, args),
-                                                   package_util.get_memory_limit(test, config, lang, task_id, args))
-
-                points, group_status, lowered = calculate_group_result(contest, results, prerequisite_results,
-                                                                       scores[group])
-                if lowered:
-                    any_group_lowered = True
-                if any(result.Status == Status.PENDING
-                       for result in list(results.values()) + list(prerequisite_results.values())):
-                    print(" " * 6 + ("?" * len(str(scores[group]))).rjust(3) +
-                          f'/{str(scores[group]).rjust(3)}', end=' | ')
-                else:
-                    # A group whose score was lowered by a dependency is marked with an asterisk.
-                    status_str = (group_status + "*" if lowered else group_status).ljust(6)
-                    if group_status == Status.OK:
-                        status_text = util.bold(util.color_green(status_str))
-                    else:
-                        status_text = util.bold(util.color_red(status_str))
-                    print(f"{status_text}{str(int(points)).rjust(3)}/{str(scores[group]).rjust(3)}", end=' | ')
-                program_groups_scores[program][group] = {"status": group_status, "points": points}
-            print()
-        for program in program_group:
-            program_scores[program] = contest.get_global_score(program_groups_scores[program], possible_score)
-
-        print(8 * " ", end=" | ")
-        for program in program_group:
-            print(13 * " ", end=" | ")
-        print()
-        print(margin + "points", end=" | ")
-        for program in program_group:
-            print(util.bold("      %3s/%3s" % (program_scores[program], possible_score)), end=" | ")
-        print()
-        print(margin + "  time", end=" | ")
-        for program in program_group:
-            program_time = program_times[program]
-            print(util.bold(("%23s" % color_time(program_time[0], program_time[1]))
-                            if program_time[0] < 2 * program_time[1] and program_time[0] >= 0
-                            else "      " + 7 * '-'), end=" | ")
-        print()
-        print(margin + "memory", end=" | ")
-        for program in program_group:
-            program_mem = program_memory[program]
-            print(util.bold(("%23s" % color_memory(program_mem[0], program_mem[1]))
-                            if program_mem[0] < 2 * program_mem[1] and program_mem[0] >= 0
-                            else "      " + 7 * '-'), end=" | ")
-        print()
-        print(8*" ", end=" | ")
-        for program in program_group:
-            print(13*" ", end=" | ")
-        print()
+            self.dependent_groups[group].add(group)
+            for prerequisite in self.dependencies.get(group, []):
+                self.dependent_groups[prerequisite].add(group)
+
+        time_sum = 0
+        for program in names:
+            for test in tests:
+                time_sum += limits[self.langs[program]][test][0]
+        self.time_sum = time_sum
+
+        # Results which arrived since the table was last printed. Results are added by the main thread
+        # and processed by the printing thread.
+        self.new_results = collections.deque()
+        # Text of the cells, keyed by (program, row), where row is ("group", group), ("points",), ("time",),
+        # ("memory",), ("test", test) or ("test_memory", test).
+        self.cells = {}
+        # Cells which changed since the lines of the table were last updated.
+        self.dirty_cells = set()
+        # program_times and program_memory are dictionaries of tuples (max, limit),
+        # where max is the maximum time/memory used by a program and
+        # limit is the time/memory limit of the test that caused the maximum
+        # time/memory usage.
+        self.program_times = collections.defaultdict(lambda: (-1, 0))
+        self.program_memory = collections.defaultdict(lambda: (-1, 0))
+        # Groups whose score was lowered because of a dependency.
+        self.lowered_groups = set()
+        for program in names:
+            for test in tests:
+                self._update_test(program, test)
+            for group in groups:
+                self._update_group(program, group)
+            self._update_summary(program)
+
+        # Lines of the table for the current terminal width and their indexes in `self.lines`.
+        self.programs_in_row = None
+        self.lines = []
+        self.line_indexes = {}
+
+    def add_result(self, program, test):
+        """
+        Marks a new result of a program on a test, which has to be stored in `all_results` beforehand.
+        """
+        self.new_results.append((program, test))
+
+    def _set_cell(self, program, row, text):
+        if self.cells.get((program, row)) != text:
+            self.cells[(program, row)] = text
+            self.dirty_cells.add((program, row))
+
+    def _update_test(self, program, test):
+        lang = self.langs[program]
+        time_limit, memory_limit = self.limits[lang][test]
+        result = self.all_results[program][self.test_groups[test]][test]
+        status = result.Status
+        if status == Status.PENDING:
+            self._set_cell(program, ("test", test), 13 * ' ')
+        else:
+            self._set_cell(program, ("test", test), "%3s" % colorize_status(status) + " " +
+                           (("%20s" % color_time(result.Time, time_limit)) if result.Time is not None else 10 * " "))
+        if not self.hide_memory:
+            if status not in (Status.PENDING, Status.SKIPPED):
+                points = colorize_points(int(result.Points), self.contest.min_score_per_test(),
+                                         self.contest.max_score_per_test()).ljust(13)
+            else:
+                points = 3 * " "
+            self._set_cell(program, ("test_memory", test), points +
+                           (("%20s" % color_memory(result.Memory, memory_limit)) if result.Memory is not None
+                            else 10 * " "))
+
+        if result.Time is not None:
+            if self.program_times[program][0] < result.Time:
+                self.program_times[program] = (result.Time, time_limit)
+        elif status == Status.TL and self.program_times[program][0] < 2 * time_limit:
+            self.program_times[program] = (2 * time_limit, time_limit)
+        if result.Memory is not None:
+            if self.program_memory[program][0] < result.Memory:
+                self.program_memory[program] = (result.Memory, memory_limit)
+        elif status == Status.ML and self.program_memory[program][0] < 2 * memory_limit:
+            self.program_memory[program] = (2 * memory_limit, memory_limit)
+
+    def _update_group(self, program, group):
+        results = self.all_results[program][group]
+        # Tests of the groups this group depends on. Groups that were not run are skipped.
+        prerequisite_results = {}
+        for prerequisite in self.dependencies.get(group, []):
+            prerequisite_results.update(self.all_results[program].get(prerequisite, {}))
+
+        points, group_status, lowered = calculate_group_result(self.contest, results, prerequisite_results,
+                                                               self.scores[group])
+        if lowered:
+            self.lowered_groups.add((program, group))
+        else:
+            self.lowered_groups.discard((program, group))
+        if any(result.Status == Status.PENDING
+               for result in list(results.values()) + list(prerequisite_results.values())):
+            text = " " * 6 + ("?" * len(str(self.scores[group]))).rjust(3) + f'/{str(self.scores[group]).rjust(3)}'
+        else:
+            # A group whose score was lowered by a dependency is marked with an asterisk.
+            status_str = (group_status + "*" if lowered else group_status).ljust(6)
+            if group_status == Status.OK:
+                status_text = util.bold(util.color_green(status_str))
+            else:
+                status_text = util.bold(util.color_red(status_str))
+            text = f"{status_text}{str(int(points)).rjust(3)}/{str(self.scores[group]).rjust(3)}"
+        self._set_cell(program, ("group", group), text)
+        self.program_groups_scores[program][group] = {"status": group_status, "points": points}
+
+    def _update_summary(self, program):
+        program_score = self.contest.get_global_score(self.program_groups_scores[program], self.possible_score)
+        self._set_cell(program, ("points",), util.bold("      %3s/%3s" % (program_score, self.possible_score)))
+        program_time = self.program_times[program]
+        self._set_cell(program, ("time",), util.bold(("%23s" % color_time(program_time[0], program_time[1]))
+                                                     if program_time[0] < 2 * program_time[1] and program_time[0] >= 0
+                                                     else "      " + 7 * '-'))
+        program_mem = self.program_memory[program]
+        self._set_cell(program, ("memory",), util.bold(("%23s" % color_memory(program_mem[0], program_mem[1]))
+                                                       if program_mem[0] < 2 * program_mem[1] and program_mem[0] >= 0
+                                                       else "      " + 7 * '-'))
+
+    def _process_new_results(self):
+        while self.new_results:
+            program, test = self.new_results.popleft()
+            self._update_test(program, test)
+            for group in self.dependent_groups[self.test_groups[test]]:
+                self._update_group(program, group)
+            self._update_summary(program)
+
+    def _row_line(self, program_group, row):
+        margin = "  "
+        if row[0] == "group":
+            line = margin + "%6s" % row[1] + " | "
+        elif row[0] == "test":
+            line = margin + "%6s" % self.test_ids[row[1]] + " | "
+        elif row[0] in ("points", "time", "memory"):
+            line = margin + row[0].rjust(6) + " | "
+        else:
+            line = 8 * " " + " | "
+        return line + "".join(self.cells[(program, row)] + " | " for program in program_group)
 
-        def print_group_seperator():
-            print(8 * "-", end=" | ")
-            for program in program_group:
-                print(13 * "-", end=" | ")
-            print()
-
-        print_group_seperator()
-
-        last_group = None
-        for test in tests:
-            group = package_util.get_group(test, task_id)
-            if last_group != group:
-                if last_group is not None:
-                    print_group_seperator()
-                last_group = group
-
-            print(margin + "%6s" % package_util.extract_test_id(test, task_id), end=" | ")
-            for program in program_group:
-                lang = package_util.get_file_lang(program)
-                result = all_results[program][package_util.get_group(test, task_id)][test]
-                status = result.Status
-                if status == Status.PENDING: print(13 * ' ', end=" | ")
-                else:
-                    print("%3s" % colorize_status(status),
-                         ("%20s" % color_time(result.Time, package_util.get_time_limit(test, config, lang, task_id, args)))
-                         if result.Time is not None else 10*" ", end=" | ")
-            print()
-            if not hide_memory:
-                print(8*" ", end=" | ")
-                for program in program_group:
-                    lang = package_util.get_file_lang(program)
-                    result = all_results[program][package_util.get_group(test, task_id)][test]
-                    if result.Status != Status.PENDING:
-                        print(colorize_points(int(result.Points), contest.min_score_per_test(),
-                                              contest.max_score_per_test()).ljust(13), end="")
+    def _build_lines(self, programs_in_row):
+        """
+        Builds all lines of the table for the given number of programs in a row.
+        """
+        margin = "  "
+        self.programs_in_row = programs_in_row
+        self.lines = []
+        self.line_indexes = {}
+        self.dirty_cells.clear()
+        for program_ix in range(0, len(self.names), programs_in_row):
+            program_group = self.names[program_ix:program_ix + programs_in_row]
+            table_end = "-" * 8 + "-+-" + "-+-".join("-" * 13 for _ in program_group) + "-+"
+            empty_line = 8 * " " + " | " + "".join(13 * " " + " | " for _ in program_group)
+            group_separator = 8 * "-" + " | " + "".join(13 * "-" + " | " for _ in program_group)
+
+            def add_row(row):
+                self.line_indexes[(program_ix, row)] = len(self.lines)
+                self.lines.append(self._row_line(program_group, row))
+
+            self.lines.append(table_end)
+            next_row = {solution: solution for solution in program_group}
+            line = margin + "groups" + " | "
+            while next_row != {}:
+                for solution in program_group:
+                    if solution in next_row:
+                        to_print = next_row[solution]
+                        if len(to_print) > 13:
+                            line += to_print[:13] + " | "
+                            next_row[solution] = to_print[13:]
+                        else:
+                            line += to_print.ljust(13) + " | "
+                            del next_row[solution]
                     else:
-                        print(3*" ", end="")
-                    print(("%20s" % color_memory(result.Memory, package_util.get_memory_limit(test, config, lang, task_id, args)))
-                          if result.Memory is not None else 10*" ", end=" | ")
-                print()
-
-        print_table_end()
-        print()
+                        line += " " * 13 + " | "
+                self.lines.append(line)
+                line = margin + " " * 6 + " | "
+            self.lines.append(group_separator)
+
+            for group in self.groups:
+                add_row(("group", group))
+            self.lines.append(empty_line)
+            for row in [("points",), ("time",), ("memory",)]:
+                add_row(row)
+            self.lines.append(empty_line)
+            self.lines.append(group_separator)
+
+            last_group = None
+            for test in self.tests:
+                group = self.test_groups[test]
+                if last_group != group:
+                    if last_group is not None:
+                        self.lines.append(group_separator)
+                    last_group = group
+                add_row(("test", test))
+                if not self.hide_memory:
+                    add_row(("test_memory", test))
+
+            self.lines.append(table_end)
+            self.lines.append("")
+
+    def print_view(self, term_width, term_height):
+        """
+        Returns lines of the table, title and footer, as expected by `printer.printer`.
+        """
+        width = term_width - 11  # First column has 6 characters, the " | " separator has 3 characters and 2 for margin
+        # First column has 11 characters and each solution has 13 characters and the " | " separator has 3 characters
+        programs_in_row = width // 16
+        if programs_in_row <= 0:
+            return ["Terminal window is too small to display the results."], None, None
+
+        self._process_new_results()
+        if programs_in_row != self.programs_in_row:
+            self._build_lines(programs_in_row)
+        else:
+            for program, row in self.dirty_cells:
+                program_ix = self.program_indexes[program] // programs_in_row * programs_in_row
+                self.lines[self.line_indexes[(program_ix, row)]] = \
+                    self._row_line(self.names[program_ix:program_ix + programs_in_row], row)
+            self.dirty_cells.clear()
 
-    if any_group_lowered:
-        print(util.warning("* the score of this group was lowered, because a group it depends on "
-                           "(see `subtask_dependencies` in config.yml) didn't score maximum points."))
-        print()
+        output = list(self.lines)
+        if self.lowered_groups:
+            output.append(util.warning("* the score of this group was lowered, because a group it depends on "
+                                       "(see `subtask_dependencies` in config.yml) didn't score maximum points."))
+            output.append("")
 
-    sys.stdout = previous_stdout
-    return output.getvalue().splitlines(), title, "Use arrows to move."
+        time_remaining = (len(self.executions) - self.print_data.i - 1) * 2 * self.time_sum / self.cpus / 1000.0
+        title = 'Done %4d/%4d. Time remaining (in the worst case): %5d seconds.' \
+                % (self.print_data.i + 1, len(self.executions), time_remaining)
+        title = title.center(term_width)
+        return output, title, "Use arrows to move."
 
 
 class Command(BaseCommand):
@@ -348,6 +413,9 @@ class Command(BaseCommand):
                             help='allow running the script without full outputs')
         parser.add_argument('-o', '--comments', dest='comments', action='store_true',
                             help="show checker's comments")
+        parsers.add_early_termination_argument(parser)
+        parsers.add_stream_outputs_argument(parser)
+        parsers.add_workdir_argument(parser)
         parsers.add_compilation_arguments(parser, custom_sanitize_help='When using sanitizers, make sure '
                                           'that you are running with `time` tool for measuring time and memory. '
                                           'Sio2jail does not support sanitizers.')
@@ -391,59 +459,208 @@ class Command(BaseCommand):
     def compile_solutions(self, solutions):
         print("Compiling %d solutions..." % len(solutions))
         args = [(solution, None, True, False, None) for solution in solutions]
-        with mp.Pool(self.cpus) as pool:
-            compilation_results = pool.starmap(self.compile, args)
-        return compilation_results
+        return pool.starmap(self.compile, args, self.cpus)
 
-    def compile(self, solution, dest=None, use_extras=False, clear_cache=False, name=None):
-        compile_log_file = paths.get_compilation_log_path("%s.compile_log" % package_util.get_file_name(solution))
-        source_file = os.path.join(os.getcwd(), "prog", self.get_solution_from_exe(solution))
+    def compile(self, solution, dest=None, use_extras=False, clear_cache=False, name=None, print_result=True):
+        """
+        Compiles the solution. If `print_result` is False, the result isn't printed
+        and `print_compilation_result` should be called later.
+        """
+        compile_log_file = self.get_compile_log_path(solution)
+        source_file, extra_compilation_args, extra_compilation_files = self.get_compilation_arguments(solution,
+                                                                                                     use_extras)
         if dest:
             output = dest
         else:
             output = paths.get_executables_path(package_util.get_executable(solution))
-        name = name or "file " + package_util.get_file_name(solution)
 
+        try:
+            with open(compile_log_file, "w") as compile_log:
+                compile.compile(source_file, output, self.compilers, compile_log, self.args.compile_mode,
+                                extra_compilation_args, extra_compilation_files, clear_cache=clear_cache,
+                                use_sanitizers=self.args.sanitize)
+            success = True
+        except CompilationError:
+            success = False
+        if print_result:
+            self.print_compilation_result(solution, success, name)
+        return success
+
+    def get_compilation_arguments(self, solution, use_extras=True):
+        """
+        Returns the path to the source of the solution and the extra compilation arguments and files
+        it's compiled with.
+        """
+        source_file = os.path.join(os.getcwd(), "prog", self.get_solution_from_exe(solution))
         extra_compilation_args = []
         extra_compilation_files = []
         if use_extras:
             lang = package_util.get_file_lang(source_file)
             extra_compilation_args = package_util.get_extra_compilation_args(lang, self.config)
             extra_compilation_files = package_util.get_extra_compilation_files(self.config)
+        return source_file, extra_compilation_args, extra_compilation_files
 
-        try:
-            with open(compile_log_file, "w") as compile_log:
-                compile.compile(source_file, output, self.compilers, compile_log, self.args.compile_mode,
-                                extra_compilation_args, extra_compilation_files, clear_cache=clear_cache,
-                                use_sanitizers=self.args.sanitize)
+    def is_compiled(self, solution, use_extras=True):
+        """
+        Checks if `compile` with the same `use_extras` would use the cached executable of the solution.
+        Cached results of solutions which have to be compiled again are removed when they are compiled.
+        """
+        source_file, extra_compilation_args, extra_compilation_files = self.get_compilation_arguments(solution,
+                                                                                                     use_extras)
+        return compile.is_compiled(source_file, self.args.compile_mode, extra_compilation_args,
+                                   extra_compilation_files, self.args.sanitize)
+
+    def get_compilation_key(self, solution):
+        """
+        Returns a key which is the same for solutions compiled to identical executables.
+        """
+        source_file, extra_compilation_args, extra_compilation_files = self.get_compilation_arguments(solution)
+        return compile.get_compilation_key(source_file, self.args.compile_mode, extra_compilation_args,
+                                           extra_compilation_files, self.args.sanitize)
+
+    def link_compiled(self, solution, executable, output):
+        """
+        Uses `executable` of a solution with the same compilation key as the executable of the solution,
+        as if it was compiled to `output`.
+        """
+        source_file, extra_compilation_args, extra_compilation_files = self.get_compilation_arguments(solution)
+        compile.link_compiled(source_file, executable, output, self.args.compile_mode, extra_compilation_args,
+                              extra_compilation_files, self.args.sanitize)
+
+    def compile_quietly(self, arguments):
+        """
+        Runs `compile` with the given arguments without printing the result.
+        """
+        return self.compile(*arguments, print_result=False)
+
+    @staticmethod
+    def get_compile_log_path(solution):
+        return paths.get_compilation_log_path("%s.compile_log" % package_util.get_file_name(solution))
+
+    def print_compilation_result(self, solution, success, name=None):
+        name = name or "file " + package_util.get_file_name(solution)
+        if success:
             print(util.info(f"Compilation of {name} was successful."))
-            return True
-        except CompilationError as e:
+        else:
             print(util.error(f"Compilation of {name} was unsuccessful."))
-            compile.print_compile_log(compile_log_file)
-            return False
+            compile.print_compile_log(self.get_compile_log_path(solution))
 
     def run_solution(self, data_for_execution: ExecutionData):
         """
         Run an execution and return the result as ExecutionResult object.
         """
+        return self.run_execution(self.task_type, self.ID, data_for_execution)
 
+    @staticmethod
+    def run_execution(task_type, task_id, data_for_execution: ExecutionData):
+        """
+        Same as `run_solution`, but needs only the task type and the task id, so the whole
+        command doesn't have to be sent to the workers with every execution.
+        """
         (name, executable, test, time_limit, memory_limit, timetool_path, execution_dir) = data_for_execution
-        file_no_ext = paths.get_executions_path(name, package_util.extract_test_id(test, self.ID))
+        file_no_ext = paths.get_executions_path(name, package_util.extract_test_id(test, task_id))
         output_file = file_no_ext + ".out"
         result_file = file_no_ext + ".res"
         hard_time_limit = math.ceil(2 * time_limit / 1000.0)
 
-        return self.task_type.run(time_limit, hard_time_limit, memory_limit, test, output_file,
-                                  package_util.get_out_from_in(test), result_file, executable, execution_dir)
+        return task_type.run(time_limit, hard_time_limit, memory_limit, test, output_file,
+                             package_util.get_out_from_in(test), result_file, executable, execution_dir)
+
+    @staticmethod
+    def predict_execution_time(cached_result: Union[CacheTest, None], time_limit: int, test_size: int,
+                               max_test_size: int) -> float:
+        """
+        Predicts how long (in milliseconds) an execution will take. If the solution was already run on the test
+        (even with different limits), the previous time is used. Otherwise the time limit is scaled by the size
+        of the test relative to the biggest test.
+        """
+        hard_time_limit = 2 * time_limit
+        if cached_result is not None:
+            result = cached_result.result
+            if result.Status == Status.TL:
+                return hard_time_limit
+            if result.Time is not None:
+                return min(result.Time, hard_time_limit)
+        if max_test_size == 0:
+            return time_limit
+        return time_limit * test_size / max_test_size
+
+    def schedule_executions(self, executions, predicted_times):
+        """
+        Sorts executions by their predicted time, longest first (LPT scheduling), so the longest executions
+        don't start last and leave most of the cpus idle at the end.
+        :param predicted_times: List of predicted times of executions, in the same order as `executions`.
+        :return: Sorted executions.
+        """
+        order = sorted(range(len(executions)),
+                       key=lambda i: (-predicted_times[i], package_util.get_executable_key(executions[i][1], self.ID),
+                                      executions[i][2]))
+        return [executions[i] for i in order]
+
+    def print_makespan(self, makespan: float, execution_times: List[float]):
+        """
+        Prints how long the executions took compared to the ideal time, in which all cpus are busy until the end.
+        """
+        if not execution_times:
+            return
+        ideal = max(sum(execution_times) / self.cpus, max(execution_times))
+        print(f'Executions took {makespan:.2f}s, ideal time on {self.cpus} cpus is {ideal:.2f}s '
+              f'({100 * ideal / makespan if makespan > 0 else 100:.0f}% efficiency).')
 
-    def run_solutions(self, compiled_commands, names, solutions, executables_dir):
+    @staticmethod
+    def print_checker_cache_stats(checker_cached: List[bool]):
+        """
+        Prints how many verdicts of the checker were taken from the cache.
+        :param checker_cached: For every checked output, whether its verdict was cached.
+        """
+        if not checker_cached:
+            return
+        hits = sum(checker_cached)
+        print(f'Checker cache: {hits}/{len(checker_cached)} outputs already checked '
+              f'({100 * hits / len(checker_cached):.0f}% hit rate).')
+
+    def is_group_result_known(self, name, group, results):
+        """
+        Checks if the result of a program on a group can't change after running its remaining tests.
+        This is the case when the program got the minimum score for the group and its status is either TL
+        (worse statuses are only possible without running the program) or the status expected in config.yml.
+        :param results: Dictionary: {"<test>": ExecutionResult} with the tests of the group.
+        """
+        finished = [result for result in results.values() if result.Status not in (Status.PENDING, Status.SKIPPED)]
+        if not finished:
+            return False
+        group_score = self.scores.get(group, 0)
+        min_score = self.contest.get_group_score([self.contest.min_score_per_test()], group_score)
+        if self.contest.get_group_score([result.Points for result in finished], group_score) > min_score:
+            return False
+        status = Status.OK
+        for result in finished:
+            status = update_group_status(status, result.Status)
+        if status == Status.OK:
+            # Groups worth 0 points always have the minimum score.
+            return False
+        if status == Status.TL:
+            return True
+        if self.args.ignore_expected:
+            return False
+        expected = self.config.get("sinol_expected_scores", {}).get(name, {}).get("expected", {}).get(group)
+        return expected is not None and expected["status"] == status
+
+    def run_solutions(self, compiled_commands, names, solutions, executables_dir, additional_files=()):
         """
         Run solutions on tests and print the results as a table to stdout.
+        :param compiled_commands: Triples (name, executable, result of compilation). If the result is None,
+                                  the solution is compiled on the same workers as the executions, which start
+                                  as soon as it's compiled.
+        :param additional_files: Additional files to compile (as returned by
+                                 `task_type.additional_files_to_compile`). They are compiled on the same workers
+                                 and every execution starts after they are compiled.
         """
 
         executions = []
-        all_cache_files: Dict[str, CacheFile] = {}
+        predicted_times = []
+        test_sizes = {test: os.path.getsize(test) for test in self.tests}
+        max_test_size = max(test_sizes.values(), default=0)
         all_results = collections.defaultdict(
             lambda: collections.defaultdict(lambda: collections.defaultdict(map)))
 
@@ -454,66 +671,197 @@ class Command(BaseCommand):
         for file in glob.glob(os.path.join(os.getcwd(), "prog", f"_{self.ID}lib.so")):
             shutil.copy(file, executables_dir)
 
+        # Arguments of `compile` for the programs compiled on the same workers as the executions:
+        # first the additional files, then the solutions.
+        compilations = [(file, dest, False, clear_cache, name)
+                        for file, dest, name, clear_cache, _ in additional_files]
+        # Compiling a changed additional file which clears the cache removes all cached results.
+        results_invalidated = any(clear_cache and not self.is_compiled(file, use_extras=False)
+                                  for file, _, _, clear_cache, _ in additional_files)
+        # Solutions with identical sources compiled with the same arguments have identical executables.
+        # Only the first of them is compiled, and every test is run once for all of them.
+        identical_to = {}
+        identical_solutions = collections.defaultdict(list)
+        first_identical = {}
+        for (name, executable, result) in compiled_commands:
+            if result is not False:
+                identical_to[name] = first_identical.setdefault(self.get_compilation_key(name), name)
+                identical_solutions[identical_to[name]].append(name)
+        executables = {name: executable for (name, executable, _) in compiled_commands}
+        # Solutions which are compiled while other solutions are already running, mapped to their indexes
+        # in `compilations`.
+        to_compile = {}
+        # Solutions which get the executable of an identical solution after it's compiled,
+        # grouped by the index of its compilation.
+        to_link = collections.defaultdict(list)
+        # Cached results of the solutions, used for predicting execution times:
+        # {"<solution>": {"<md5 of test>": CacheTest}}.
+        previous_results = {}
+        # Cached results which are still valid: {"<solution>": {"<test>": ExecutionResult}}.
+        valid_results = {}
         for (name, executable, result) in compiled_commands:
             lang = package_util.get_file_lang(name)
-            solution_cache = cache.get_cache_file(os.path.join(os.getcwd(), "prog", name))
-            all_cache_files[name] = solution_cache
-
-            if result:
+            cached_results = cache.get_test_results(os.path.join(os.getcwd(), "prog", name))
+            if result is None:
+                is_compiled = self.is_compiled(name)
+                identical = identical_to[name]
+                if identical != name and identical in to_compile and not is_compiled:
+                    to_compile[name] = to_compile[identical]
+                    to_link[to_compile[name]].append(name)
+                else:
+                    to_compile[name] = len(compilations)
+                    compilations.append((name, None, True, False, None))
+                if results_invalidated or not is_compiled:
+                    cached_results = {}
+
+            if result or result is None:
+                previous_results[name] = cached_results
+                valid_results[name] = {}
                 for test in self.tests:
-                    test_time_limit = package_util.get_time_limit(test, self.config, lang, self.ID, self.args)
-                    test_memory_limit = package_util.get_memory_limit(test, self.config, lang, self.ID, self.args)
-
-                    test_result: CacheTest = solution_cache.tests.get(self.test_md5sums[os.path.basename(test)], None)
+                    test_time_limit, test_memory_limit = self.limits[lang][test]
+                    test_result: CacheTest = cached_results.get(self.test_md5sums[os.path.basename(test)], None)
                     if test_result is not None and test_result.time_limit == test_time_limit and \
                             test_result.memory_limit == test_memory_limit and \
                             test_result.time_tool == self.timetool_name:
-                        all_results[name][self.get_group(test)][test] = test_result.result
-                    else:
-                        executions.append((name, executable, test, test_time_limit, test_memory_limit,
-                                           self.timetool_path, os.path.dirname(executable)))
-                        all_results[name][self.get_group(test)][test] = ExecutionResult(Status.PENDING)
-                os.makedirs(paths.get_executions_path(name), exist_ok=True)
+                        valid_results[name][test] = test_result.result
             else:
                 for test in self.tests:
                     all_results[name][self.get_group(test)][test] = ExecutionResult(Status.CE)
+
+        # Executions which are run once for identical solutions with the same limits, mapped
+        # to the other solutions which get their results.
+        shared_executions = {}
+        followers = collections.defaultdict(list)
+        for (name, executable, result) in compiled_commands:
+            if name not in valid_results:
+                continue
+            lang = package_util.get_file_lang(name)
+            for test in self.tests:
+                test_time_limit, test_memory_limit = self.limits[lang][test]
+                if test in valid_results[name]:
+                    all_results[name][self.get_group(test)][test] = valid_results[name][test]
+                    continue
+                identical_result = next((valid_results[solution][test]
+                                         for solution in identical_solutions[identical_to[name]]
+                                         if test in valid_results[solution]), None)
+                if identical_result is not None:
+                    all_results[name][self.get_group(test)][test] = copy.copy(identical_result)
+                    continue
+                shared_execution = (identical_to[name], test, test_time_limit, test_memory_limit)
+                if shared_execution in shared_executions:
+                    followers[shared_executions[shared_execution]].append(name)
+                else:
+                    shared_executions[shared_execution] = (name, test)
+                    test_result = previous_results[name].get(self.test_md5sums[os.path.basename(test)], None)
+                    executions.append((name, executable, test, test_time_limit, test_memory_limit,
+                                       self.timetool_path, os.path.dirname(executable)))
+                    predicted_times.append(self.predict_execution_time(test_result, test_time_limit,
+                                                                       test_sizes[test], max_test_size))
+                all_results[name][self.get_group(test)][test] = ExecutionResult(Status.PENDING)
+            os.makedirs(paths.get_executions_path(name), exist_ok=True)
         print()
-        executions.sort(key = lambda x: (package_util.get_executable_key(x[1], self.ID), x[2]))
+        executions = self.schedule_executions(executions, predicted_times)
         program_groups_scores = collections.defaultdict(dict)
         print_data = PrintData(0)
+        view = ResultsView(self.ID, program_groups_scores, all_results, print_data, names, executions, self.groups,
+                           self.scores, self.tests, self.possible_score, self.cpus, self.args.hide_memory, self.config,
+                           self.contest, self.limits)
 
         has_terminal, terminal_width, terminal_height = util.get_terminal_size()
 
         if has_terminal:
             run_event = threading.Event()
             run_event.set()
-            thr = threading.Thread(target=printer.printer_thread,
-                                   args=(run_event, print_view, self.ID, program_groups_scores, all_results, print_data,
-                                         names, executions, self.groups, self.scores, self.tests, self.possible_score,
-                                         self.cpus, self.args.hide_memory, self.config, self.contest, self.args))
+            thr = threading.Thread(target=printer.printer_thread, args=(run_event, view.print_view))
             thr.start()
 
-        pool = mp.Pool(self.cpus)
+        # Pairs (program, group) whose result is already known, so their remaining tests are skipped.
+        determined_groups = set()
+        skip = None
+        if self.args.early_termination:
+            skip = lambda execution: all((solution, self.get_group(execution[2])) in determined_groups
+                                         for solution in [execution[0]] + followers[execution[0], execution[2]])
+
+        # Results of compilations, which are printed after the table if it's shown in the terminal.
+        compilation_results = []
+        failed_additional_files = []
+
+        def report_compilation(name, success, compiled_name=None):
+            if has_terminal:
+                compilation_results.append((name, success, compiled_name))
+            else:
+                self.print_compilation_result(name, success, compiled_name)
+
+        def on_compiled(index, success):
+            name = compilations[index][0]
+            report_compilation(name, success, compilations[index][4])
+            if index < len(additional_files):
+                if not success and additional_files[index][4]:
+                    failed_additional_files.append(name)
+                    return False
+                return True
+            for solution in to_link[index]:
+                shutil.copy(self.get_compile_log_path(name), self.get_compile_log_path(solution))
+                if success:
+                    self.link_compiled(solution, executables[name], executables[solution])
+                report_compilation(solution, success)
+            if not success:
+                for solution in [name] + to_link[index]:
+                    self.failed_compilations.append(solution)
+                    for test in self.tests:
+                        all_results[solution][self.get_group(test)][test] = ExecutionResult(Status.CE)
+                        view.add_result(solution, test)
+            return success
+
         keyboard_interrupt = False
+        execution_times = []
+        checker_cached = []
+        start_time = time.perf_counter()
         try:
-            for i, result in enumerate(pool.imap(self.run_solution, executions)):
-                (name, executable, test, time_limit, memory_limit) = executions[i][:5]
-                contest_points = self.contest.get_test_score(result, time_limit, memory_limit)
-                result.Points = contest_points
-                all_results[name][self.get_group(test)][test] = result
-                print_data.i = i
-
-                # We store the result in dictionary to write it to cache files later.
-                lang = package_util.get_file_lang(name)
-                test_time_limit = package_util.get_time_limit(test, self.config, lang, self.ID, self.args)
-                test_memory_limit = package_util.get_memory_limit(test, self.config, lang, self.ID, self.args)
-                all_cache_files[name].tests[self.test_md5sums[os.path.basename(test)]] = CacheTest(
-                    time_limit=test_time_limit,
-                    memory_limit=test_memory_limit,
-                    time_tool=self.timetool_name,
-                    result=result
-                )
-            pool.terminate()
+            # Every result is saved to the cache as soon as it's available, so an interrupted run
+            # can be resumed without executing the finished tests again.
+            with cache.test_results_writer() as save_test_result:
+                run_execution = functools.partial(self.run_execution, self.task_type, self.ID)
+                if compilations:
+                    additional_indexes = list(range(len(additional_files)))
+                    results = pool.imap_unordered_after(
+                        run_execution, executions, self.cpus, self.compile_quietly, compilations,
+                        lambda execution: additional_indexes + ([to_compile[execution[0]]]
+                                                                if execution[0] in to_compile else []),
+                        on_compiled, skip)
+                else:
+                    results = pool.imap_unordered(run_execution, executions, self.cpus, skip)
+                for done, (i, result, execution_time) in enumerate(results):
+                    (name, executable, test, time_limit, memory_limit) = executions[i][:5]
+                    group = self.get_group(test)
+                    print_data.i = done
+                    if result is not None:
+                        execution_times.append(execution_time)
+                        if result.CheckerCached is not None:
+                            checker_cached.append(result.CheckerCached)
+                        result.Points = self.contest.get_test_score(result, time_limit, memory_limit)
+                    # Identical solutions get the same result.
+                    for solution in [name] + followers[name, test]:
+                        if solution in self.failed_compilations:
+                            continue
+                        if result is None:
+                            all_results[solution][group][test] = ExecutionResult(
+                                Status.SKIPPED, Points=self.contest.min_score_per_test())
+                            view.add_result(solution, test)
+                            continue
+                        solution_result = result if solution == name else copy.copy(result)
+                        all_results[solution][group][test] = solution_result
+                        view.add_result(solution, test)
+                        if self.args.early_termination and \
+                                self.is_group_result_known(solution, group, all_results[solution][group]):
+                            determined_groups.add((solution, group))
+
+                        save_test_result(solution, self.test_md5sums[os.path.basename(test)], CacheTest(
+                            time_limit=time_limit,
+                            memory_limit=memory_limit,
+                            time_tool=self.timetool_name,
+                            result=solution_result
+                        ))
         except KeyboardInterrupt:
             keyboard_interrupt = True
             pool.terminate()
@@ -522,28 +870,33 @@ class Command(BaseCommand):
                 run_event.clear()
                 thr.join()
 
-        print("\n".join(print_view(terminal_width, terminal_height, self.ID, program_groups_scores, all_results, print_data,
-                                   names, executions, self.groups, self.scores, self.tests, self.possible_score,
-                                   self.cpus, self.args.hide_memory, self.config, self.contest, self.args)[0]))
-
-        # Write cache files.
-        for solution, cache_data in all_cache_files.items():
-            cache_data.save(os.path.join(os.getcwd(), "prog", solution))
+        for name, success, compiled_name in compilation_results:
+            self.print_compilation_result(name, success, compiled_name)
+        if failed_additional_files:
+            sys.exit(1)
+        print("\n".join(view.print_view(terminal_width, terminal_height)[0]))
 
         if keyboard_interrupt:
             util.exit_with_error("Stopped due to keyboard interrupt.")
+        self.print_makespan(time.perf_counter() - start_time, execution_times)
+        self.print_checker_cache_stats(checker_cached)
 
         return program_groups_scores, all_results
 
     def compile_and_run(self, solutions):
-        compilation_results = self.compile_solutions(solutions)
-        for i in range(len(solutions)):
-            if not compilation_results[i]:
-                self.failed_compilations.append(solutions[i])
+        """
+        Compiles the solutions and the additional files (checker or interactor) and runs the solutions.
+        All of them are compiled at once on the same workers as the executions, so solutions which are
+        already compiled run while the remaining ones are compiled.
+        """
+        additional_files = self.task_type.additional_files_to_compile()
+        print("Compiling %d solutions%s..." % (len(solutions), "".join(f" and {name}"
+                                                                      for _, _, name, _, _ in additional_files)))
         executables = [paths.get_executables_path(package_util.get_executable(solution)) for solution in solutions]
-        compiled_commands = zip(solutions, executables, compilation_results)
+        compiled_commands = [(solution, executable, None) for solution, executable in zip(solutions, executables)]
         names = solutions
-        return self.run_solutions(compiled_commands, names, solutions, paths.get_executables_path())
+        return self.run_solutions(compiled_commands, names, solutions, paths.get_executables_path(),
+                                  additional_files)
 
     def convert_status_to_string(self, dictionary):
         """
@@ -850,6 +1203,16 @@ class Command(BaseCommand):
             if sys.platform == 'win32' or sys.platform == 'cygwin':
                 util.exit_with_error('Measuring with `time` is not supported on Windows.')
             return 'time', 'time'
+        def use_wait4():
+            if sys.platform == 'win32' or sys.platform == 'cygwin':
+                util.exit_with_error('Measuring with `wait4` is not supported on Windows.')
+            return 'wait4', 'wait4'
+        def use_cgroups():
+            if not cgroups.cgroups_supported():
+                util.exit_with_error('Measuring with `cgroups` requires the memory controller of cgroup v2.\n'
+                                     'Run sinol-make in a cgroup which it can manage, for example with\n'
+                                     '`systemd-run --user --scope -p Delegate=yes sinol-make run ...`.')
+            return 'cgroups', 'cgroups'
 
         timetool_path, timetool_name = None, None
         preferred_timetool = self.contest.preferred_timetool()
@@ -865,6 +1228,10 @@ class Command(BaseCommand):
                 timetool_path, timetool_name = use_sio2jail()
             elif self.config.get('sinol_undocumented_time_tool', '') == 'time':
                 timetool_path, timetool_name = use_time()
+            elif self.config.get('sinol_undocumented_time_tool', '') == 'wait4':
+                timetool_path, timetool_name = use_wait4()
+            elif self.config.get('sinol_undocumented_time_tool', '') == 'cgroups':
+                timetool_path, timetool_name = use_cgroups()
             else:
                 util.exit_with_error('Invalid time tool specified in config.yml.')
         elif args.time_tool is None:
@@ -873,6 +1240,10 @@ class Command(BaseCommand):
             timetool_path, timetool_name = use_sio2jail()
         elif args.time_tool == 'time':
             timetool_path, timetool_name = use_time()
+        elif args.time_tool == 'wait4':
+            timetool_path, timetool_name = use_wait4()
+        elif args.time_tool == 'cgroups':
+            timetool_path, timetool_name = use_cgroups()
         else:
             util.exit_with_error('Invalid time tool specified.')
         return compilers, timetool_path, timetool_name
@@ -992,6 +1363,7 @@ class Command(BaseCommand):
 
     def set_task_type(self, timetool_name, timetool_path, fake_time=None):
         self.task_type = package_util.get_task_type(timetool_name, timetool_path, fake_time)
+        self.task_type.stream_outputs = self.args.stream_outputs
 
     def compile_additional_files(self):
         additional_files = self.task_type.additional_files_to_compile()
@@ -1027,25 +1399,26 @@ class Command(BaseCommand):
         cache.remove_results_if_contest_type_changed(self.config.get("sinol_contest_type", "default"))
 
         self.set_task_type(self.timetool_name, self.timetool_path, self.config.get('fake_time'))
-        self.compile_additional_files()
 
         lib = package_util.get_files_matching_pattern(self.ID, f'{self.ID}lib.*')
         self.has_lib = len(lib) != 0
 
         self.tests = package_util.get_tests(self.ID, self.args.tests)
-        self.test_md5sums = {os.path.basename(test): util.get_file_md5(test) for test in self.tests}
+        self.test_md5sums = {os.path.basename(test): md5 for test, md5 in util.get_files_md5(self.tests).items()}
         self.check_are_any_tests_to_run()
         self.set_scores()
         self.failed_compilations = []
         solutions = package_util.get_solutions(self.ID, self.args.solutions)
 
         util.change_stack_size_to_unlimited()
-        for solution in solutions:
-            lang = package_util.get_file_lang(solution)
-            for test in self.tests:
-                # The functions will exit if the limits are not set
-                _ = package_util.get_time_limit(test, self.config, lang, self.ID, self.args)
-                _ = package_util.get_memory_limit(test, self.config, lang, self.ID, self.args)
+        # Exits if the limits are not set.
+        self.limits = package_util.get_limits(self.tests, [package_util.get_file_lang(solution) for solution in solutions],
+                                              self.config, self.ID, self.args)
+        # Every solution writes an output of about the size of the answer for every test.
+        outputs_size = 0 if self.args.stream_outputs else len(solutions) * sum(
+            os.path.getsize(package_util.get_out_from_in(test)) for test in self.tests
+            if os.path.exists(package_util.get_out_from_in(test)))
+        cache.setup_workdir(package_util.get_workdir(self.args, self.config), outputs_size)
 
         results, all_results = self.compile_and_run(solutions)
         self.check_errors(all_results)
@@ -3,13 +3,13 @@ from sinol_make.contest_types.icpc import ICPCContest
 from sinol_make.contest_types.oi import OIContest
 from sinol_make.contest_types.oij import OIJContest
 from sinol_make.helpers.func_cache import cache_result
-from sinol_make.helpers.package_util import get_config
+from sinol_make.helpers import package_util
 from sinol_make.interfaces.Errors import UnknownContestType
 
 
 @cache_result(cwd=True)
 def get_contest_type():
-    config = get_config()
+    config = package_util.get_config()
     contest_type = config.get("sinol_contest_type", "default").lower()
 
     if contest_type == "default":
@@ -1,9 +1,61 @@
+import os
+import shlex
+import select
 import subprocess
 from typing import List, Tuple, Union
 
 from sinol_make.structs.status_structs import ExecutionResult, Status
 
 
+# Interval (in seconds) at which executors measuring memory usage themselves check the memory of a running program.
+MEMORY_CHECK_INTERVAL = 0.01
+
+
+class ProcessWaiter:
+    """
+    Waits for a process to exit without using the CPU in the meantime. On Linux the process is watched
+    with a pidfd, so the wait ends as soon as the process exits. Elsewhere `Popen.wait` is used.
+    Should be used as a context manager.
+    """
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+        self.pidfd = None
+        self.poller = None
+
+    def __enter__(self) -> 'ProcessWaiter':
+        if hasattr(os, "pidfd_open"):
+            try:
+                self.pidfd = os.pidfd_open(self.process.pid)
+                self.poller = select.poll()
+                self.poller.register(self.pidfd, select.POLLIN)
+            except OSError:
+                # Kernel doesn't support pidfds or the process already exited.
+                self.pidfd = None
+        return self
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Waits at most `timeout` seconds for the process to exit.
+        :return: True if the process exited.
+        """
+        if self.pidfd is not None:
+            if not self.poller.poll(max(0, int(timeout * 1000))):
+                return False
+            # The pidfd is readable once the process exits, so `poll` only collects its exit status.
+            return self.process.poll() is not None
+        try:
+            self.process.wait(max(0.0, timeout))
+            return True
+        except subprocess.TimeoutExpired:
+            return False
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.pidfd is not None:
+            os.close(self.pidfd)
+            self.pidfd = None
+
+
 class BaseExecutor:
     """
     Base class for executors. Executors are used to run commands and measure their time and memory usage.
@@ -45,12 +97,12 @@ class BaseExecutor:
         """
 
         command = self._wrap_command(command, result_file_path, time_limit, memory_limit)
-        cmdline = " ".join(command)
-        tle, mle, return_code, proc_stderr = self._execute(cmdline, time_limit, hard_time_limit, memory_limit,
+        tle, mle, return_code, proc_stderr = self._execute(command, time_limit, hard_time_limit, memory_limit,
                                                            result_file_path, executable, execution_dir, stdin, stdout,
                                                            stderr, fds_to_close, *args, **kwargs)
         result = self._parse_result(tle, mle, return_code, result_file_path)
-        result.Cmdline = cmdline
+        # The command is run without a shell, the command line is only displayed.
+        result.Cmdline = shlex.join(command)
         if not result.Stderr:
             result.Stderr = proc_stderr
         if tle:
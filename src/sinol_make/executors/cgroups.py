@@ -0,0 +1,231 @@
+import os
+import errno
+import signal
+import itertools
+import subprocess
+import threading
+import time
+from typing import Dict, List, Tuple, Union
+
+from sinol_make import util
+from sinol_make.executors import BaseExecutor, ProcessWaiter
+from sinol_make.structs.status_structs import ExecutionResult, Status
+
+# Path of the cgroup prepared by `prepare_cgroup`, in which the cgroups of executions are created.
+_cgroup_path = None
+_cgroup_lock = threading.Lock()
+
+
+def get_own_cgroup_path() -> Union[str, None]:
+    """
+    Returns the path to the cgroup v2 directory of the current process,
+    or None if the unified cgroup hierarchy isn't mounted.
+    """
+    if not util.is_linux():
+        return None
+    mount_point = None
+    try:
+        with open("/proc/self/mounts", "r") as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) >= 3 and fields[2] == "cgroup2":
+                    mount_point = fields[1]
+                    break
+        if mount_point is None:
+            return None
+        with open("/proc/self/cgroup", "r") as cgroup_file:
+            for line in cgroup_file:
+                if line.startswith("0::"):
+                    path = os.path.join(mount_point, line.strip()[len("0::"):].lstrip("/"))
+                    return path if os.path.isdir(path) else None
+    except OSError:
+        pass
+    return None
+
+
+def _read_keyed_file(path: str) -> Dict[str, int]:
+    """
+    Reads a cgroup file with lines in the format `key value`, such as `cpu.stat` or `memory.events`.
+    """
+    with open(path, "r") as f:
+        return {key: int(value) for key, value in (line.split() for line in f if line.strip())}
+
+
+def _write(path: str, value: str):
+    with open(path, "w") as f:
+        f.write(value)
+
+
+def cgroups_supported() -> bool:
+    """
+    Checks if the memory controller of cgroup v2 is available to the current process.
+    """
+    path = get_own_cgroup_path()
+    if path is None:
+        return False
+    try:
+        with open(os.path.join(path, "cgroup.controllers"), "r") as f:
+            return "memory" in f.read().split()
+    except OSError:
+        return False
+
+
+def prepare_cgroup() -> str:
+    """
+    Enables the memory controller for the children of the cgroup of sinol-make, so every execution
+    can be run in its own child cgroup. A cgroup with enabled controllers can't contain processes,
+    so if needed sinol-make moves itself to a child cgroup called `sinol-make`.
+    :return: Path to the cgroup in which cgroups of executions should be created.
+    """
+    global _cgroup_path
+    with _cgroup_lock:
+        if _cgroup_path is not None:
+            return _cgroup_path
+
+        delegate_msg = ("Run sinol-make in a cgroup which it can manage, for example with\n"
+                        "`systemd-run --user --scope -p Delegate=yes sinol-make ...`.")
+        if not cgroups_supported():
+            util.exit_with_error("Memory controller of cgroup v2 is not available. " + delegate_msg)
+        path = get_own_cgroup_path()
+        subtree_control = os.path.join(path, "cgroup.subtree_control")
+        try:
+            with open(subtree_control, "r") as f:
+                enabled = "memory" in f.read().split()
+            if not enabled:
+                try:
+                    _write(subtree_control, "+memory")
+                except OSError as e:
+                    if e.errno != errno.EBUSY:
+                        raise
+                    os.makedirs(os.path.join(path, "sinol-make"), exist_ok=True)
+                    _write(os.path.join(path, "sinol-make", "cgroup.procs"), str(os.getpid()))
+                    _write(subtree_control, "+memory")
+
+            # `memory.peak` was added in Linux 5.19.
+            probe_path = os.path.join(path, f"sinol-make-probe-{os.getpid()}")
+            os.makedirs(probe_path, exist_ok=True)
+            has_memory_peak = os.path.exists(os.path.join(probe_path, "memory.peak"))
+            os.rmdir(probe_path)
+        except OSError as e:
+            util.exit_with_error(f"Couldn't prepare cgroup `{path}` for executions ({e}). " + delegate_msg)
+        if not has_memory_peak:
+            util.exit_with_error("Measuring with `cgroups` requires Linux 5.19 or newer.")
+
+        _cgroup_path = path
+        return _cgroup_path
+
+
+class CgroupExecutor(BaseExecutor):
+    """
+    Executor which runs every execution in its own cgroup v2. The kernel enforces the memory limit
+    (`memory.max`) and reports the exact peak memory usage (`memory.peak`) and the CPU time of the
+    program and all its children (`cpu.stat`), so the program doesn't have to be polled.
+    Memory usage includes the page cache used by the program, for example for writing its output.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.cgroup_path = prepare_cgroup()
+        self._counter = itertools.count()
+        # Exit code, CPU time (in ms) and peak memory usage (in KB) of finished executions,
+        # keyed by the path of the result file. Executions can run in multiple threads at once.
+        self._results: Dict[str, Tuple[int, int, int]] = {}
+
+    def _wrap_command(self, command: List[str], result_file_path: str, time_limit: int, memory_limit: int) -> List[str]:
+        return command
+
+    def _create_cgroup(self, memory_limit: int) -> str:
+        path = os.path.join(self.cgroup_path, f"sinol-make-{os.getpid()}-{next(self._counter)}")
+        os.mkdir(path)
+        _write(os.path.join(path, "memory.max"), str(memory_limit * 1024))
+        if os.path.exists(os.path.join(path, "memory.swap.max")):
+            _write(os.path.join(path, "memory.swap.max"), "0")
+        # Kill all processes of the execution if any of them is killed by the OOM killer.
+        _write(os.path.join(path, "memory.oom.group"), "1")
+        return path
+
+    def _kill(self, cgroup: str, process: Union[subprocess.Popen, None]):
+        kill_file = os.path.join(cgroup, "cgroup.kill")
+        if os.path.exists(kill_file):
+            # Kills all processes in the cgroup, including the ones which left the process group.
+            _write(kill_file, "1")
+        elif process is not None:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def _remove_cgroup(self, cgroup: str, process: Union[subprocess.Popen, None]):
+        # Children of the program may still be running, or being killed.
+        for _ in range(100):
+            try:
+                os.rmdir(cgroup)
+                return
+            except OSError as e:
+                if e.errno != errno.EBUSY:
+                    raise
+            self._kill(cgroup, process)
+            time.sleep(0.01)
+        os.rmdir(cgroup)
+
+    def _execute(self, command: List[str], time_limit: int, hard_time_limit: int, memory_limit: int,
+                 result_file_path: str, executable: str, execution_dir: str, stdin: int, stdout: int,
+                 stderr: Union[None, int], fds_to_close: Union[None, List[int]],
+                 *args, **kwargs) -> Tuple[bool, bool, int, List[str]]:
+        timeout = False
+        if stderr is None:
+            stderr = subprocess.PIPE
+        cgroup = self._create_cgroup(memory_limit)
+        procs_file = os.path.join(cgroup, "cgroup.procs")
+
+        def enter_cgroup():
+            os.setpgrp()
+            with open(procs_file, "w") as f:
+                f.write(str(os.getpid()))
+
+        process = None
+        try:
+            process = subprocess.Popen(command, *args, stdin=stdin, stdout=stdout,
+                                       stderr=stderr, preexec_fn=enter_cgroup, cwd=execution_dir, **kwargs)
+            if fds_to_close is not None:
+                for fd in fds_to_close:
+                    os.close(fd)
+
+            with ProcessWaiter(process) as waiter:
+                if not waiter.wait(hard_time_limit):
+                    self._kill(cgroup, process)
+                    timeout = True
+
+            if stderr == subprocess.PIPE:
+                _, proc_stderr = process.communicate()
+                proc_stderr = proc_stderr.decode('utf-8').split('\n')
+            else:
+                proc_stderr = []
+                process.wait()
+
+            mem_limit_exceeded = _read_keyed_file(os.path.join(cgroup, "memory.events")).get("oom_kill", 0) > 0
+            cpu_time = _read_keyed_file(os.path.join(cgroup, "cpu.stat"))["user_usec"] // 1000
+            with open(os.path.join(cgroup, "memory.peak"), "r") as f:
+                memory_peak = int(f.read()) // 1024
+        finally:
+            self._remove_cgroup(cgroup, process)
+
+        self._results[result_file_path] = (process.returncode, cpu_time, memory_peak)
+        return timeout, mem_limit_exceeded, 0, proc_stderr
+
+    def _parse_result(self, tle, mle, return_code, result_file_path) -> ExecutionResult:
+        exit_code, cpu_time, memory_peak = self._results.pop(result_file_path)
+        result = ExecutionResult()
+        if tle or mle:
+            return result
+
+        result.Time = cpu_time
+        result.Memory = memory_peak
+        if exit_code < 0:
+            result.Status = Status.RE
+            result.ExitSignal = -exit_code
+            result.Error = f"Solution was terminated by signal {result.ExitSignal}"
+        elif exit_code != 0:
+            result.Status = Status.RE
+            result.Error = f"Solution exited with code {exit_code}"
+        return result
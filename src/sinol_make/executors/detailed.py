@@ -5,7 +5,7 @@ import time
 import psutil
 from typing import List, Tuple, Union
 
-from sinol_make.executors import BaseExecutor
+from sinol_make.executors import BaseExecutor, ProcessWaiter, MEMORY_CHECK_INTERVAL
 from sinol_make.structs.status_structs import ExecutionResult, Status
 
 
@@ -17,7 +17,7 @@ class DetailedExecutor(BaseExecutor):
     def _wrap_command(self, command: List[str], result_file_path: str, time_limit: int, memory_limit: int) -> List[str]:
         return command
 
-    def _execute(self, cmdline: str, time_limit: int, hard_time_limit: int, memory_limit: int,
+    def _execute(self, command: List[str], time_limit: int, hard_time_limit: int, memory_limit: int,
                  result_file_path: str, executable: str, execution_dir: str, stdin: int, stdout: int,
                  stderr: Union[None, int], fds_to_close: Union[None, List[int]],
                  *args, **kwargs) -> Tuple[bool, bool, int, List[str]]:
@@ -25,38 +25,39 @@ class DetailedExecutor(BaseExecutor):
         mem_used = 0
         if stderr is None:
             stderr = subprocess.PIPE
-        process = subprocess.Popen(cmdline, shell=True, *args, stdin=stdin, stdout=stdout, stderr=stderr,
+        process = subprocess.Popen(command, *args, stdin=stdin, stdout=stdout, stderr=stderr,
                                    preexec_fn=os.setpgrp, cwd=execution_dir, **kwargs)
         if fds_to_close is not None:
             for fd in fds_to_close:
                 os.close(fd)
 
         start_time = time.time()
-        while process.poll() is None:
-            try:
-                time_process = psutil.Process(process.pid)
-                executable_process = None
-                for child in time_process.children():
-                    if child.name() == executable:
-                        executable_process = child
+        executable_process = None
+        with ProcessWaiter(process) as waiter:
+            while not waiter.wait(min(MEMORY_CHECK_INTERVAL, hard_time_limit - (time.time() - start_time))):
+                try:
+                    if executable_process is None:
+                        for child in psutil.Process(process.pid).children():
+                            if child.name() == executable:
+                                executable_process = child
+                                break
+                    if executable_process is not None:
+                        mem_used = max(mem_used, executable_process.memory_info().rss)
+                    if executable_process is not None and mem_used > memory_limit * 1024:
+                        try:
+                            os.killpg(process.pid, signal.SIGKILL)
+                        except ProcessLookupError:
+                            pass
                         break
-                if executable_process is not None:
-                    mem_used = max(mem_used, executable_process.memory_info().rss)
-                if executable_process is not None and mem_used > memory_limit * 1024:
+                except psutil.NoSuchProcess:
+                    pass
+
+                if time.time() - start_time > hard_time_limit:
                     try:
                         os.killpg(process.pid, signal.SIGKILL)
                     except ProcessLookupError:
                         pass
                     break
-            except psutil.NoSuchProcess:
-                pass
-
-            if time.time() - start_time > hard_time_limit:
-                try:
-                    os.killpg(process.pid, signal.SIGKILL)
-                except ProcessLookupError:
-                    pass
-                break
         time_used = time.time() - start_time
         mem_used = mem_used // 1024
 
@@ -1,4 +1,5 @@
 import os
+import shlex
 import signal
 import subprocess
 import sys
@@ -19,29 +20,34 @@ class Sio2jailExecutor(BaseExecutor):
     def _wrap_command(self, command: List[str], result_file_path: str, time_limit: int, memory_limit: int) -> List[str]:
         # see: https://github.com/sio2project/sioworkers/blob/738aa7a4e93216b0900ca128d6d48d40cd38bc1e/sio/workers/executors.py#L608
         fake_time_args = ['--fake-time', self.fake_time] if self.fake_time is not None else []
-        return [f'"{self.sio2jail_path}"', '-f', '3', '--mount-namespace', 'off', '--pid-namespace', 'off', '--uts-namespace',
+        return [self.sio2jail_path, '--mount-namespace', 'off', '--pid-namespace', 'off', '--uts-namespace',
                 'off', '--ipc-namespace', 'off', '--net-namespace', 'off', '--capability-drop', 'off',
                 '--user-namespace', 'off'] + fake_time_args + ['--instruction-count-limit', f'{int(2 * time_limit)}M',
                 '--rtimelimit', f'{int(16 * time_limit + 1000)}ms', '--memory-limit', f'{int(memory_limit)}K',
-                '--output-limit', '51200K', '--output', 'oiaug', '--stderr', '--'] + command + \
-                ['3>', f'"{result_file_path}"']
+                '--output-limit', '51200K', '--output', 'oiaug', '--stderr', '--'] + command
 
-    def _execute(self, cmdline: str, time_limit: int, hard_time_limit: int, memory_limit: int,
+    def _execute(self, command: List[str], time_limit: int, hard_time_limit: int, memory_limit: int,
                  result_file_path: str, executable: str, execution_dir: str, stdin: int, stdout: int,
                  stderr: Union[None, int], fds_to_close: Union[None, List[int]],
                  *args, **kwargs) -> Tuple[bool, bool, int, List[str]]:
         env = os.environ.copy()
         env['UNDER_SIO2JAIL'] = "1"
-        try:
-            process = subprocess.Popen(cmdline, *args, shell=True, stdin=stdin, stdout=stdout, env=env,
-                                        stderr=subprocess.DEVNULL, preexec_fn=os.setpgrp, cwd=execution_dir, **kwargs)
-        except TypeError as e:
-            print(util.error(f"Invalid command: `{cmdline}`"))
-            raise e
-        if fds_to_close is not None:
-            for fd in fds_to_close:
-                os.close(fd)
-        process.wait()
+        with open(result_file_path, "w") as result_file:
+            # sio2jail writes its result to the file descriptor given with `-f`.
+            result_fd = result_file.fileno()
+            command = command[:1] + ['-f', str(result_fd)] + command[1:]
+            kwargs['pass_fds'] = tuple(kwargs.get('pass_fds', ())) + (result_fd,)
+            try:
+                process = subprocess.Popen(command, *args, stdin=stdin, stdout=stdout, env=env,
+                                           stderr=subprocess.DEVNULL, preexec_fn=os.setpgrp, cwd=execution_dir,
+                                           **kwargs)
+            except TypeError as e:
+                print(util.error(f"Invalid command: `{shlex.join(command)}`"))
+                raise e
+            if fds_to_close is not None:
+                for fd in fds_to_close:
+                    os.close(fd)
+            process.wait()
 
         return False, False, 0, []
 
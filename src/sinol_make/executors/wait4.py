@@ -0,0 +1,164 @@
+import os
+import select
+import resource
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple, Union
+
+import psutil
+from sinol_make import util
+from sinol_make.executors import BaseExecutor, MEMORY_CHECK_INTERVAL
+from sinol_make.structs.status_structs import ExecutionResult, Status
+
+
+class Wait4Executor(BaseExecutor):
+    """
+    Executor which starts the program directly (without a shell or GNU time) and reads its CPU time
+    and peak memory usage from the resource usage returned by `os.wait4`. Nothing is written to the
+    result file, the result is returned directly.
+
+    The kernel carries the peak memory usage of a process over `exec`, so `ru_maxrss` of the program
+    is at least the peak memory usage of sinol-make at the time of the fork. It is used only if it's
+    greater than that, otherwise the peak memory usage sampled while the program was running is used.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # Exit status, resource usage and sampled peak memory usage (in KB) of finished executions,
+        # keyed by the path of the result file. Executions can run in multiple threads at once
+        # (for example in interactive tasks).
+        self._results: Dict[str, Tuple[int, resource.struct_rusage, int]] = {}
+
+    def _wrap_command(self, command: List[str], result_file_path: str, time_limit: int, memory_limit: int) -> List[str]:
+        if not hasattr(os, "wait4"):
+            util.exit_with_error("Measuring time with wait4 is not supported on Windows.")
+        return command
+
+    def _wait(self, pid: int, timeout: float, poller) -> Union[Tuple[int, int, resource.struct_rusage], None]:
+        """
+        Waits at most `timeout` seconds for the process to exit and reaps it. `Popen.wait` can't be used
+        (as in `ProcessWaiter`), because it doesn't return the resource usage of the process.
+        :return: Result of `os.wait4` or None if the process is still running.
+        """
+        if poller is not None:
+            if not poller.poll(max(0, int(timeout * 1000))):
+                return None
+        else:
+            time.sleep(max(0.0, timeout))
+        result = os.wait4(pid, os.WNOHANG)
+        return None if result[0] == 0 else result
+
+    def _memory_peak(self, process: psutil.Process) -> int:
+        """
+        Returns the peak memory usage (in KB) of a running process. Only Linux reports the peak,
+        elsewhere the current memory usage is returned.
+        """
+        if sys.platform == 'linux':
+            try:
+                with open(f"/proc/{process.pid}/status", "r") as status_file:
+                    for line in status_file:
+                        if line.startswith("VmHWM:"):
+                            return int(line.split()[1])
+            except OSError:
+                raise psutil.NoSuchProcess(process.pid)
+        return process.memory_info().rss // 1024
+
+    def _execute(self, command: List[str], time_limit: int, hard_time_limit: int, memory_limit: int,
+                 result_file_path: str, executable: str, execution_dir: str, stdin: int, stdout: int,
+                 stderr: Union[None, int], fds_to_close: Union[None, List[int]],
+                 *args, **kwargs) -> Tuple[bool, bool, int, List[str]]:
+        timeout = False
+        mem_limit_exceeded = False
+        if stderr is None:
+            stderr = subprocess.PIPE
+        process = subprocess.Popen(command, *args, stdin=stdin, stdout=stdout, stderr=stderr,
+                                   preexec_fn=os.setpgrp, cwd=execution_dir, **kwargs)
+        if fds_to_close is not None:
+            for fd in fds_to_close:
+                os.close(fd)
+
+        pidfd, poller = None, None
+        if hasattr(os, "pidfd_open"):
+            try:
+                pidfd = os.pidfd_open(process.pid)
+                poller = select.poll()
+                poller.register(pidfd, select.POLLIN)
+            except OSError:
+                # Kernel doesn't support pidfds, the process is checked every `MEMORY_CHECK_INTERVAL` seconds.
+                pass
+
+        start_time = time.time()
+        mem_used = 0
+        try:
+            executable_process = psutil.Process(process.pid)
+        except psutil.NoSuchProcess:
+            executable_process = None
+        try:
+            while True:
+                remaining_time = hard_time_limit - (time.time() - start_time)
+                result = self._wait(process.pid, min(MEMORY_CHECK_INTERVAL, remaining_time), poller)
+                if result is not None:
+                    break
+                killed = False
+                try:
+                    if executable_process is not None:
+                        mem_used = max(mem_used, self._memory_peak(executable_process))
+                    if mem_used > memory_limit:
+                        mem_limit_exceeded = True
+                        killed = True
+                except psutil.NoSuchProcess:
+                    pass
+                if not killed and time.time() - start_time > hard_time_limit:
+                    timeout = True
+                    killed = True
+                if killed:
+                    try:
+                        os.killpg(process.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                    result = os.wait4(process.pid, 0)
+                    break
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+
+        _, status, rusage = result
+        # The process is already reaped, so `Popen` mustn't wait for it.
+        process.returncode = os.waitstatus_to_exitcode(status)
+        self._results[result_file_path] = (status, rusage, mem_used)
+
+        if stderr == subprocess.PIPE:
+            _, proc_stderr = process.communicate()
+            proc_stderr = proc_stderr.decode('utf-8').split('\n')
+        else:
+            proc_stderr = []
+        return timeout, mem_limit_exceeded, 0, proc_stderr
+
+    def _parse_result(self, tle, mle, return_code, result_file_path) -> ExecutionResult:
+        status, rusage, mem_used = self._results.pop(result_file_path)
+        result = ExecutionResult()
+        if tle:
+            return result
+
+        result.Time = round(rusage.ru_utime * 1000)
+        result.Memory = mem_used
+        if mle:
+            # The program was killed, so the signal isn't a runtime error.
+            return result
+        max_rss = rusage.ru_maxrss
+        self_max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == 'darwin':
+            # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+            max_rss, self_max_rss = max_rss // 1024, self_max_rss // 1024
+        if max_rss > self_max_rss:
+            result.Memory = max(result.Memory, max_rss)
+        if os.WIFSIGNALED(status):
+            result.Status = Status.RE
+            result.ExitSignal = os.WTERMSIG(status)
+            result.Error = f"Solution was terminated by signal {result.ExitSignal}"
+        elif os.WEXITSTATUS(status) != 0:
+            result.Status = Status.RE
+            result.Error = f"Solution exited with code {os.WEXITSTATUS(status)}"
+        return result
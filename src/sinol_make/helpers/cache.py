@@ -1,10 +1,15 @@
 import os
 import yaml
-from typing import Union
+import atexit
+import shutil
+import hashlib
+from contextlib import contextmanager
+from fractions import Fraction
+from typing import Dict, List, Tuple, Union
 
 from sinol_make import util
-from sinol_make.structs.cache_structs import CacheFile
-from sinol_make.helpers import paths, package_util
+from sinol_make.structs.cache_structs import CacheFile, CacheTest
+from sinol_make.helpers import paths, package_util, cache_db
 
 
 def get_cache_file(solution_path: str) -> CacheFile:
@@ -78,6 +83,8 @@ def save_compiled(file_path: str, exe_path: str, compilation_flags: str, sanitiz
     """
     info = CacheFile(util.get_file_md5(file_path), exe_path, compilation_flags, sanitizers, extra_compilation_hash)
     info.save(file_path)
+    # Results of the previous version of the program are no longer valid.
+    cache_db.remove_results([os.path.basename(file_path)])
     if clear_cache:
         remove_results_cache()
 
@@ -93,6 +100,7 @@ def _check_file_changed(file_path, lang, task_id):
             if package_util.get_file_lang(solution) == lang and \
                     solutions_re.match(solution) is not None:
                 os.unlink(paths.get_cache_path('md5sums', solution))
+                cache_db.remove_results([solution])
 
     info.md5sum = md5sum
     info.save(file_path)
@@ -113,14 +121,90 @@ def process_extra_execution_files(extra_execution_files, task_id):
             _check_file_changed(file_path, lang, task_id)
 
 
-def remove_results_cache():
+def get_test_results(solution_path: str) -> Dict[str, CacheTest]:
     """
-    Removes all cached test results
+    Returns cached test results of a solution.
+    :param solution_path: Path to solution
+    :return: Dictionary: {"<md5sum of test>": CacheTest}
+    """
+    return {test_md5: CacheTest.from_dict(test)
+            for test_md5, test in cache_db.load_results(os.path.basename(solution_path)).items()}
+
+
+def save_test_results(results: Dict[str, Dict[str, CacheTest]]):
+    """
+    Saves new test results of solutions. Results of other tests are left untouched,
+    so the cost depends only on the number of new results.
+    :param results: Dictionary: {"<solution>": {"<md5sum of test>": CacheTest}}
+    """
+    cache_db.save_results({os.path.basename(solution): {test_md5: test.to_dict() for test_md5, test in tests.items()}
+                           for solution, tests in results.items()})
+
+
+@contextmanager
+def test_results_writer():
+    """
+    Context manager for saving test results as soon as they are available, so they aren't lost
+    if the run is interrupted. Yields a function taking path to the solution, md5 sum of the test
+    and `CacheTest`, which saves the result immediately.
+    """
+    with cache_db.ResultsWriter() as writer:
+        yield lambda solution_path, test_md5, test: \
+            writer.save(os.path.basename(solution_path), test_md5, test.to_dict())
+
+
+def get_checker_result(key: Tuple[str, str, str, str]) -> Union[Tuple[bool, Fraction, str, str], None]:
+    """
+    Returns a cached verdict of a checker, as returned by `BaseTaskType.check_output`.
+    :param key: Tuple (checker identifier, md5 sum of input, md5 sum of output, md5 sum of answer).
+    :return: Verdict or None if it isn't cached.
+    """
+    result = cache_db.load_checker_result(key)
+    if result is None:
+        return None
+    correct, points, comment, stderr = result
+    return correct, Fraction(points), comment, stderr
+
+
+def save_checker_result(key: Tuple[str, str, str, str], result: Tuple[bool, Fraction, str, str]):
+    """
+    Saves a verdict of a checker, as returned by `BaseTaskType.check_output`.
+    :param key: Tuple (checker identifier, md5 sum of input, md5 sum of output, md5 sum of answer).
+    """
+    correct, points, comment, stderr = result
+    cache_db.save_checker_result(key, [correct, str(points), comment, stderr])
+
+
+def migrate_results_cache():
+    """
+    Moves test results stored in cache files by older versions of sinol-make to the cache database.
+    Does nothing if the cache database already exists.
     """
-    for solution in os.listdir(paths.get_cache_path('md5sums')):
-        info = get_cache_file(solution)
-        info.tests = {}
-        info.save(solution)
+    md5sums_dir = paths.get_cache_path("md5sums")
+    if os.path.exists(cache_db.get_cache_db_path()) or not os.path.isdir(md5sums_dir):
+        return
+    results = {}
+    for solution in os.listdir(md5sums_dir):
+        cache_file_path = os.path.join(md5sums_dir, solution)
+        try:
+            with open(cache_file_path, "r") as cache_file:
+                data = yaml.load(cache_file, Loader=yaml.FullLoader)
+            if not isinstance(data, dict) or "tests" not in data:
+                continue
+            results[solution] = {test_md5: CacheTest.from_dict(test) for test_md5, test in data["tests"].items()}
+            CacheFile.from_dict(data).save(solution)
+        except (yaml.YAMLError, TypeError, KeyError, ValueError, AttributeError):
+            # Corrupted cache files are handled by `get_cache_file`.
+            continue
+    save_test_results(results)
+
+
+def remove_results_cache(test_md5sums: Union[List[str], None] = None):
+    """
+    Removes cached test results
+    :param test_md5sums: If set, only results for tests with these md5 sums are removed.
+    """
+    cache_db.remove_results(test_md5sums=test_md5sums)
 
 
 def remove_results_if_contest_type_changed(contest_type):
@@ -198,4 +282,81 @@ def create_cache_dirs():
         paths.get_cache_path('md5sums'),
         paths.get_cache_path('doc_logs'),
     ]:
+        if os.path.islink(dir) and not os.path.exists(dir):
+            # A scratch directory in a work directory, which was removed (for example after a reboot).
+            os.unlink(dir)
         os.makedirs(dir, exist_ok=True)
+
+
+# Directories in the cache with files which are needed only while a command runs.
+SCRATCH_DIRS = ["executions", "chkwer", "outgen"]
+# Minimum free space (in bytes) which is left in the work directory.
+WORKDIR_RESERVE = 64 * 1024 * 1024
+# Work directories which will be removed when sinol-make exits.
+__workdirs_to_remove = set()
+
+
+def _replace_scratch_dir(cache_dir: str, target: Union[str, None]):
+    """
+    Removes a scratch directory in the cache and creates it again, as a symlink to `target` if it's set.
+    """
+    if os.path.islink(cache_dir):
+        os.unlink(cache_dir)
+    elif os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir)
+    if target is None:
+        os.makedirs(cache_dir)
+    else:
+        os.symlink(target, cache_dir)
+
+
+def _remove_workdir(workdir: str, cache_dirs: List[str]):
+    for cache_dir in cache_dirs:
+        if os.path.islink(cache_dir):
+            os.unlink(cache_dir)
+            os.makedirs(cache_dir, exist_ok=True)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+def setup_workdir(workdir: Union[str, None], required_size: int = 0):
+    """
+    Places scratch directories of the cache (outputs and result files of executions, outputs of chkwer and outgen)
+    in a directory of the package in `workdir`, for example on a tmpfs like `/dev/shm`. The directories in the cache
+    are replaced with symlinks, so paths of files don't change. Only results stored in the cache database persist,
+    the directory in `workdir` is removed when sinol-make exits.
+    If `workdir` is None, the scratch directories are moved back to the cache.
+    :param workdir: Path to the work directory or None.
+    :param required_size: Estimated size (in bytes) of the files which will be written to the scratch directories.
+                          If `workdir` doesn't have enough free space, the cache is used instead.
+    """
+    cache_dirs = [paths.get_cache_path(name) for name in SCRATCH_DIRS]
+    if workdir is None:
+        for cache_dir in cache_dirs:
+            if os.path.islink(cache_dir):
+                _replace_scratch_dir(cache_dir, None)
+        return
+    if not os.path.isdir(workdir):
+        util.exit_with_error(f"Work directory {workdir} doesn't exist.")
+
+    package_workdir = os.path.join(os.path.abspath(workdir),
+                                   "sinol-make-" + hashlib.md5(os.getcwd().encode()).hexdigest()[:16])
+    free = shutil.disk_usage(workdir).free
+    if os.path.isdir(package_workdir):
+        # Files left in the work directory by this package will be removed.
+        free += sum(os.path.getsize(os.path.join(root, file))
+                    for root, _, files in os.walk(package_workdir) for file in files)
+    if free < required_size + WORKDIR_RESERVE:
+        print(util.warning(f"Not enough free space in work directory {workdir} "
+                           f"({free / 2**20:.0f}MB free, {(required_size + WORKDIR_RESERVE) / 2**20:.0f}MB needed). "
+                           f"Using the cache directory instead."))
+        setup_workdir(None)
+        return
+
+    for name, cache_dir in zip(SCRATCH_DIRS, cache_dirs):
+        target = os.path.join(package_workdir, name)
+        shutil.rmtree(target, ignore_errors=True)
+        os.makedirs(target)
+        _replace_scratch_dir(cache_dir, target)
+    if package_workdir not in __workdirs_to_remove:
+        __workdirs_to_remove.add(package_workdir)
+        atexit.register(_remove_workdir, package_workdir, cache_dirs)
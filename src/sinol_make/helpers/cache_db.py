@@ -0,0 +1,250 @@
+import os
+import json
+import sqlite3
+from contextlib import closing
+from typing import Dict, Iterable, Tuple, Union
+
+from sinol_make import util
+from sinol_make.helpers import paths
+
+
+# Paths of databases for which the schema was already created by this process.
+__initialized = set()
+
+__SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS results ("
+    "solution TEXT NOT NULL, "
+    "test_md5 TEXT NOT NULL, "
+    "time_limit NUMERIC NOT NULL, "
+    "memory_limit NUMERIC NOT NULL, "
+    "time_tool TEXT NOT NULL, "
+    "result TEXT NOT NULL, "
+    "PRIMARY KEY (solution, test_md5)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS results_test_md5 ON results (test_md5)",
+    "CREATE TABLE IF NOT EXISTS file_hashes ("
+    "path TEXT PRIMARY KEY, "
+    "inode INTEGER NOT NULL, "
+    "size INTEGER NOT NULL, "
+    "mtime_ns INTEGER NOT NULL, "
+    "md5 TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS checker_results ("
+    "checker TEXT NOT NULL, "
+    "input_md5 TEXT NOT NULL, "
+    "output_md5 TEXT NOT NULL, "
+    "answer_md5 TEXT NOT NULL, "
+    "result TEXT NOT NULL, "
+    "PRIMARY KEY (checker, input_md5, output_md5, answer_md5)) WITHOUT ROWID",
+]
+
+
+def get_cache_db_path():
+    """
+    Returns path to the database in which cached data (for example test results of all solutions) is stored.
+    """
+    return paths.get_cache_path("cache.db")
+
+
+def _is_corrupted(error: sqlite3.DatabaseError) -> bool:
+    """
+    Errors such as a locked database or missing permissions are subclasses of `sqlite3.OperationalError`
+    and must not be mistaken for a corrupted database.
+    """
+    return not isinstance(error, sqlite3.OperationalError)
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    Opens the cache database, creating it if it doesn't exist.
+    If the database is corrupted, it is removed and created again.
+    """
+    path = get_cache_db_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for _ in range(2):
+        # The database could have been removed (for example with the whole cache) since it was created.
+        initialized = path in __initialized and os.path.exists(path)
+        connection = sqlite3.connect(path, timeout=60)
+        if initialized:
+            return connection
+        try:
+            with connection:
+                for statement in __SCHEMA:
+                    connection.execute(statement)
+            # Write-ahead log lets results be appended cheaply one by one, while other connections can still
+            # read the database. The mode is stored in the database file, so it's enough to set it once.
+            connection.execute("PRAGMA journal_mode=WAL")
+            __initialized.add(path)
+            return connection
+        except sqlite3.DatabaseError as error:
+            connection.close()
+            if not _is_corrupted(error):
+                raise
+            print(util.warning("Cache database is corrupted. Removing it, no action required."))
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+    util.exit_with_error(f"Couldn't open the cache database {path}.")
+
+
+def load_results(solution: str) -> Dict[str, Dict]:
+    """
+    Returns cached test results of a solution.
+    :param solution: Basename of the solution.
+    :return: Dictionary: {"<md5sum of test>": <dictionary as returned by `CacheTest.to_dict`>}
+    """
+    if not os.path.exists(get_cache_db_path()):
+        return {}
+    with closing(_connect()) as connection:
+        rows = connection.execute("SELECT test_md5, time_limit, memory_limit, time_tool, result FROM results "
+                                  "WHERE solution = ?", (solution,)).fetchall()
+    return {test_md5: {
+        "time_limit": time_limit,
+        "memory_limit": memory_limit,
+        "time_tool": time_tool,
+        "result": json.loads(result),
+    } for test_md5, time_limit, memory_limit, time_tool, result in rows}
+
+
+def _insert_results(connection: sqlite3.Connection, rows):
+    connection.executemany(
+        "INSERT OR REPLACE INTO results (solution, test_md5, time_limit, memory_limit, time_tool, result) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(solution, test_md5, test["time_limit"], test["memory_limit"], test["time_tool"], json.dumps(test["result"]))
+         for solution, test_md5, test in rows]
+    )
+
+
+def save_results(results: Dict[str, Dict[str, Dict]]):
+    """
+    Saves test results of solutions in a single transaction. Only the given results are written,
+    results of other tests are left untouched.
+    :param results: Dictionary: {"<basename of solution>": {"<md5sum of test>": <dictionary as returned
+                    by `CacheTest.to_dict`>}}
+    """
+    with closing(_connect()) as connection, connection:
+        _insert_results(connection, [(solution, test_md5, test)
+                                     for solution, tests in results.items() for test_md5, test in tests.items()])
+
+
+class ResultsWriter:
+    """
+    Saves test results one by one, as soon as they are available. Every result is committed right away,
+    so if the process is killed or interrupted, only the results which weren't finished yet are lost.
+    Should be used as a context manager.
+    """
+
+    def __init__(self):
+        self.connection = None
+
+    def __enter__(self) -> 'ResultsWriter':
+        self.connection = _connect()
+        # In WAL mode a commit only appends to the log. With `synchronous=NORMAL` committed results
+        # survive a crash of the process, the log is synced to disk only when it's checkpointed.
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        return self
+
+    def save(self, solution: str, test_md5: str, test: Dict):
+        """
+        Saves a single test result.
+        :param solution: Basename of the solution.
+        :param test_md5: Md5 sum of the test.
+        :param test: Dictionary as returned by `CacheTest.to_dict`.
+        """
+        with self.connection:
+            _insert_results(self.connection, [(solution, test_md5, test)])
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            # Move the results from the log to the database, so the log doesn't grow between runs.
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.OperationalError:
+            # The log will be checkpointed by the next connection.
+            pass
+        self.connection.close()
+        self.connection = None
+
+
+def remove_results(solutions: Union[Iterable[str], None] = None, test_md5sums: Union[Iterable[str], None] = None):
+    """
+    Removes cached test results. With no arguments, results of all solutions are removed.
+    :param solutions: If set, only results of these solutions (basenames) are removed.
+    :param test_md5sums: If set, only results for tests with these md5 sums are removed.
+    """
+    if not os.path.exists(get_cache_db_path()):
+        return
+    if solutions is not None:
+        solutions = list(solutions)
+    if test_md5sums is not None:
+        test_md5sums = list(test_md5sums)
+    with closing(_connect()) as connection, connection:
+        if solutions is None and test_md5sums is None:
+            connection.execute("DELETE FROM results")
+        elif test_md5sums is None:
+            connection.executemany("DELETE FROM results WHERE solution = ?",
+                                   [(solution,) for solution in solutions])
+        elif solutions is None:
+            connection.executemany("DELETE FROM results WHERE test_md5 = ?",
+                                   [(test_md5,) for test_md5 in test_md5sums])
+        else:
+            connection.executemany("DELETE FROM results WHERE solution = ? AND test_md5 = ?",
+                                   [(solution, test_md5) for solution in solutions for test_md5 in test_md5sums])
+
+
+def get_files_md5(files: Dict[str, os.stat_result]) -> Dict[str, str]:
+    """
+    Returns md5 sums of files stored in the hash index, for files which didn't change since they were stored.
+    :param files: Dictionary: {"<absolute path to the file>": <result of `os.stat` for the file>}
+    :return: Dictionary: {"<absolute path to the file>": "<md5 sum>"}. Files which aren't in the index are skipped.
+    """
+    if not files or not os.path.exists(get_cache_db_path()):
+        return {}
+    result = {}
+    with closing(_connect()) as connection:
+        for path, stat in files.items():
+            row = connection.execute("SELECT md5 FROM file_hashes "
+                                     "WHERE path = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+                                     (path, stat.st_ino, stat.st_size, stat.st_mtime_ns)).fetchone()
+            if row is not None:
+                result[path] = row[0]
+    return result
+
+
+def save_files_md5(files: Dict[str, Tuple[os.stat_result, str]]):
+    """
+    Saves md5 sums of files to the hash index in a single transaction.
+    :param files: Dictionary: {"<absolute path to the file>": (<result of `os.stat` for the file, taken
+                  before it was hashed>, "<md5 sum>")}
+    """
+    if not files:
+        return
+    with closing(_connect()) as connection, connection:
+        connection.executemany("INSERT OR REPLACE INTO file_hashes (path, inode, size, mtime_ns, md5) "
+                               "VALUES (?, ?, ?, ?, ?)",
+                               [(path, stat.st_ino, stat.st_size, stat.st_mtime_ns, md5)
+                                for path, (stat, md5) in files.items()])
+
+
+def load_checker_result(key: Tuple[str, str, str, str]) -> Union[list, None]:
+    """
+    Returns a cached verdict of a checker.
+    :param key: Tuple (checker identifier, md5 sum of input, md5 sum of output, md5 sum of answer).
+    :return: Verdict as saved by `save_checker_result` or None if it isn't cached.
+    """
+    if not os.path.exists(get_cache_db_path()):
+        return None
+    with closing(_connect()) as connection:
+        row = connection.execute("SELECT result FROM checker_results "
+                                 "WHERE checker = ? AND input_md5 = ? AND output_md5 = ? AND answer_md5 = ?",
+                                 key).fetchone()
+    return json.loads(row[0]) if row is not None else None
+
+
+def save_checker_result(key: Tuple[str, str, str, str], result: list):
+    """
+    Saves a verdict of a checker.
+    :param key: Tuple (checker identifier, md5 sum of input, md5 sum of output, md5 sum of answer).
+    :param result: JSON-serializable verdict.
+    """
+    with closing(_connect()) as connection, connection:
+        connection.execute("INSERT OR REPLACE INTO checker_results (checker, input_md5, output_md5, answer_md5, result) "
+                           "VALUES (?, ?, ?, ?, ?)", (*key, json.dumps(result)))
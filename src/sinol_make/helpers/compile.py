@@ -7,12 +7,88 @@ import subprocess
 
 import sinol_make.helpers.compiler as compiler
 from sinol_make import util
-from sinol_make.helpers import paths, package_util
+from sinol_make.helpers import paths, package_util, pool, compile_store, pch
 from sinol_make.helpers.cache import check_compiled, save_compiled
 from sinol_make.interfaces.Errors import CompilationError
 from sinol_make.structs.compiler_structs import Compilers
 
 
+def _normalize_arguments(program, compilation_flags, extra_compilation_args, extra_compilation_files, use_sanitizers):
+    """
+    Returns the compilation flags, sanitizers and hash of extra compilation arguments and files
+    under which the compiled executable of the program is cached.
+    """
+    if extra_compilation_args is None:
+        extra_compilation_args = []
+    if isinstance(extra_compilation_args, str):
+        extra_compilation_args = [extra_compilation_args]
+    if extra_compilation_files is None:
+        extra_compilation_files = []
+    # Address and undefined sanitizer is not yet supported on Apple Silicon.
+    if use_sanitizers and util.is_macos_arm():
+        use_sanitizers = 'no'
+
+    if compilation_flags == 'w':
+        compilation_flags = 'weak'
+    elif compilation_flags == 'o':
+        compilation_flags = 'oioioi'
+    elif compilation_flags == 'd':
+        compilation_flags = 'default'
+
+    extra_compilation_hash = package_util.get_extra_compilation_hash(
+        package_util.get_file_lang(program), extra_compilation_args, extra_compilation_files)
+    return compilation_flags, use_sanitizers, extra_compilation_hash
+
+
+def is_compiled(program, compilation_flags='default', extra_compilation_args=None, extra_compilation_files=None,
+                use_sanitizers='no') -> bool:
+    """
+    Checks if `compile` with the same arguments would use the cached executable instead of compiling the program.
+    """
+    return check_compiled(program, *_normalize_arguments(program, compilation_flags, extra_compilation_args,
+                                                         extra_compilation_files, use_sanitizers)) is not None
+
+
+def get_compilation_key(program, compilation_flags='default', extra_compilation_args=None,
+                        extra_compilation_files=None, use_sanitizers='no') -> Tuple[str, str, str, str, str]:
+    """
+    Returns a key which is the same for programs with identical sources in the same language,
+    compiled with the same arguments, so they compile to identical executables.
+    """
+    return (util.get_file_md5(program), os.path.splitext(program)[1]) + \
+        _normalize_arguments(program, compilation_flags, extra_compilation_args, extra_compilation_files,
+                             use_sanitizers)
+
+
+def link_compiled(program, executable, output, compilation_flags='default', extra_compilation_args=None,
+                  extra_compilation_files=None, use_sanitizers='no'):
+    """
+    Saves `executable`, compiled from a program with the same compilation key (see `get_compilation_key`),
+    as the executable of `program` under `output`. The executable is hard-linked if possible.
+    """
+    if os.path.abspath(executable) != os.path.abspath(output):
+        if os.path.lexists(output):
+            os.unlink(output)
+        try:
+            os.link(executable, output)
+        except OSError:
+            shutil.copy(executable, output)
+    save_compiled(program, output, *_normalize_arguments(program, compilation_flags, extra_compilation_args,
+                                                         extra_compilation_files, use_sanitizers))
+
+
+def _unlink_if_shared(output):
+    """
+    Removes the executable if it's hard-linked with executables of other programs (see `link_compiled`),
+    so that writing a new one doesn't change them.
+    """
+    try:
+        if os.stat(output).st_nlink > 1:
+            os.unlink(output)
+    except OSError:
+        pass
+
+
 def compile(program, output, compilers: Compilers = None, compile_log=None, compilation_flags='default',
             extra_compilation_args=None, extra_compilation_files=None, clear_cache=False, use_sanitizers='no'):
     """
@@ -33,19 +109,10 @@ def compile(program, output, compilers: Compilers = None, compile_log=None, comp
         extra_compilation_args = [extra_compilation_args]
     assert isinstance(extra_compilation_args, list) and all(isinstance(arg, str) for arg in extra_compilation_args)
 
-    # Address and undefined sanitizer is not yet supported on Apple Silicon.
-    if use_sanitizers and util.is_macos_arm():
-        use_sanitizers = 'no'
-
-    if compilation_flags == 'w':
-        compilation_flags = 'weak'
-    elif compilation_flags == 'o':
-        compilation_flags = 'oioioi'
-    elif compilation_flags == 'd':
-        compilation_flags = 'default'
-
     if extra_compilation_files is None:
         extra_compilation_files = []
+    compilation_flags, use_sanitizers, extra_compilation_hash = _normalize_arguments(
+        program, compilation_flags, extra_compilation_args, extra_compilation_files, use_sanitizers)
 
     # Extra compilation files are copied even when the executable is cached, so that
     # the executables directory always contains their current versions.
@@ -54,17 +121,17 @@ def compile(program, output, compilers: Compilers = None, compile_log=None, comp
         if not os.path.exists(dest) or util.get_file_md5(dest) != util.get_file_md5(file):
             shutil.copy(file, dest)
 
-    extra_compilation_hash = package_util.get_extra_compilation_hash(
-        package_util.get_file_lang(program), extra_compilation_args, extra_compilation_files)
     compiled_exe = check_compiled(program, compilation_flags, use_sanitizers, extra_compilation_hash)
     if compiled_exe is not None:
         if compile_log is not None:
             compile_log.write(f'Using cached executable {compiled_exe}\n')
             compile_log.close()
         if os.path.abspath(compiled_exe) != os.path.abspath(output):
+            _unlink_if_shared(output)
             shutil.copy(compiled_exe, output)
         return True
 
+    _unlink_if_shared(output)
     gcc_compilation_flags = ''
     if compilation_flags == 'weak':
         gcc_compilation_flags = ''  # Disable all warnings
@@ -124,6 +191,27 @@ def compile(program, output, compilers: Compilers = None, compile_log=None, comp
                          '-Wcast-align', '-D_GLIBCXX_DEBUG', '-D_GLIBCXX_DEBUG_PEDANTIC', '-D_FORTIFY_SOURCE=2',
                          '-fsanitize=address', '-fsanitize=undefined', '-fno-sanitize-recover', '-fstack-protector']
 
+    # Executables are shared between packages through the compile store, if it's enabled.
+    store_size = compile_store.get_max_size() if ext != '.py' else None
+    store_key = None
+    if store_size is not None:
+        store_key = compile_store.get_key(program, arguments[0], compilation_flags, use_sanitizers,
+                                          extra_compilation_hash)
+        if compile_store.restore(store_key, output):
+            if compile_log is not None:
+                compile_log.write('Using executable from the shared compile store\n')
+                compile_log.close()
+            save_compiled(program, output, compilation_flags, use_sanitizers, extra_compilation_hash, clear_cache)
+            return True
+
+    if ext == '.cpp':
+        # Flags after the output path (apart from linking and diagnostics ones) must match the precompiled header.
+        pch_flags = [arg for arg in arguments[4 + len(extra_compilation_args):]
+                     if arg not in ('-lm', '-fdiagnostics-color')]
+        include_dir = pch.get_include_dir(program, arguments[0], pch_flags)
+        if include_dir is not None:
+            arguments[2:2] = ['-I', include_dir]
+
     process = subprocess.Popen(arguments, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
     out, _ = process.communicate()
     if compile_log is not None:
@@ -135,6 +223,8 @@ def compile(program, output, compilers: Compilers = None, compile_log=None, comp
     if process.returncode != 0:
         raise CompilationError('Compilation failed')
     else:
+        if store_key is not None:
+            compile_store.save(store_key, output, store_size)
         save_compiled(program, output, compilation_flags, use_sanitizers, extra_compilation_hash, clear_cache)
         return True
 
@@ -176,6 +266,17 @@ def compile_file(file_path: str, name: str, compilers: Compilers, compilation_fl
         return None, compile_log_path
 
 
+def compile_file_async(file_path: str, name: str, compilers: Compilers, processes: int, compilation_flags='default',
+                       use_sanitizers='no', additional_flags=None, use_extras=True):
+    """
+    Same as `compile_file`, but compiles the file on the shared pool with `processes` workers, so that other
+    files can be compiled at the same time. The result of `compile_file` is returned by `get()`
+    of the returned object.
+    """
+    return pool.apply_async(compile_file, (file_path, name, compilers, compilation_flags, use_sanitizers,
+                                           additional_flags, use_extras), processes)
+
+
 def print_compile_log(compile_log_path: str):
     """
     Print the first 500 lines of compilation log
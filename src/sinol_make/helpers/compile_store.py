@@ -0,0 +1,149 @@
+import os
+import re
+import json
+import shutil
+import hashlib
+import tempfile
+from typing import Union
+
+from sinol_make import util
+from sinol_make.helpers import compiler
+
+# Environment variable which enables the compile store and sets its maximum size, for example `2G`.
+STORE_SIZE_VARIABLE = "SINOL_MAKE_COMPILE_STORE"
+__SIZE_SUFFIXES = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+__LOCAL_INCLUDE = re.compile(r'^\s*#\s*include\s*"([^"]+)"', re.MULTILINE)
+
+
+def get_store_path():
+    """
+    Returns path to the directory in the user's cache directory, in which compiled executables are shared
+    between packages (and their copies), so they don't have to be compiled again after the package's
+    cache is removed.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "sinol-make", "objects")
+
+
+def get_max_size() -> Union[int, None]:
+    """
+    Returns the maximum size of the compile store in bytes, as set with the `SINOL_MAKE_COMPILE_STORE`
+    environment variable (a number of bytes with an optional K, M or G suffix).
+    :return: The size or None if the store is disabled.
+    """
+    value = os.environ.get(STORE_SIZE_VARIABLE, "").strip().upper()
+    match = re.fullmatch(r"(\d+)([KMG]?)B?", value)
+    if match is None:
+        if value:
+            print(util.warning(f"Invalid size of the compile store in {STORE_SIZE_VARIABLE}: {value}. "
+                               f"The compile store won't be used."))
+        return None
+    size = int(match.group(1)) * __SIZE_SUFFIXES[match.group(2)]
+    return size if size > 0 else None
+
+
+def _hash_local_includes(program: str, md5, visited: set):
+    """
+    Adds contents of headers included with `#include "..."` by the program, recursively, to the hash.
+    Headers from the package (like `oi.h`) can differ between packages which have the same source files.
+    """
+    try:
+        with open(program, "r", errors="replace") as f:
+            includes = __LOCAL_INCLUDE.findall(f.read())
+    except OSError:
+        return
+    for include in includes:
+        path = os.path.realpath(os.path.join(os.path.dirname(program), include))
+        if path in visited or not os.path.isfile(path):
+            continue
+        visited.add(path)
+        md5.update(f"{include}:{util.get_file_md5(path)}\n".encode("utf-8"))
+        _hash_local_includes(path, md5, visited)
+
+
+def get_key(program: str, compiler_path: str, compilation_flags: str, use_sanitizers: str,
+            extra_compilation_hash: str) -> str:
+    """
+    Returns the key of the program's executable in the compile store. It depends on everything that affects
+    the compilation: contents of the program and the headers it includes from its directory, the compiler
+    (its resolved path and version), the group of compilation flags, sanitizers, the hash of extra compilation
+    arguments and files and the version of sinol-make, which chooses the exact compiler flags.
+    """
+    from sinol_make import __version__
+
+    resolved_compiler = shutil.which(compiler_path) or compiler_path
+    key = {
+        "source": util.get_file_md5(program),
+        "extension": os.path.splitext(program)[1],
+        "compiler": os.path.realpath(resolved_compiler),
+        "compiler_version": compiler.get_compiler_version(resolved_compiler),
+        "compilation_flags": compilation_flags,
+        "sanitizers": use_sanitizers,
+        "extra_compilation_hash": extra_compilation_hash,
+        "sinol_make": __version__,
+    }
+    md5 = hashlib.md5(json.dumps(key, sort_keys=True).encode("utf-8"))
+    _hash_local_includes(program, md5, set())
+    return md5.hexdigest()
+
+
+def _get_entry_path(key: str) -> str:
+    return os.path.join(get_store_path(), key[:2], key)
+
+
+def restore(key: str, output: str) -> bool:
+    """
+    Copies the executable with the given key from the compile store to `output`.
+    :return: True if the executable was in the store, False otherwise.
+    """
+    entry = _get_entry_path(key)
+    try:
+        shutil.copy(entry, output)
+        # The modification time marks when the entry was last used, for evicting the least recently used ones.
+        os.utime(entry)
+    except OSError:
+        return False
+    return True
+
+
+def save(key: str, executable: str, max_size: int):
+    """
+    Saves the executable in the compile store under the given key and evicts the least recently used
+    executables if the store is bigger than `max_size` bytes. Errors are ignored, as the store is only a cache.
+    """
+    entry = _get_entry_path(key)
+    try:
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        # The executable is copied under a temporary name and renamed, as other invocations of sinol-make
+        # can use the store at the same time.
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(entry), prefix=".tmp", delete=False) as f:
+            temp_path = f.name
+        shutil.copy(executable, temp_path)
+        os.replace(temp_path, entry)
+    except OSError:
+        return
+    evict(max_size)
+
+
+def evict(max_size: int):
+    """
+    Removes the least recently used executables from the compile store until its size is at most `max_size` bytes.
+    """
+    entries = []
+    for root, _, files in os.walk(get_store_path()):
+        for file in files:
+            path = os.path.join(root, file)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= max_size:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        total_size -= size
@@ -7,19 +7,38 @@ import os
 from sinol_make import util
 from sinol_make.structs.compiler_structs import Compilers
 from sinol_make.helpers.func_cache import cache_result
+from sinol_make.helpers import probe_cache
 
 
 def check_if_installed(compiler):
     """
-    Check if a compiler is installed
+    Check if a compiler is installed. The result is cached between invocations until the compiler changes.
     """
 
-    try:
-        subprocess.call([compiler, '--version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except FileNotFoundError:
-        return False
+    def probe():
+        try:
+            subprocess.call([compiler, '--version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except FileNotFoundError:
+            return False
+        return True
 
-    return True
+    return probe_cache.cached_probe("installed", compiler, probe)
+
+
+def get_compiler_version(compiler):
+    """
+    Returns the output of `compiler --version`, or an empty string if the compiler can't be run.
+    The result is cached between invocations until the compiler changes.
+    """
+
+    def probe():
+        try:
+            return subprocess.run([compiler, '--version'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                  timeout=10).stdout.decode('utf-8', errors='replace')
+        except (OSError, subprocess.TimeoutExpired):
+            return ''
+
+    return probe_cache.cached_probe("version", compiler, probe)
 
 
 @cache_result()
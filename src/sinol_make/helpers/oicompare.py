@@ -1,9 +1,11 @@
 import os
 import re
-import requests
+import mmap
+import itertools
 import subprocess
 
 from sinol_make import util
+from sinol_make.helpers import probe_cache
 
 
 __OICOMAPRE_VERSION = 'v1.0.2'
@@ -13,10 +15,7 @@ def get_path():
     return os.path.expanduser('~/.local/bin/oicompare')
 
 
-def check_installed():
-    path = get_path()
-    if not os.path.exists(path):
-        return False
+def _check_version(path):
     try:
         output = subprocess.run([path, '--version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     except PermissionError:
@@ -28,7 +27,22 @@ def check_installed():
     return True
 
 
+def check_installed():
+    """
+    Checks if the right version of oicompare is installed. The result is cached between invocations
+    until oicompare changes.
+    """
+    path = get_path()
+    if not os.path.exists(path):
+        return False
+    return probe_cache.cached_probe("oicompare_version", path, lambda: _check_version(path),
+                                    __OICOMAPRE_VERSION)
+
+
 def download_oicomapare():
+    # Imported here, because importing requests is slow.
+    import requests
+
     url = f'https://github.com/sio2project/oicompare/releases/download/{__OICOMAPRE_VERSION}/oicompare'
     if util.is_macos_arm():
         url += '-arm64'
@@ -60,54 +74,178 @@ def check_and_download():
         util.exit_with_error("Couldn't download oicompare. Please try again later or download it manually.")
 
 
-def _strip(s: str) -> str:
+# Size of the parts in which files are compared. Parts end at line breaks, so a part can be longer
+# if it contains a longer line.
+COMPARE_CHUNK_SIZE = 16 * 1024 * 1024
+# Whitespace in ASCII, other than line breaks, which is replaced with spaces. These are the characters matched by
+# `\s` in Python's regular expressions, together with the null character.
+__ASCII_WHITESPACE = bytes.maketrans(b"\0\t\x0b\x0c\x1c\x1d\x1e\x1f", b"        ")
+__UNICODE_WHITESPACE = re.compile(r"(?:[^\S\n]|\0)+")
+
+
+def _read_chunks(path: str, chunk_size: int):
+    """
+    Yields the contents of a file in parts ending at line breaks (`\n`), so no line or `\r\n` pair is split.
+    """
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = 0
+            while start < size:
+                end = min(start + chunk_size, size)
+                if end < size:
+                    line_end = data.rfind(b"\n", start, end)
+                    if line_end == -1:
+                        line_end = data.find(b"\n", end)
+                    end = size if line_end == -1 else line_end + 1
+                yield data[start:end]
+                start = end
+
+
+def _normalize(chunk: bytes) -> bytes:
+    """
+    Normalizes a part of a file which starts at the beginning of a line: line breaks become `\n`,
+    every sequence of whitespace in a line becomes a single space and whitespace at the beginning and end
+    of lines is removed. Text is treated like UTF-8 only if the part isn't ASCII, which is much slower.
+    """
+    chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    if chunk.isascii():
+        chunk = chunk.translate(__ASCII_WHITESPACE)
+        # Every pass halves the sequences of spaces. It's much faster than a regular expression,
+        # as usually there are few or no such sequences.
+        while b"  " in chunk:
+            chunk = chunk.replace(b"  ", b" ")
+    else:
+        chunk = __UNICODE_WHITESPACE.sub(" ", chunk.decode("utf-8")).encode("utf-8")
+    chunk = chunk.replace(b" \n", b"\n").replace(b"\n ", b"\n")
+    if chunk.startswith(b" "):
+        chunk = chunk[1:]
+    if chunk.endswith(b" "):
+        chunk = chunk[:-1]
+    return chunk
+
+
+class StreamComparator:
     """
-    Replace all longest sequences of spaces with a single space.
+    Compares an output, which is passed in parts of any size with `write`, with the answer in a file,
+    in the same way as `compare`. The output isn't stored, only the part after the last compared line break
+    is kept in memory. When `finish` is called, the comparison ends and the answer file is closed.
     """
-    return re.sub(r'[\s\0]+', ' ', s).strip()
+
+    def __init__(self, answer_path: str, chunk_size: int = COMPARE_CHUNK_SIZE):
+        self._chunk_size = chunk_size
+        self._answer_reader = _read_chunks(answer_path, chunk_size)
+        self._answer_chunks = map(_normalize, self._answer_reader)
+        self._answer = b""
+        self._answer_pos = 0
+        # Output which wasn't compared yet, it starts at the beginning of a line.
+        self._parts = []
+        self._parts_size = 0
+        self._parts_have_line_break = False
+        # Number of lines of the output which were already compared.
+        self._lines = 0
+        self.same = True
+        # Set when the output differs from the answer: line (counted from 1) with the first difference,
+        # and the output which wasn't compared, starting at the beginning of line `unchecked_line`.
+        self.difference_line = None
+        self.unchecked_output = b""
+        self.unchecked_line = None
+
+    def _set_difference(self, part: bytes, normalized: bytes, offset: int):
+        self.same = False
+        self.difference_line = self._lines + normalized.count(b"\n", 0, offset) + 1
+        self.unchecked_output = part + b"".join(self._parts)
+        self.unchecked_line = self._lines + 1
+        self._parts = []
+
+    def _compare_part(self, part: bytes):
+        """
+        Compares a part of the output, which starts at the beginning of a line and ends at a line break
+        (or at the end of the output).
+        """
+        normalized = _normalize(part)
+        pos = 0
+        while pos < len(normalized):
+            if self._answer_pos == len(self._answer):
+                chunk = next(self._answer_chunks, None)
+                if chunk is None:
+                    # Only line breaks (empty lines) can remain in the output.
+                    rest = normalized[pos:]
+                    if rest.strip(b"\n"):
+                        self._set_difference(part, normalized, pos + len(rest) - len(rest.lstrip(b"\n")))
+                        return
+                    break
+                self._answer, self._answer_pos = chunk, 0
+            length = min(len(normalized) - pos, len(self._answer) - self._answer_pos)
+            if normalized[pos:pos + length] != self._answer[self._answer_pos:self._answer_pos + length]:
+                # Binary search for the first difference, slices are compared much faster than single bytes.
+                low, high = 0, length
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if normalized[pos + low:pos + middle] == \
+                            self._answer[self._answer_pos + low:self._answer_pos + middle]:
+                        low = middle
+                    else:
+                        high = middle
+                self._set_difference(part, normalized, pos + low)
+                return
+            pos += length
+            self._answer_pos += length
+        self._lines += normalized.count(b"\n")
+
+    def write(self, data: bytes):
+        """
+        Passes the next part of the output. Parts are compared once at least `chunk_size` bytes of whole lines
+        are collected. After a difference is found, the data is ignored.
+        """
+        if not self.same:
+            return
+        self._parts.append(data)
+        self._parts_size += len(data)
+        self._parts_have_line_break = self._parts_have_line_break or b"\n" in data
+        if self._parts_size < self._chunk_size or not self._parts_have_line_break:
+            return
+        buffered = b"".join(self._parts)
+        line_end = buffered.rfind(b"\n")
+        self._parts = [buffered[line_end + 1:]]
+        self._parts_size = len(self._parts[0])
+        self._parts_have_line_break = False
+        self._compare_part(buffered[:line_end + 1])
+
+    def finish(self) -> bool:
+        """
+        Compares the rest of the output, closes the answer file and returns whether the output
+        is the same as the answer.
+        """
+        try:
+            if self.same:
+                rest, self._parts = b"".join(self._parts), []
+                self._compare_part(rest)
+            if self.same:
+                for chunk in itertools.chain([self._answer[self._answer_pos:]], self._answer_chunks):
+                    if chunk.strip(b"\n"):
+                        # The output ended before the answer.
+                        self.same = False
+                        self.difference_line = self._lines + 1
+                        break
+        finally:
+            self._answer_reader.close()
+        return self.same
 
 
-def compare(file1_path: str, file2_path: str) -> bool:
+def compare(file1_path: str, file2_path: str, chunk_size: int = COMPARE_CHUNK_SIZE) -> bool:
     """
     Compare two files in the same way as oicompare does. Returns True if the files are the same, False otherwise.
+    Lines of the files are compared after replacing every sequence of whitespace with a single space
+    and stripping whitespace from both ends. Empty lines at the end of the files are ignored.
+    Files are memory-mapped and normalized in large parts, so comparing big outputs is fast.
     """
-    with open(file1_path, "r") as file1, open(file2_path, "r") as file2:
-        eof1 = False
-        eof2 = False
-        while True:
-            try:
-                line1 = _strip(next(file1))
-            except StopIteration:
-                eof1 = True
-            try:
-                line2 = _strip(next(file2))
-            except StopIteration:
-                eof2 = True
-
-            if eof1 and eof2:
-                return True
-            if eof1:
-                while line2 == "":
-                    try:
-                        line2 = _strip(next(file2))
-                    except StopIteration:
-                        eof2 = True
-                        break
-            elif eof2:
-                while line1 == "":
-                    try:
-                        line1 = _strip(next(file1))
-                    except StopIteration:
-                        eof1 = True
-                        break
-                    if line1 != "":
-                        break
-
-            if eof1 and eof2:
-                return True
-            if (eof1 and line2 == "") or (eof2 and line1 == ""):
-                continue
-            if (eof1 and line2 != "") or (eof2 and line1 != ""):
-                return False
-            if line1 != line2:
-                return False
+    comparator = StreamComparator(file2_path, chunk_size)
+    for chunk in _read_chunks(file1_path, chunk_size):
+        # Parts of the file already end at line breaks.
+        comparator._compare_part(chunk)
+        if not comparator.same:
+            break
+    return comparator.finish()
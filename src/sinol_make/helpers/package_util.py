@@ -4,13 +4,12 @@ import yaml
 import glob
 import fnmatch
 import hashlib
-import multiprocessing as mp
 from enum import Enum
-from typing import List, Union, Dict, Any, Tuple, Type
+from typing import List, Union, Dict, Any, Tuple, Type, Iterable
 
 from sinol_make.helpers.func_cache import cache_result
 from sinol_make import util, contest_types
-from sinol_make.helpers import paths
+from sinol_make.helpers import paths, pool
 from sinol_make.task_type import BaseTaskType
 
 
@@ -64,6 +63,19 @@ def get_config():
         util.exit_with_error("config.yml is not a valid YAML. Fix it before continuing:\n" + str(e))
 
 
+def get_workdir(args, config=None) -> Union[str, None]:
+    """
+    Returns the directory for temporary files of programs, set with `--workdir` or `sinol_workdir` in config.yml,
+    or None if the cache should be used.
+    :param config: Config dict. If None, it is read from `config.yml`.
+    """
+    if args.workdir is not None:
+        return args.workdir
+    if config is None:
+        config = get_config()
+    return config.get("sinol_workdir")
+
+
 def get_extra_compilation_args(lang: str, config=None) -> List[str]:
     """
     Returns extra compilation arguments for given language.
@@ -303,11 +315,17 @@ def _get_limit_from_dict(dict: Dict[str, Any], limit_type: LimitTypes, test_id:
         return None
 
 
-def _get_limit(limit_type: LimitTypes, test_path: str, config: Dict[str, Any], lang: str, task_id: str):
+def _allow_test_limit(config: Dict[str, Any]) -> bool:
+    return config.get("sinol_undocumented_test_limits", False) or \
+        contest_types.get_contest_type().allow_per_test_limits()
+
+
+def _get_limit(limit_type: LimitTypes, test_path: str, config: Dict[str, Any], lang: str, task_id: str,
+               allow_test_limit: Union[bool, None] = None):
     test_id = extract_test_id(test_path, task_id)
     test_group = str(get_group(test_path, task_id))
-    contest_type = contest_types.get_contest_type()
-    allow_test_limit = config.get("sinol_undocumented_test_limits", False) or contest_type.allow_per_test_limits()
+    if allow_test_limit is None:
+        allow_test_limit = _allow_test_limit(config)
     global_limit = _get_limit_from_dict(config, limit_type, test_id, test_group, test_path, allow_test_limit)
     override_limits_dict = config.get("override_limits", {}).get(lang, {})
     overriden_limit = _get_limit_from_dict(override_limits_dict, limit_type, test_id, test_group, test_path,
@@ -348,6 +366,34 @@ def get_memory_limit(test_path, config, lang, task_id, args=None):
     return _get_limit(LimitTypes.MEMORY_LIMIT, test_path, str_config, lang, task_id)
 
 
+def get_limits(tests: List[str], langs: Iterable[str], config, task_id, args=None) -> Dict[str, Dict[str, Tuple[int, int]]]:
+    """
+    Returns time and memory limits of all given tests for all given languages. Computing a single limit
+    with `get_time_limit` or `get_memory_limit` requires copying the config and reading the contest type,
+    so limits which are needed many times should be looked up in the table returned by this function.
+    Exits with an error if a limit is not defined.
+    :param tests: List of paths to tests.
+    :param langs: Languages for which the limits are computed.
+    :return: Dictionary: {"<language>": {"<path to test>": (<time limit>, <memory limit>)}}
+    """
+    str_config = util.stringify_keys(config)
+    allow_test_limit = _allow_test_limit(str_config)
+    limits = {}
+    for lang in set(langs):
+        limits[lang] = {}
+        for test in tests:
+            if args is not None and hasattr(args, "tl") and args.tl is not None:
+                time_limit = args.tl * 1000
+            else:
+                time_limit = _get_limit(LimitTypes.TIME_LIMIT, test, str_config, lang, task_id, allow_test_limit)
+            if args is not None and hasattr(args, "ml") and args.ml is not None:
+                memory_limit = int(args.ml * 1024)
+            else:
+                memory_limit = _get_limit(LimitTypes.MEMORY_LIMIT, test, str_config, lang, task_id, allow_test_limit)
+            limits[lang][test] = (time_limit, memory_limit)
+    return limits
+
+
 def get_in_tests_re(task_id: str) -> re.Pattern:
     return re.compile(r'^%s(([0-9]+)([a-z]?[a-z0-9]*))\.in$' % re.escape(task_id))
 
@@ -479,12 +525,11 @@ def validate_tests(tests: List[str], cpus: int, type: str = 'input'):
     print(f'Validating {type} test contents.')
     num_tests = len(tests)
     finished = 0
-    with mp.Pool(cpus) as pool:
-        for valid, message in pool.imap(validate_test, tests):
-            if not valid:
-                util.exit_with_error(message)
-            finished += 1
-            print(f'Validated {finished}/{num_tests} tests', end='\r')
+    for valid, message in pool.imap(validate_test, tests, cpus):
+        if not valid:
+            util.exit_with_error(message)
+        finished += 1
+        print(f'Validated {finished}/{num_tests} tests', end='\r')
     print()
     print(util.info(f'All {type} tests are valid!'))
 
@@ -63,5 +63,28 @@ def add_fsanitize_argument(parser: argparse.ArgumentParser):
 
 def add_time_tool_argument(parser: argparse.ArgumentParser):
     default_timetool = 'sio2jail' if sio2jail.sio2jail_supported() else 'time'
-    parser.add_argument('-T', '--time-tool', dest='time_tool', choices=['sio2jail', 'time'],
+    parser.add_argument('-T', '--time-tool', dest='time_tool', choices=['sio2jail', 'time', 'wait4', 'cgroups'],
                         help=f'tool to measure time and memory usage (default: {default_timetool})')
+
+
+def add_early_termination_argument(parser: argparse.ArgumentParser):
+    parser.add_argument('--early-termination', dest='early_termination', default=False, action='store_true',
+                        help='stop running a solution on a group when the result of the group is already known: '
+                             'it got the minimum score and either a test timed out or the status of the group '
+                             'matches the expected one. Remaining tests of the group are marked as skipped (SK), '
+                             'so worse statuses on them won\'t be detected.')
+
+
+def add_stream_outputs_argument(parser: argparse.ArgumentParser):
+    parser.add_argument('--stream-outputs', dest='stream_outputs', default=False, action='store_true',
+                        help='compare outputs of solutions with the answers while the solutions are running, '
+                             'without saving them to files. Only the part of a wrong output starting from '
+                             'the first difference is saved. Used only if the task has no checker.')
+
+
+def add_workdir_argument(parser: argparse.ArgumentParser):
+    parser.add_argument('--workdir', dest='workdir', type=str,
+                        help='directory for outputs of programs and other temporary files, for example a tmpfs '
+                             'like /dev/shm (default: `sinol_workdir` from config.yml or the package\'s '
+                             '.cache directory). Files in it are removed when sinol-make exits, only the results '
+                             'are kept in the cache.')
@@ -0,0 +1,105 @@
+import os
+import re
+import json
+import fcntl
+import shutil
+import hashlib
+import tempfile
+import subprocess
+from typing import List, Union
+
+from sinol_make.helpers import compiler
+
+# Environment variable which disables precompiled headers when set to `0`.
+PCH_VARIABLE = "SINOL_MAKE_PCH"
+PRECOMPILED_HEADER = "bits/stdc++.h"
+__INCLUDES_HEADER = re.compile(r'^\s*#\s*include\s*<bits/stdc\+\+\.h>', re.MULTILINE)
+
+
+def is_enabled() -> bool:
+    return os.environ.get(PCH_VARIABLE, "1").strip() != "0"
+
+
+def get_pch_path():
+    """
+    Returns path to the directory in the user's cache directory, in which precompiled headers are stored.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "sinol-make", "pch")
+
+
+def _includes_header(program: str) -> bool:
+    try:
+        with open(program, "r", errors="replace") as f:
+            return __INCLUDES_HEADER.search(f.read()) is not None
+    except OSError:
+        return False
+
+
+def _is_gcc(compiler_path: str) -> bool:
+    version = compiler.get_compiler_version(compiler_path)
+    return version != "" and "clang" not in version.lower()
+
+
+def _build(compiler_path: str, flags: List[str], directory: str):
+    """
+    Precompiles `bits/stdc++.h` into `directory`/include. If it fails, a marker is saved so that
+    it isn't tried again for the same flags.
+    """
+    os.makedirs(directory, exist_ok=True)
+    header = os.path.join(directory, "stdc++.h")
+    with open(header, "w") as f:
+        f.write(f"#include <{PRECOMPILED_HEADER}>\n")
+    output = os.path.join(directory, "include", PRECOMPILED_HEADER + ".gch")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(output), prefix=".tmp", delete=False) as f:
+        temp_path = f.name
+    try:
+        process = subprocess.run([compiler_path, "-x", "c++-header", header, "-o", temp_path] + flags,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if process.returncode == 0:
+            os.replace(temp_path, output)
+        else:
+            open(os.path.join(directory, "failed"), "w").close()
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+
+def get_include_dir(program: str, compiler_path: str, flags: List[str]) -> Union[str, None]:
+    """
+    Returns a directory with `bits/stdc++.h` precompiled with `flags`, which should be passed to the compiler
+    with `-I`, so that the header isn't parsed again for every program. GCC uses the precompiled header only if
+    it was built with compatible flags and falls back to the regular header otherwise, so it can't change the
+    result of compilation. The header is built on first use, once for every compiler and set of flags.
+    :param program: Path to the program, which is compiled with the header only if it includes `bits/stdc++.h`.
+    :param compiler_path: Path to the C++ compiler.
+    :param flags: Compilation flags which affect the precompiled header, like the standard and optimization level.
+    :return: The directory or None if the program can't use a precompiled header.
+    """
+    if not is_enabled() or not _includes_header(program):
+        return None
+    resolved_compiler = shutil.which(compiler_path)
+    if resolved_compiler is None or not _is_gcc(resolved_compiler):
+        return None
+
+    key = hashlib.md5(json.dumps({
+        "compiler": os.path.realpath(resolved_compiler),
+        "version": compiler.get_compiler_version(resolved_compiler),
+        "flags": flags,
+    }).encode("utf-8")).hexdigest()
+    directory = os.path.join(get_pch_path(), key)
+    include_dir = os.path.join(directory, "include")
+    precompiled = os.path.join(include_dir, PRECOMPILED_HEADER + ".gch")
+    failed = os.path.join(directory, "failed")
+    try:
+        if not os.path.exists(precompiled) and not os.path.exists(failed):
+            os.makedirs(get_pch_path(), exist_ok=True)
+            # Programs are compiled in parallel, so the header is built by the first of them and the others wait.
+            with open(directory + ".lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                if not os.path.exists(precompiled) and not os.path.exists(failed):
+                    _build(resolved_compiler, flags, directory)
+    except OSError:
+        return None
+    return include_dir if os.path.exists(precompiled) else None
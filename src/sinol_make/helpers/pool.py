@@ -0,0 +1,234 @@
+import os
+import time
+import heapq
+import queue
+import atexit
+import collections
+import functools
+import itertools
+import multiprocessing as mp
+import multiprocessing.pool
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from sinol_make.helpers import func_cache
+
+# Modules imported by the fork server, so workers don't have to import them for every command.
+PRELOADED_MODULES = [
+    'sinol_make.commands.run',
+    'sinol_make.commands.ingen',
+    'sinol_make.commands.outgen',
+    'sinol_make.commands.inwer',
+    'sinol_make.commands.chkwer',
+]
+
+__pool = None
+__pool_processes = None
+__batches = itertools.count()
+# Batch of tasks the current worker process last ran a task from.
+__worker_batch = None
+
+
+def _run_task(func: Callable, cwd: str, batch: int, *args):
+    """
+    Runs a task in a worker. Workers live as long as sinol-make, so before the first task of a batch
+    the worker changes to the directory of the package and clears cached results of functions,
+    which may have been computed for another package or an older config.
+    """
+    global __worker_batch
+    if __worker_batch != batch:
+        __worker_batch = batch
+        os.chdir(cwd)
+        func_cache.clear_cache()
+    return func(*args)
+
+
+def get_pool(processes: int) -> mp.pool.Pool:
+    """
+    Returns the worker pool shared by all commands run in this process, creating it if needed.
+    Workers are started by a fork server with `PRELOADED_MODULES` already imported.
+    """
+    global __pool, __pool_processes
+    if __pool is not None and __pool_processes != processes:
+        terminate()
+    if __pool is None:
+        if 'forkserver' in mp.get_all_start_methods():
+            context = mp.get_context('forkserver')
+            context.set_forkserver_preload(PRELOADED_MODULES)
+        else:
+            context = mp.get_context()
+        __pool = context.Pool(processes)
+        __pool_processes = processes
+    return __pool
+
+
+def terminate():
+    """
+    Terminates the shared pool, for example after a keyboard interrupt. The next call to `get_pool` creates a new one.
+    """
+    global __pool, __pool_processes
+    if __pool is not None:
+        __pool.terminate()
+        __pool.join()
+        __pool = None
+        __pool_processes = None
+
+
+atexit.register(terminate)
+
+
+def _run_timed(func: Callable, indexed_item: Tuple[int, Any]) -> Tuple[int, Any, float]:
+    index, item = indexed_item
+    start = time.perf_counter()
+    result = func(item)
+    return index, result, time.perf_counter() - start
+
+
+def _batch_func(func: Callable) -> Callable:
+    return functools.partial(_run_task, func, os.getcwd(), next(__batches))
+
+
+def _consume(results: Iterator) -> Iterator:
+    """
+    Yields the results. If they aren't consumed to the end (for example because of an error), the pool
+    is terminated like a pool used in a `with` statement, so the remaining tasks don't keep the workers busy.
+    """
+    finished = False
+    try:
+        yield from results
+        finished = True
+    finally:
+        if not finished:
+            terminate()
+
+
+def imap(func: Callable, iterable: Iterable, processes: int) -> Iterator:
+    """
+    Works like `multiprocessing.Pool.imap`, but runs the tasks on the shared pool with `processes` workers.
+    `func` is pickled with every task, so it shouldn't be a method of an object with a lot of state.
+    """
+    return _consume(get_pool(processes).imap(_batch_func(func), iterable))
+
+
+def _imap_unordered_lazy(func: Callable, iterable: Iterable, processes: int,
+                         skip: Union[Callable[[Any], bool], None], prerequisite_func: Callable = None,
+                         prerequisites: Sequence = (), get_prerequisites: Callable[[Any], Iterable[int]] = None,
+                         on_prerequisite: Callable[[int, Any], bool] = None) -> Iterator[Tuple[int, Any, float]]:
+    """
+    Submits the next item of `iterable` only when a worker is free. Items for which `skip` returns True
+    at that moment aren't run, and are yielded with None as the result.
+    Prerequisites are submitted before the items, see `imap_unordered_after`.
+    """
+    worker_pool = get_pool(processes)
+    finished = queue.Queue()
+    items = list(iterable)
+    # Indexes of items which can be started, kept in a heap, so they are started in the order of `iterable`.
+    ready = []
+    # Indexes of items waiting for each prerequisite and numbers of prerequisites every item still waits for.
+    waiting = collections.defaultdict(list)
+    waiting_for = [0] * len(items)
+    for index, item in enumerate(items):
+        for prerequisite in (get_prerequisites(item) if get_prerequisites is not None else ()):
+            waiting[prerequisite].append(index)
+            waiting_for[index] += 1
+        if waiting_for[index] == 0:
+            ready.append(index)
+    # Items which depend on a failed prerequisite.
+    failed = set()
+    prerequisites_to_start = collections.deque(enumerate(prerequisites))
+    running = 0
+
+    def submit(func, arg, kind):
+        worker_pool.apply_async(func, (arg,), callback=lambda value: finished.put((kind, value)),
+                                error_callback=lambda error: finished.put(("error", error)))
+
+    while True:
+        while running < processes:
+            if prerequisites_to_start:
+                index, prerequisite = prerequisites_to_start.popleft()
+                submit(prerequisite_func, prerequisite, ("prerequisite", index))
+            elif ready:
+                index = heapq.heappop(ready)
+                if skip is not None and skip(items[index]):
+                    yield index, None, 0.0
+                    continue
+                submit(func, (index, items[index]), ("item", None))
+            else:
+                break
+            running += 1
+        if running == 0:
+            return
+        kind, value = finished.get()
+        running -= 1
+        if kind == "error":
+            raise value
+        if kind[0] == "item":
+            yield value
+            continue
+        success = on_prerequisite is None or on_prerequisite(kind[1], value)
+        for index in waiting.pop(kind[1], []):
+            waiting_for[index] -= 1
+            if not success:
+                failed.add(index)
+            if waiting_for[index] == 0:
+                if index in failed:
+                    yield index, None, 0.0
+                else:
+                    heapq.heappush(ready, index)
+
+
+def imap_unordered(func: Callable, iterable: Iterable, processes: int,
+                   skip: Union[Callable[[Any], bool], None] = None, lazy: bool = False) \
+        -> Iterator[Tuple[int, Any, float]]:
+    """
+    Works like `multiprocessing.Pool.imap_unordered`, but runs the tasks on the shared pool with `processes`
+    workers. Tasks are started in the order of `iterable`.
+    :param skip: If set, it's called for every item right before its task would be started and if it returns
+                 True, the task isn't run and its result is None. As the decision can depend on the results
+                 of previous tasks, tasks are then submitted one by one when a worker becomes free.
+    :param lazy: If True, tasks are submitted one by one when a worker becomes free, so tasks submitted
+                 with `apply_async` in the meantime don't wait until all of these tasks are started.
+    :return: Iterator of tuples (index of the item in `iterable`, result, time in seconds the task took).
+    """
+    timed_func = _batch_func(functools.partial(_run_timed, func))
+    if skip is not None or lazy:
+        return _consume(_imap_unordered_lazy(timed_func, iterable, processes, skip))
+    return _consume(get_pool(processes).imap_unordered(timed_func, enumerate(iterable)))
+
+
+def imap_unordered_after(func: Callable, iterable: Iterable, processes: int, prerequisite_func: Callable,
+                         prerequisites: Sequence, get_prerequisites: Callable[[Any], Iterable[int]],
+                         on_prerequisite: Callable[[int, Any], bool],
+                         skip: Union[Callable[[Any], bool], None] = None) -> Iterator[Tuple[int, Any, float]]:
+    """
+    Works like `imap_unordered` with `skip`, but the tasks of items of `iterable` can depend on other tasks,
+    which run `prerequisite_func` on items of `prerequisites`. Both kinds of tasks share the `processes` workers.
+    Prerequisites are started first and the task of an item is started only after all its prerequisites finished,
+    so tasks of items which depend on different prerequisites overlap with the remaining prerequisites.
+    :param get_prerequisites: Returns indexes in `prerequisites` of the prerequisites of an item.
+    :param on_prerequisite: Called in this process with the index and the result of every finished prerequisite.
+                            If it returns False, tasks of items which depend on it aren't run and their result
+                            is None.
+    :return: Iterator of tuples (index of the item in `iterable`, result, time in seconds the task took).
+             Results of prerequisites are only passed to `on_prerequisite`.
+    """
+    timed_func = _batch_func(functools.partial(_run_timed, func))
+    return _consume(_imap_unordered_lazy(timed_func, iterable, processes, skip, _batch_func(prerequisite_func),
+                                         prerequisites, get_prerequisites, on_prerequisite))
+
+
+def apply_async(func: Callable, args: Iterable, processes: int) -> mp.pool.AsyncResult:
+    """
+    Works like `multiprocessing.Pool.apply_async`, but runs the task on the shared pool with `processes` workers.
+    """
+    return get_pool(processes).apply_async(_batch_func(func), tuple(args))
+
+
+def starmap(func: Callable, iterable: Iterable, processes: int) -> List:
+    """
+    Works like `multiprocessing.Pool.starmap`, but runs the tasks on the shared pool with `processes` workers.
+    """
+    try:
+        return get_pool(processes).starmap(_batch_func(func), iterable)
+    except BaseException:
+        terminate()
+        raise
@@ -0,0 +1,84 @@
+import os
+import json
+import shutil
+import tempfile
+from typing import Any, Callable, Dict, Union
+
+# Results of probes loaded from the probe cache, None if the cache wasn't loaded yet.
+__probes: Union[Dict[str, Dict], None] = None
+
+
+def get_probe_cache_path():
+    """
+    Returns path to the file in the user's cache directory, in which results of probing the environment
+    (for example whether a compiler is installed) are stored between invocations of sinol-make.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "sinol-make", "probes.json")
+
+
+def _load() -> Dict[str, Dict]:
+    global __probes
+    if __probes is None:
+        try:
+            with open(get_probe_cache_path(), "r") as f:
+                __probes = json.load(f)
+            if not isinstance(__probes, dict):
+                __probes = {}
+        except (OSError, ValueError):
+            __probes = {}
+    return __probes
+
+
+def _save():
+    """
+    Saves the probe cache. The file is replaced atomically, as other invocations of sinol-make can read it
+    at the same time. If it can't be saved, probes will just be run again next time.
+    """
+    path = get_probe_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path), delete=False) as f:
+            json.dump(__probes, f)
+        os.replace(f.name, path)
+    except OSError:
+        pass
+
+
+def _get_program_key(program: str) -> Union[Dict[str, Any], None]:
+    """
+    Returns a description of the program which changes when the program is replaced, installed or removed:
+    its resolved path, modification time, size and inode. Returns None if the program doesn't exist.
+    """
+    path = shutil.which(program)
+    if path is None:
+        return None
+    path = os.path.realpath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {"path": path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "inode": stat.st_ino}
+
+
+def cached_probe(name: str, program: str, probe: Callable[[], Any], extra_key: Any = None) -> Any:
+    """
+    Returns the result of `probe`, which checks the program `program`. The result is stored in the probe cache
+    and reused, without running the probe, until the program changes.
+    :param name: Name of the probe.
+    :param program: Path to the program or its name, which is looked up in PATH.
+    :param probe: Function which runs the probe. Its result must be serializable to JSON.
+    :param extra_key: JSON-serializable value which the result of the probe depends on, apart from the program.
+    """
+    probes = _load()
+    cache_key = f"{name}:{program}"
+    key = {"program": _get_program_key(program), "extra": extra_key}
+    cached = probes.get(cache_key)
+    if isinstance(cached, dict) and cached.get("key") == key and "result" in cached:
+        return cached["result"]
+
+    result = probe()
+    probes[cache_key] = {"key": key, "result": result}
+    _save()
+    return result
+
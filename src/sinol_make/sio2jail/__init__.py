@@ -3,10 +3,10 @@ import stat
 import subprocess
 import sys
 import tempfile
-import requests
 
 from sinol_make import util
 from sinol_make.executors.sio2jail import Sio2jailExecutor
+from sinol_make.helpers import probe_cache
 from sinol_make.structs.status_structs import Status
 
 def sio2jail_supported():
@@ -18,8 +18,16 @@ def get_default_sio2jail_path():
 
 
 def check_sio2jail(path=None):
+    """
+    Checks if the right version of sio2jail is installed. The result is cached between invocations
+    until sio2jail changes.
+    """
     if path is None:
         path = get_default_sio2jail_path()
+    return probe_cache.cached_probe("sio2jail_version", path, lambda: _check_version(path))
+
+
+def _check_version(path):
     try:
         sio2jail = subprocess.Popen([path, "--version"],
                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE)
@@ -36,6 +44,9 @@ def install_sio2jail(directory=None):
     """
     Downloads and installs sio2jail to the specified directory, creating it if it doesn't exist
     """
+    # Imported here, because importing requests is slow.
+    import requests
+
     if directory is None:
         directory = os.path.expanduser('~/.local/bin')
     path = os.path.join(directory, 'sio2jail')
@@ -63,9 +74,18 @@ def install_sio2jail(directory=None):
     return True
 
 
+def _get_boot_id():
+    try:
+        with open('/proc/sys/kernel/random/boot_id') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
 def check_perf_counters_enabled():
     """
-    Checks if sio2jail is able to use perf counters to count instructions.
+    Checks if sio2jail is able to use perf counters to count instructions. A successful check is cached
+    between invocations until sio2jail or `kernel.perf_event_paranoid` changes or the system is rebooted.
     """
     if not sio2jail_supported() or not check_sio2jail():
         return
@@ -73,6 +93,15 @@ def check_perf_counters_enabled():
     with open('/proc/sys/kernel/perf_event_paranoid') as f:
         perf_event_paranoid = int(f.read())
 
+    probe_cache.cached_probe("perf_counters", get_default_sio2jail_path(),
+                             lambda: _check_perf_counters(perf_event_paranoid), [perf_event_paranoid, _get_boot_id()])
+
+
+def _check_perf_counters(perf_event_paranoid):
+    """
+    Runs a test program in sio2jail with instruction counting. Exits with an error if it fails,
+    so only successful checks are cached.
+    """
     executor = Sio2jailExecutor(get_default_sio2jail_path())
     test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'perf_test.py')
     python_executable = sys.executable
@@ -136,3 +165,4 @@ def check_perf_counters_enabled():
             "\nThis will make measured solution run times significantly different from SIO2."
             "\nFor more details, see https://github.com/sio2project/sio2jail#running."
         )
+    return True
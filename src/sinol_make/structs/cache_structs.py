@@ -36,6 +36,15 @@ class CacheTest:
             "result": self.result.to_dict()
         }
 
+    @staticmethod
+    def from_dict(dict) -> 'CacheTest':
+        return CacheTest(
+            time_limit=dict["time_limit"],
+            memory_limit=dict["memory_limit"],
+            time_tool=dict["time_tool"],
+            result=ExecutionResult.from_dict(dict["result"])
+        )
+
 
 @dataclass
 class CacheFile:
@@ -49,19 +58,14 @@ class CacheFile:
     sanitizers: str
     # Hash of extra compilation arguments and files used during compilation
     extra_compilation_hash: str
-    # Test results
-    tests: Dict[str, CacheTest]
 
     def __init__(self, md5sum="", executable_path="", compilation_flags="default", sanitizers="no",
-                 extra_compilation_hash="", tests=None):
-        if tests is None:
-            tests = {}
+                 extra_compilation_hash=""):
         self.md5sum = md5sum
         self.executable_path = executable_path
         self.compilation_flags = compilation_flags
         self.sanitizers = sanitizers
         self.extra_compilation_hash = extra_compilation_hash
-        self.tests = tests
 
     def to_dict(self) -> Dict:
         return {
@@ -70,7 +74,6 @@ class CacheFile:
             "compilation_flags": self.compilation_flags,
             "sanitizers": self.sanitizers,
             "extra_compilation_hash": self.extra_compilation_hash,
-            "tests": {k: v.to_dict() for k, v in self.tests.items()}
         }
 
     @staticmethod
@@ -87,14 +90,11 @@ class CacheFile:
             # Older versions of sinol-make didn't store the hash. Empty string means that
             # the package didn't use extra compilation arguments or files.
             extra_compilation_hash=dict.get("extra_compilation_hash", ""),
-            tests={k: CacheTest(
-                time_limit=v["time_limit"],
-                memory_limit=v["memory_limit"],
-                time_tool=v["time_tool"],
-                result=ExecutionResult.from_dict(v["result"])
-            ) for k, v in dict.get("tests", {}).items()}
         )
 
     def save(self, solution_path: str):
+        """
+        Saves the cache file. Test results of the solution are stored separately, see `cache.save_test_results`.
+        """
         with open(paths.get_cache_path("md5sums", os.path.basename(solution_path)), 'w') as cache_file:
             yaml.dump(self.to_dict(), cache_file)
@@ -1,6 +1,19 @@
 from dataclasses import dataclass
 
 
+@dataclass
+class InputGenerationArguments:
+    """
+    Arguments used for function that generates a single input file.
+    """
+    # Path to ingen executable
+    ingen_exe: str
+    # Name of the generated input file
+    test: str
+    # Working directory of ingen
+    working_dir: str
+
+
 @dataclass
 class OutputGenerationArguments:
     """
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List
+from typing import List, Union
 
 
 class Status(str, Enum):
@@ -11,6 +11,8 @@ class Status(str, Enum):
     RE = "RE"
     WA = "WA"
     OK = "OK"
+    # Test wasn't run, because the result of its group was already known (see `run --early-termination`).
+    SKIPPED = "SK"
 
     def __str__(self):
         return self.name
@@ -32,6 +34,8 @@ class Status(str, Enum):
             return Status.WA
         elif status == "OK":
             return Status.OK
+        elif status == "SK":
+            return Status.SKIPPED
         elif status == "  ":
             return Status.PENDING
         else:
@@ -99,9 +103,12 @@ class ExecutionResult:
     Stderr: List[str]
     # Original command line that was run
     Cmdline: str
+    # Whether the verdict of the checker was taken from the cache, None if the checker wasn't run.
+    # Used only for statistics, so it isn't saved.
+    CheckerCached: Union[bool, None] = field(default=None, compare=False)
 
     def __init__(self, status=None, Time=None, Memory=None, Points=0, Error=None, Fail=False, ExitSignal=0, Comment="",
-                 Stderr=None, Cmdline=None):
+                 Stderr=None, Cmdline=None, CheckerCached=None):
         self.Status = status
         self.Time = Time
         self.Memory = Memory
@@ -112,6 +119,7 @@ class ExecutionResult:
         self.Comment = Comment
         self.Stderr = Stderr if Stderr is not None else []
         self.Cmdline = Cmdline
+        self.CheckerCached = CheckerCached
 
     @staticmethod
     def from_dict(dict):
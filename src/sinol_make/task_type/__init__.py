@@ -5,7 +5,9 @@ from typing import Tuple, List, Type
 
 from sinol_make import util
 from sinol_make.executors.sio2jail import Sio2jailExecutor
+from sinol_make.executors.cgroups import CgroupExecutor
 from sinol_make.executors.time import TimeExecutor
+from sinol_make.executors.wait4 import Wait4Executor
 from sinol_make.helpers import package_util, paths, cache, oicompare
 from sinol_make.helpers.classinit import RegisteredSubclassesBase
 from sinol_make.interfaces.Errors import CheckerException
@@ -60,11 +62,18 @@ class BaseTaskType(RegisteredSubclassesBase):
         self.sio2jail_path = sio2jail_path
         self.has_checker = False
         self.checker_path = None
+        # Whether outputs of solutions should be compared with the answers while the solutions run,
+        # instead of being saved to files. Used only if there is no checker.
+        self.stream_outputs = False
 
         if self.timetool == 'time':
             self.executor = TimeExecutor()
         elif self.timetool == 'sio2jail':
             self.executor = Sio2jailExecutor(sio2jail_path, fake_time)
+        elif self.timetool == 'wait4':
+            self.executor = Wait4Executor()
+        elif self.timetool == 'cgroups':
+            self.executor = CgroupExecutor()
         else:
             util.exit_with_error(f"Unknown timetool {self.timetool}")
         self._check_task_type_changed()
@@ -152,7 +161,7 @@ class BaseTaskType(RegisteredSubclassesBase):
         output, stderr = proc.communicate()
         if proc.returncode > 2:
             return False, Fraction(0, 1), (f"Checker returned with code {proc.returncode}, "
-                                           f"stderr: '{stderr.decode('utf-8')}'")
+                                           f"stderr: '{stderr.decode('utf-8')}'"), stderr.decode('utf-8')
         return self._parse_checker_output(output.decode('utf-8').split('\n'), stderr.decode('utf-8'))
 
     def _run_diff(self, output_file_path, answer_file_path) -> Tuple[bool, Fraction, str, str]:
@@ -180,13 +189,45 @@ class BaseTaskType(RegisteredSubclassesBase):
                                    f"Output: {output.decode('utf-8').strip()}\n"
                                    f"Stderr: {stderr.decode('utf-8').strip()}")
 
+    def _get_checker_id(self) -> str:
+        """
+        Returns an identifier of the program which checks outputs, which changes when the program changes.
+        """
+        if self.has_checker:
+            return "checker:" + util.get_file_md5(self.checker_path)
+        elif oicompare.check_installed():
+            return "oicompare:" + util.get_file_md5(oicompare.get_path())
+        else:
+            return "diff:" + util.get_file_md5(oicompare.__file__)
+
+    def check_output_cached(self, input_file_path, output_file_path,
+                            answer_file_path) -> Tuple[Tuple[bool, Fraction, str, str], bool]:
+        """
+        Works like `check_output`, but also returns whether the verdict was taken from the cache.
+        """
+        md5sums = util.get_files_md5([input_file_path, output_file_path, answer_file_path])
+        key = (self._get_checker_id(), md5sums[input_file_path], md5sums[output_file_path],
+               md5sums[answer_file_path])
+        result = cache.get_checker_result(key)
+        if result is not None:
+            return result, True
+        result = self._check_output(input_file_path, output_file_path, answer_file_path)
+        cache.save_checker_result(key, result)
+        return result, False
+
     def check_output(self, input_file_path, output_file_path, answer_file_path) -> Tuple[bool, Fraction, str, str]:
         """
-        Runs the checker (or runs diff) and returns a tuple of three values:
+        Runs the checker (or runs diff) and returns a tuple of four values:
         - bool: whether the solution is correct
         - Fraction: percentage of the score
         - str: optional comment
+        - str: stderr of the checker
+        Verdicts are cached by md5 sums of the checker, input, output and answer files, so identical
+        outputs (for example of different solutions) are checked only once.
         """
+        return self.check_output_cached(input_file_path, output_file_path, answer_file_path)[0]
+
+    def _check_output(self, input_file_path, output_file_path, answer_file_path) -> Tuple[bool, Fraction, str, str]:
         if self.has_checker:
             return self._run_checker(input_file_path, output_file_path, answer_file_path)
         elif oicompare.check_installed():
@@ -197,3 +238,7 @@ class BaseTaskType(RegisteredSubclassesBase):
     def run(self, time_limit, hard_time_limit, memory_limit, input_file_path, output_file_path, answer_file_path,
             result_file_path, executable, execution_dir) -> ExecutionResult:
         raise NotImplementedError
+
+
+# Task types are registered as subclasses of `BaseTaskType` when their modules are imported.
+from sinol_make.task_type import normal, interactive  # noqa: E402
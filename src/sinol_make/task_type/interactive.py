@@ -176,7 +176,7 @@ class InteractiveTaskType(BaseTaskType):
         with open(input_file_path, "r") as inf, open(output_file_path, "w") as outf:
             interactor = self.ExecutionWrapper(
                 self.interactor_executor,
-                [f'"{self.interactor}"'] + interactor_args,
+                [self.interactor] + interactor_args,
                 time_limit * 2,
                 hard_time_limit * 2,
                 memory_limit,
@@ -193,7 +193,7 @@ class InteractiveTaskType(BaseTaskType):
                 pipes = proc_pipes[i]
                 proc = self.ExecutionWrapper(
                     self.executor,
-                    [f'"{executable}"', str(i)],
+                    [executable, str(i)],
                     time_limit,
                     hard_time_limit,
                     memory_limit,
@@ -1,5 +1,8 @@
+import os
+import threading
 from typing import Tuple
 
+from sinol_make.helpers import oicompare
 from sinol_make.interfaces.Errors import CheckerException
 from sinol_make.structs.status_structs import ExecutionResult, Status
 from sinol_make.task_type import BaseTaskType
@@ -14,10 +17,88 @@ class NormalTaskType(BaseTaskType):
     def name() -> str:
         return "normal"
 
+    @staticmethod
+    def _read_output(pipe_fd: int, comparator: oicompare.StreamComparator, output_file_path: str,
+                     errors: list):
+        """
+        Reads the output of a solution from a pipe and compares it with the answer. If the output differs,
+        the rest of it, starting from the part with the first difference, is saved to `output_file_path`.
+        The pipe is read to the end even after an error, so the solution isn't blocked.
+        """
+        output_file = None
+        with open(pipe_fd, "rb", buffering=0) as pipe:
+            while True:
+                data = pipe.read(1024 * 1024)
+                if not data:
+                    break
+                if output_file is not None:
+                    output_file.write(data)
+                    continue
+                if errors:
+                    continue
+                try:
+                    comparator.write(data)
+                    if not comparator.same:
+                        output_file = open(output_file_path, "wb")
+                        output_file.write(comparator.unchecked_output)
+                except Exception as e:
+                    errors.append(e)
+        if output_file is not None:
+            output_file.close()
+
+    def _run_streaming(self, time_limit, hard_time_limit, memory_limit, input_file_path, output_file_path,
+                       answer_file_path, result_file_path, executable, execution_dir) -> ExecutionResult:
+        """
+        Runs the solution with its output compared with the answer while it's being written, so it doesn't
+        have to be written to and read from a file.
+        """
+        if os.path.exists(output_file_path):
+            os.remove(output_file_path)
+        comparator = oicompare.StreamComparator(answer_file_path)
+        errors = []
+        read_fd, write_fd = os.pipe()
+        reader = threading.Thread(target=self._read_output, args=(read_fd, comparator, output_file_path, errors))
+        reader.start()
+        try:
+            with open(input_file_path, "r") as inf:
+                result = self.executor.execute([executable], time_limit, hard_time_limit, memory_limit,
+                                               result_file_path, executable, execution_dir, stdin=inf,
+                                               stdout=write_fd)
+        finally:
+            # The solution has finished, so the reader gets the end of the output.
+            os.close(write_fd)
+            reader.join()
+            same = comparator.finish() if not errors else False
+        if errors:
+            raise errors[0]
+        if not same and comparator.unchecked_line is not None and not os.path.exists(output_file_path):
+            # The difference was found in the output which was buffered until the solution finished.
+            with open(output_file_path, "wb") as output_file:
+                output_file.write(comparator.unchecked_output)
+
+        if result.Time > time_limit:
+            result.Status = Status.TL
+        elif result.Memory > memory_limit:
+            result.Status = Status.ML
+        elif result.Status == Status.OK:
+            if same:
+                result.Points = 100.0
+            else:
+                result.Status = Status.WA
+                result.Points = 0.0
+                result.Comment = f"Output differs from the answer in line {comparator.difference_line}."
+                if comparator.unchecked_line is not None:
+                    result.Comment += (f" Output from line {comparator.unchecked_line} on is saved in "
+                                       f"{output_file_path}.")
+        return result
+
     def run(self, time_limit, hard_time_limit, memory_limit, input_file_path, output_file_path, answer_file_path,
             result_file_path, executable, execution_dir) -> ExecutionResult:
+        if self.stream_outputs and not self.has_checker:
+            return self._run_streaming(time_limit, hard_time_limit, memory_limit, input_file_path, output_file_path,
+                                       answer_file_path, result_file_path, executable, execution_dir)
         with open(input_file_path, "r") as inf, open(output_file_path, "w") as outf:
-            result = self.executor.execute([f'"{executable}"'], time_limit, hard_time_limit, memory_limit,
+            result = self.executor.execute([executable], time_limit, hard_time_limit, memory_limit,
                                            result_file_path, executable, execution_dir, stdin=inf, stdout=outf)
         if result.Time > time_limit:
             result.Status = Status.TL
@@ -25,7 +106,8 @@ class NormalTaskType(BaseTaskType):
             result.Status = Status.ML
         elif result.Status == Status.OK:
             try:
-                correct, points, comment, _ = self.check_output(input_file_path, output_file_path, answer_file_path)
+                (correct, points, comment, _), result.CheckerCached = self.check_output_cached(
+                    input_file_path, output_file_path, answer_file_path)
                 result.Points = float(points)
                 result.Comment = comment
                 if not correct:
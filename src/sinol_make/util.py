@@ -1,43 +1,55 @@
-import glob, importlib, os, sys, requests, yaml
+import importlib, os, sys
 import math
 import platform
 import tarfile
 import hashlib
 import multiprocessing
 import resource
-from typing import Union
+import time
+import concurrent.futures
+from typing import Dict, List, Union
 from packaging.version import parse as parse_version
 
-from sinol_make.contest_types import get_contest_type
-from sinol_make.helpers import paths, cache
-from sinol_make.helpers.func_cache import cache_result
-from sinol_make.structs.status_structs import Status
+from sinol_make.helpers import paths
 
+# Modules which import a lot (requests, yaml, contest types, cache) are imported in functions which use them,
+# so that starting sinol-make, for example to show the help, is fast.
 
-@cache_result()
-def get_commands():
+# Names of all commands with their short names and help messages. Modules of commands are imported
+# only when the commands are used.
+COMMANDS = {
+    "chkwer": ("c", "Run checker with model solution and print results"),
+    "doc": ("d", "Compile latex files to pdf"),
+    "export": ("e", "Create archive for oioioi upload"),
+    "gen": ("g", "Generate input and output files"),
+    "ingen": (None, "Generate input files"),
+    "init": (None, "Create package from the template"),
+    "inwer": ("i", "Verify if input files are correct"),
+    "outgen": (None, "Generate output files"),
+    "run": ("r", "Runs solutions in parallel on tests and verifies the expected solutions' scores with the config."),
+    "verify": ("v", "Verify the package"),
+}
+
+
+def get_command(name: str):
     """
-    Function to get an array of all available commands.
+    Function to get a new instance of the command with the given name.
     """
-    commands_path = glob.glob(
-        os.path.join(
-            os.path.dirname(os.path.realpath(__file__)),
-            'commands/*'
-        )
-    )
-    commands = []
-    for path in commands_path:
-        temp = importlib.import_module('sinol_make.commands.' + os.path.basename(path), 'Command')
-        commands.append(temp.Command())
+    return importlib.import_module('sinol_make.commands.' + name).Command()
 
-    return commands
+
+def get_commands():
+    """
+    Function to get an array of all available commands. Imports modules of all commands.
+    """
+    return [get_command(name) for name in COMMANDS]
 
 
 def get_command_names():
     """
     Function to get an array of all available command names.
     """
-    return [command.get_name() for command in get_commands()]
+    return list(COMMANDS)
 
 
 def find_and_chdir_package():
@@ -60,6 +72,8 @@ def init_package_command(args):
     Updates arguments with contest specific overrides for commands
     that require being in package directory
     """
+    from sinol_make.contest_types import get_contest_type
+
     exit_if_not_package()
     contest = get_contest_type()
     contest.verify_config()
@@ -74,14 +88,18 @@ def exit_if_not_package():
     """
     if not find_and_chdir_package():
         exit_with_error('You are not in a package directory (couldn\'t find config.yml in current directory).')
+    from sinol_make.helpers import cache
+
     cache.create_cache_dirs()
     cache.check_can_access_cache()
+    cache.migrate_results_cache()
 
 
 def save_config(config):
     """
     Function to save nicely formated config.yml.
     """
+    import yaml
 
     # We add the fields in the `config.yml`` in a particular order to make the config more readable.
     # The fields that are not in this list will be appended to the end of the file.
@@ -95,6 +113,8 @@ def save_config(config):
         "sinol_static_tests",
         "sinol_undocumented_time_tool",
         "sinol_undocumented_test_limits",
+        "sinol_workdir",
+        "sinol_parallel_ingen",
         "fake_time",
         "testrun_soc",
         "num_processes",
@@ -212,6 +232,8 @@ def check_version():
     Function that asynchronously checks for new version of sinol-make.
     Writes the newest version to data/version file.
     """
+    import requests
+
     importlib = import_importlib_resources()
 
     try:
@@ -339,9 +361,59 @@ def is_macos_arm():
     return is_macos() and platform.machine().lower() == "arm64"
 
 
+# Files modified less than this many nanoseconds ago are not stored in the hash index. The file could
+# be modified again without changing its size and modification time (if the filesystem's timestamps
+# are coarse), so the stored hash would be wrong.
+__HASH_INDEX_MIN_AGE_NS = 2 * 10 ** 9
+# Files are hashed in chunks of this size, so memory usage doesn't depend on the size of the file.
+__HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _calculate_file_md5(path):
+    md5 = hashlib.md5()
+    buffer = bytearray(__HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while (size := f.readinto(buffer)) > 0:
+            md5.update(view[:size])
+    return md5.hexdigest()
+
+
+def get_files_md5(files: List[str]) -> Dict[str, str]:
+    """
+    Returns md5 sums of files. Files are hashed in parallel in threads, as hashlib releases the GIL
+    while hashing. Inside a package, hashes are stored in an index in the cache database together
+    with the inode, size and modification time of the file, so unchanged files aren't read again.
+    :param files: List of paths to files.
+    :return: Dictionary: {"<path to the file, as given>": "<md5 sum>"}
+    """
+    if not os.path.isdir(paths.get_cache_path()):
+        return dict(zip(files, _map_in_threads(_calculate_file_md5, files)))
+    from sinol_make.helpers import cache_db
+
+    stats = {os.path.abspath(file): os.stat(file) for file in files}
+    md5sums = cache_db.get_files_md5(stats)
+    to_hash = [path for path in stats if path not in md5sums]
+    new_md5sums = dict(zip(to_hash, _map_in_threads(_calculate_file_md5, to_hash)))
+    md5sums.update(new_md5sums)
+    now = time.time_ns()
+    cache_db.save_files_md5({path: (stats[path], md5) for path, md5 in new_md5sums.items()
+                             if now - stats[path].st_mtime_ns >= __HASH_INDEX_MIN_AGE_NS})
+    return {file: md5sums[os.path.abspath(file)] for file in files}
+
+
 def get_file_md5(path):
-    with open(path, "rb") as f:
-        return hashlib.md5(f.read()).hexdigest()
+    """
+    Returns md5 sum of the file. See `get_files_md5` for details.
+    """
+    return get_files_md5([path])[path]
+
+
+def _map_in_threads(func, items):
+    if len(items) <= 1:
+        return list(map(func, items))
+    with concurrent.futures.ThreadPoolExecutor(min(len(items), default_cpu_count())) as executor:
+        return list(executor.map(func, items))
 
 
 def try_fix_config(config):
@@ -363,6 +435,9 @@ def try_fix_config(config):
     #   solution1:
     #     expected: {1: {status: OK, points: 100}, 2: {status: OK, points: 100}, ...}
     #     points: 100
+    from sinol_make.contest_types import get_contest_type
+    from sinol_make.structs.status_structs import Status
+
     try:
         new_expected_scores = {}
         expected_scores = config["sinol_expected_scores"]
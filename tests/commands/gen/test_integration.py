@@ -588,3 +588,39 @@ def test_legacy_package_generated_outputs(capsys, create_package):
     out = capsys.readouterr().out
     assert "Verifying" not in out
     assert read_file(output) != "42\n"
+
+
+@pytest.mark.parametrize("create_package", [util.get_simple_package_path()], indirect=True)
+def test_parallel_ingen(capsys, create_package):
+    """
+    Test if an ingen which generates tests one by one is run separately for every test
+    and if outputs are generated as soon as their inputs are ready.
+    """
+    package_path = create_package
+    with open(os.path.join(package_path, "prog", "abcingen.sh"), "w") as f:
+        f.write('#!/bin/bash\n'
+                'case "$1" in\n'
+                '    --list) printf "abc1a.in\\nabc2a.in\\nabc3a.in\\nabc4a.in\\n" ;;\n'
+                '    --only) n=${2:3:1}; echo "$n $((2 * n + 1))" > "$2"; echo "Generated $2" ;;\n'
+                '    *) exit 1 ;;\n'
+                'esac\n')
+    config = package_util.get_config()
+    config["sinol_parallel_ingen"] = True
+    sm_util.save_config(config)
+
+    simple_run(["-c", "2"])
+    out = capsys.readouterr().out
+    assert "Generating 4 input files on 2 cpus." in out
+    assert "Generated abc3a.in" in out
+    assert "Generated 4 output files while generating the input files." in out
+    assert "Successfully generated all output files." not in out
+    assert read_file(os.path.join(package_path, "in", "abc3a.in")) == "3 7\n"
+    md5_sums = get_md5_sums(package_path)
+    for test in ["abc1a", "abc2a", "abc3a", "abc4a"]:
+        assert os.path.exists(os.path.join(package_path, "out", f"{test}.out"))
+        assert md5_sums[f"{test}.in"] == sm_util.get_file_md5(os.path.join(package_path, "in", f"{test}.in"))
+
+    simple_run(["-c", "2"])
+    out = capsys.readouterr().out
+    assert "while generating the input files" not in out
+    assert "All output files are up to date." in out
@@ -630,15 +630,14 @@ def test_results_caching(create_package, time_tool):
     task_id = package_util.get_task_id()
     solutions = package_util.get_solutions(task_id, None)
     for solution in solutions:
-        cache_file: CacheFile = cache.get_cache_file(solution)
+        test_results = cache.get_test_results(solution)
         for test in command.tests:
-            assert util.get_file_md5(test) in cache_file.tests
-            test_cache = cache_file.tests[util.get_file_md5(test)]
+            assert util.get_file_md5(test) in test_results
+            test_cache = test_results[util.get_file_md5(test)]
             lang = package_util.get_file_lang(solution)
             assert test_cache.time_limit == package_util.get_time_limit(test, command.config, lang, command.ID)
             assert test_cache.memory_limit == package_util.get_memory_limit(test, command.config, lang, command.ID)
-        assert cache_file is not None
-        assert cache_file.tests != {}
+        assert test_results != {}
 
 
 @pytest.mark.parametrize("create_package", [get_checker_package_path()], indirect=True)
@@ -667,8 +666,7 @@ def test_results_caching_checker_changed(create_package, time_tool):
     task_id = package_util.get_task_id()
     solutions = package_util.get_solutions(task_id, None)
     for solution in solutions:
-        cache_file: CacheFile = cache.get_cache_file(solution)
-        assert cache_file.tests == {}
+        assert cache.get_test_results(solution) == {}
 
 
 @pytest.mark.parametrize("create_package", [get_library_package_path()], indirect=True)
@@ -806,8 +804,7 @@ def test_contest_type_change(create_package, time_tool):
     task_id = package_util.get_task_id()
     solutions = package_util.get_solutions(task_id, None)
     for solution in solutions:
-        cache_file: CacheFile = cache.get_cache_file(solution)
-        assert cache_file.tests == {}
+        assert cache.get_test_results(solution) == {}
 
 
 @pytest.mark.parametrize("create_package", [get_simple_package_path()], indirect=True)
@@ -847,8 +844,7 @@ def test_ghost_checker(create_package):
     task_type._check_had_file("checker", False)
 
     for solution in os.listdir(paths.get_cache_path("md5sums")):
-        cache_file: CacheFile = cache.get_cache_file(solution)
-        assert cache_file.tests == {}
+        assert cache.get_test_results(solution) == {}
 
     shutil.rmtree(paths.get_cache_path())
     shutil.move(os.path.join(os.getcwd(), ".cache-copy"), paths.get_cache_path())
@@ -1030,3 +1026,30 @@ def test_invalid_subtask_dependencies(create_package, time_tool, capsys):
 
     out = capsys.readouterr().out
     assert "circular dependency detected" in out
+
+
+@pytest.mark.parametrize("create_package", [get_simple_package_path()], indirect=True)
+def test_identical_solutions(create_package, time_tool):
+    """
+    Test if identical solutions are compiled and run once and get the same results.
+    """
+    package_path = create_package
+    create_ins_outs(package_path)
+    shutil.copy(os.path.join(package_path, "prog", "abc.cpp"), os.path.join(package_path, "prog", "abcs9.cpp"))
+    with open(os.path.join(package_path, "config.yml"), "r") as config_file:
+        config = yaml.load(config_file, Loader=yaml.SafeLoader)
+    config["sinol_expected_scores"]["abcs9.cpp"] = config["sinol_expected_scores"]["abc.cpp"]
+    with open(os.path.join(package_path, "config.yml"), "w") as config_file:
+        config_file.write(yaml.dump(config))
+
+    parser = configure_parsers()
+    args = parser.parse_args(["run", "--time-tool", time_tool])
+    command = Command()
+    command.run(args)
+
+    executable = os.stat(paths.get_executables_path("abc.cpp.e"))
+    identical_executable = os.stat(paths.get_executables_path("abcs9.cpp.e"))
+    assert (executable.st_dev, executable.st_ino) == (identical_executable.st_dev, identical_executable.st_ino)
+    assert os.listdir(paths.get_executions_path("abcs9.cpp")) == []
+    assert cache.get_test_results("abcs9.cpp").keys() == cache.get_test_results("abc.cpp").keys()
+    assert command.is_compiled("abcs9.cpp")
@@ -8,6 +8,7 @@ from sinol_make.executors.sio2jail import Sio2jailExecutor
 from sinol_make.contest_types.icpc import ICPCContest
 from sinol_make.contest_types.oij import OIJContest
 from sinol_make.structs.status_structs import ExecutionResult
+from sinol_make.structs.cache_structs import CacheTest
 
 from .util import *
 from ...util import *
@@ -54,7 +55,7 @@ def test_run_solutions(create_package, time_tool):
     package_path = create_package
     command = get_command(package_path)
     command.args = argparse.Namespace(solutions_report=False, time_tool=time_tool, compile_mode='default',
-                                      hide_memory=False, sanitize='no')
+                                      hide_memory=False, sanitize='no', early_termination=False, ignore_expected=False)
     create_ins_outs(package_path)
     command.tests = package_util.get_tests("abc", None)
     command.test_md5sums = {os.path.basename(test): util.get_file_md5(test) for test in command.tests}
@@ -63,6 +64,7 @@ def test_run_solutions(create_package, time_tool):
     command.possible_score = command.get_possible_score(command.groups)
     command.memory_limit = command.config["memory_limit"]
     command.time_limit = command.config["time_limit"]
+    command.limits = package_util.get_limits(command.tests, ["cpp"], command.config, "abc", command.args)
     command.timetool_path = sio2jail.get_default_sio2jail_path()
     command.timetool_name = time_tool
     command.task_type = NormalTaskType(timetool=time_tool, sio2jail_path=sio2jail.get_default_sio2jail_path())
@@ -80,6 +82,59 @@ def test_run_solutions(create_package, time_tool):
     }
 
 
+def test_schedule_executions(create_package):
+    """
+    Test if executions are scheduled longest first, using previous times and sizes of tests.
+    """
+    package_path = create_package
+    command = get_command(package_path)
+
+    def cached(status, time):
+        return CacheTest(time_limit=1000, memory_limit=1024, time_tool="time", result=ExecutionResult(status, Time=time))
+
+    assert command.predict_execution_time(cached(Status.OK, 300), 1000, 10, 100) == 300
+    assert command.predict_execution_time(cached(Status.TL, 1001), 1000, 10, 100) == 2000
+    assert command.predict_execution_time(None, 1000, 10, 100) == 100
+    assert command.predict_execution_time(None, 1000, 0, 0) == 1000
+
+    executions = [("abc.cpp", "abc.e", f"in/abc{i}a.in", 1000, 1024, None, None) for i in range(1, 5)]
+    scheduled = command.schedule_executions(executions, [100, 2000, 100, 500])
+    assert [execution[2] for execution in scheduled] == ["in/abc2a.in", "in/abc4a.in", "in/abc1a.in", "in/abc3a.in"]
+
+
+def test_is_group_result_known(create_package):
+    """
+    Test if the result of a group is known only when running the remaining tests can't change it.
+    """
+    package_path = create_package
+    command = get_command(package_path)
+    command.args = argparse.Namespace(ignore_expected=False)
+    command.scores = command.config["scores"]
+
+    def results(*statuses):
+        return {f"in/abc{i}a.in": ExecutionResult(status, Points=100 if status == Status.OK else 0)
+                for i, status in enumerate(statuses)}
+
+    assert not command.is_group_result_known("abc1.cpp", 4, results(Status.OK, Status.PENDING))
+    assert not command.is_group_result_known("abc1.cpp", 4, results(Status.PENDING, Status.PENDING))
+    # A time limit can't be replaced by a worse status.
+    assert command.is_group_result_known("abc1.cpp", 4, results(Status.OK, Status.TL, Status.PENDING))
+    assert command.is_group_result_known("abc.cpp", 4, results(Status.TL, Status.PENDING))
+    # Other statuses have to match the expected ones.
+    assert command.is_group_result_known("abc1.cpp", 4, results(Status.WA, Status.PENDING))
+    assert not command.is_group_result_known("abc1.cpp", 3, results(Status.WA, Status.PENDING))
+    assert not command.is_group_result_known("abc2.cpp", 4, results(Status.WA, Status.PENDING))
+    assert not command.is_group_result_known("abc5.cpp", 4, results(Status.WA, Status.PENDING))
+    command.args.ignore_expected = True
+    assert not command.is_group_result_known("abc1.cpp", 4, results(Status.WA, Status.PENDING))
+
+    # In a group worth 0 points the status has to be known.
+    command.scores = {**command.scores, 4: 0}
+    command.args.ignore_expected = False
+    assert not command.is_group_result_known("abc.cpp", 4, results(Status.OK, Status.PENDING))
+    assert command.is_group_result_known("abc1.cpp", 4, results(Status.OK, Status.WA, Status.PENDING))
+
+
 def test_validate_expected_scores_success():
     os.chdir(get_simple_package_path())
     command = get_command()
@@ -548,6 +603,51 @@ def test_calculate_group_result_icpc():
     assert calculate_group_result(contest, _results((1,)), _results((0, Status.WA)), 1) == (0, Status.WA, True)
 
 
+def test_results_view_incremental():
+    """
+    Test that the results table updated incrementally is the same as the one built from scratch.
+    """
+    from sinol_make.commands.run import ResultsView
+    from sinol_make.structs.run_structs import PrintData
+    os.chdir(get_simple_package_path())
+    contest = OIJContest()
+    config = {"time_limit": 1000, "memory_limit": 1024, "scores": {1: 50, 2: 50}, "subtask_dependencies": {2: [1]},
+              "override_limits": {"py": {"time_limit": 3000}}}
+    tests = ["in/abc1a.in", "in/abc1b.in", "in/abc2a.in"]
+    names = ["abc.cpp", "abc1.py", "abc2.cpp"]
+    limits = package_util.get_limits(tests, ["cpp", "py"], config, "abc")
+    all_results = {name: {package_util.get_group(test, "abc"): {} for test in tests} for name in names}
+    for name in names:
+        for test in tests:
+            all_results[name][package_util.get_group(test, "abc")][test] = ExecutionResult(Status.PENDING)
+    print_data = PrintData(0)
+    executions = [(name, test) for name in names for test in tests]
+
+    def create_view(program_groups_scores):
+        return ResultsView("abc", program_groups_scores, all_results, print_data, names, executions, [1, 2],
+                           config["scores"], tests, 100, 2, False, config, contest, limits)
+
+    view = create_view({name: {} for name in names})
+    finished = [("abc.cpp", "in/abc1a.in", ExecutionResult(Status.OK, Time=10, Memory=10, Points=100)),
+                ("abc1.py", "in/abc2a.in", ExecutionResult(Status.TL, Time=None, Memory=10, Points=0)),
+                ("abc.cpp", "in/abc1b.in", ExecutionResult(Status.WA, Time=600, Memory=900, Points=0)),
+                ("abc2.cpp", "in/abc1a.in", ExecutionResult(Status.OK, Time=20, Memory=20, Points=100))]
+    for i, (name, test, result) in enumerate(finished):
+        all_results[name][package_util.get_group(test, "abc")][test] = result
+        view.add_result(name, test)
+        print_data.i = i
+        for width in [60, 200]:
+            program_groups_scores = {name: {} for name in names}
+            assert view.print_view(width, 50) == create_view(program_groups_scores).print_view(width, 50)
+            assert view.program_groups_scores == program_groups_scores
+
+    output = view.print_view(200, 50)[0]
+    assert any("WA" in line and "0/ 50" in line for line in output)
+    # Group 2 of abc.cpp is lowered, because it depends on group 1.
+    assert view.program_groups_scores["abc.cpp"][2]["points"] == 0
+    assert view.print_view(5, 50) == (["Terminal window is too small to display the results."], None, None)
+
+
 def test_get_whole_groups_with_dependencies(create_package):
     """
     Test that a group whose dependencies weren't fully run is not checked.
@@ -1,7 +1,6 @@
 from typing import List
 import sys
 import glob
-import yaml
 import os
 import shutil
 import tempfile
@@ -43,7 +42,7 @@ def pytest_addoption(parser):
     parser.addoption("--github-runner", action="store_true", help="if set, will run tests specified for GitHub runner")
     parser.addoption(
         '--time-tool',
-        choices=['sio2jail', 'time'],
+        choices=['sio2jail', 'time', 'wait4', 'cgroups'],
         action='append',
         default=[],
         help='Time tool to use. Default: if linux - both, otherwise time'
@@ -96,22 +95,12 @@ def pytest_configure(config):
 
     # We remove tests cache as it may interfere with testing.
     for package in packages:
-        for md5sum_file in glob.glob(os.path.join(package, ".cache", "md5sums", "*")):
-            try:
-                with open(md5sum_file, "r") as f:
-                    data = yaml.load(f, Loader=yaml.FullLoader)
-
-                try:
-                    if "tests" in data and data["tests"] != {}:
-                        print(f"Removing tests cache for `{os.path.basename(md5sum_file)}`")
-                        data["tests"] = {}
-                        with open(md5sum_file, "w") as f:
-                            yaml.dump(data, f)
-                except TypeError:
-                    # Cache file is probably old/broken, we can delete it.
-                    os.unlink(md5sum_file)
-            except FileNotFoundError:
-                pass
+        cwd = os.getcwd()
+        os.chdir(package)
+        try:
+            cache.remove_results_cache()
+        finally:
+            os.chdir(cwd)
 
     oicompare.check_and_download()
 
@@ -148,6 +137,6 @@ def pytest_collection_modifyitems(config, items: List[pytest.Item]):
 
     for item in items:
         if "sio2jail" in item.keywords:
-            if not sio2jail.sio2jail_supported() or config.getoption("--time-tool") == ["time"] or \
+            if not sio2jail.sio2jail_supported() or "sio2jail" not in (config.getoption("--time-tool") or ["sio2jail"]) or \
                     config.getoption("--github-runner"):
                 item.add_marker(pytest.mark.skip(reason="sio2jail required"))
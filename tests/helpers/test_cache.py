@@ -1,4 +1,5 @@
 import os
+import shutil
 import tempfile
 
 import yaml
@@ -56,51 +57,56 @@ def test_cache():
             md5sum="md5sum",
             executable_path="abc.e",
             sanitizers='no',
-            tests={
-                "md5sum1": CacheTest(
-                    time_limit=1000,
-                    memory_limit=1024,
-                    time_tool="time",
-                    result=ExecutionResult(
-                        status=Status.OK,
-                        Time=0.5,
-                        Memory=512,
-                        Points=10,
-                    )
-                ),
-                "md5sum2": CacheTest(
-                    time_limit=2000,
-                    memory_limit=2048,
-                    time_tool="time",
-                    result=ExecutionResult(
-                        status=Status.OK,
-                        Time=1,
-                        Memory=1024,
-                        Points=20,
-                    )
-                ),
-            }
         )
+        results = {
+            "md5sum1": CacheTest(
+                time_limit=1000,
+                memory_limit=1024,
+                time_tool="time",
+                result=ExecutionResult(
+                    status=Status.OK,
+                    Time=0.5,
+                    Memory=512,
+                    Points=10,
+                )
+            ),
+            "md5sum2": CacheTest(
+                time_limit=2000,
+                memory_limit=2048,
+                time_tool="time",
+                result=ExecutionResult(
+                    status=Status.OK,
+                    Time=1,
+                    Memory=1024,
+                    Points=20,
+                )
+            ),
+        }
 
         with open("abc.cpp", "w") as f:
             f.write("int main() { return 0; }")
         cache_file.save("abc.cpp")
+        cache.save_test_results({"abc.cpp": results, "abc.py": results})
         assert cache.get_cache_file("abc.cpp") == cache_file
+        assert cache.get_test_results("abc.cpp") == results
+        # Recompiling a program removes only its own cached results.
+        cache.save_compiled("abc.cpp", "abc.e", "default", False)
+        assert cache.get_test_results("abc.cpp") == {}
+        assert cache.get_test_results("abc.py") == results
         cache.save_compiled("abc.cpp", "abc.e", "default", False,
                             clear_cache=True)
-        assert cache.get_cache_file("abc.cpp").tests == {}
+        assert cache.get_test_results("abc.py") == {}
 
         # Test if after changing contest type all cached test results are removed
-        cache_file.save("abc.cpp")
-        cache_file.save("abc.py")
+        cache.save_test_results({"abc.cpp": results, "abc.py": results})
 
         cache.remove_results_if_contest_type_changed("default")
-        assert cache.get_cache_file("abc.py") == cache_file
-        assert cache.get_cache_file("abc.cpp") == cache_file
+        assert cache.get_test_results("abc.py") == results
+        assert cache.get_test_results("abc.cpp") == results
 
         cache.remove_results_if_contest_type_changed("oi")
-        assert cache.get_cache_file("abc.py").tests == {}
-        assert cache.get_cache_file("abc.cpp").tests == {}
+        assert cache.get_test_results("abc.py") == {}
+        assert cache.get_test_results("abc.cpp") == {}
 
 
 def test_old_cache_file():
@@ -198,3 +204,109 @@ def test_extra_compilation_args_caching():
         assert cache.check_compiled(program, "default", "no") is None
         assert cache.check_compiled(
             program, "default", "no", package_util.get_extra_compilation_hash("cpp", ["-DBAR"], [])) is None
+
+
+def test_saving_test_results():
+    """
+    Test if new test results are saved without rewriting the already cached ones.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        cache.create_cache_dirs()
+        first = CacheTest(time_limit=1000, memory_limit=1024, time_tool="time",
+                          result=ExecutionResult(status=Status.OK, Time=10, Memory=100, Points=100))
+        second = CacheTest(time_limit=1500.5, memory_limit=2048, time_tool="sio2jail",
+                           result=ExecutionResult(status=Status.WA, Time=20, Memory=200, Points=0))
+
+        cache.save_test_results({"abc.cpp": {"md5sum1": first}})
+        cache.save_test_results({"abc.cpp": {"md5sum2": second}, "abc.py": {"md5sum1": second}})
+        assert cache.get_test_results("abc.cpp") == {"md5sum1": first, "md5sum2": second}
+        assert cache.get_test_results("abc.py") == {"md5sum1": second}
+
+        cache.remove_results_cache(["md5sum1"])
+        assert cache.get_test_results("abc.cpp") == {"md5sum2": second}
+        assert cache.get_test_results("abc.py") == {}
+
+        # Saving only the cache file doesn't touch the cached results.
+        CacheFile(md5sum="md5sum").save("abc.cpp")
+        assert cache.get_test_results("abc.cpp") == {"md5sum2": second}
+
+
+def test_old_cache_file_with_results():
+    """
+    Test if test results from cache files of older versions of sinol-make are moved to the cache database.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        cache.create_cache_dirs()
+        test = CacheTest(time_limit=1000, memory_limit=1024, time_tool="time",
+                         result=ExecutionResult(status=Status.OK, Time=10, Memory=100, Points=100))
+        contents = CacheFile(md5sum="md5sum").to_dict()
+        contents["tests"] = {"md5sum1": test.to_dict()}
+        with open(paths.get_cache_path("md5sums", "abc.cpp"), "w") as f:
+            yaml.dump(contents, f)
+
+        assert cache.get_cache_file("abc.cpp") == CacheFile(md5sum="md5sum")
+        cache.migrate_results_cache()
+        with open(paths.get_cache_path("md5sums", "abc.cpp"), "r") as f:
+            assert "tests" not in yaml.load(f, Loader=yaml.FullLoader)
+        assert cache.get_cache_file("abc.cpp") == CacheFile(md5sum="md5sum")
+        assert cache.get_test_results("abc.cpp") == {"md5sum1": test}
+
+
+def test_test_results_writer():
+    """
+    Test if test results saved with `test_results_writer` are visible immediately, before the writer is closed.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        cache.create_cache_dirs()
+        first = CacheTest(time_limit=1000, memory_limit=1024, time_tool="time",
+                          result=ExecutionResult(status=Status.OK, Time=10, Memory=100, Points=100))
+        second = CacheTest(time_limit=1000, memory_limit=1024, time_tool="time",
+                           result=ExecutionResult(status=Status.TL, Time=1000, Memory=100, Points=0))
+
+        with cache.test_results_writer() as save_test_result:
+            save_test_result("prog/abc.cpp", "md5sum1", first)
+            assert cache.get_test_results("abc.cpp") == {"md5sum1": first}
+            save_test_result("prog/abc.cpp", "md5sum2", second)
+            save_test_result("prog/abc.cpp", "md5sum1", second)
+            assert cache.get_test_results("abc.cpp") == {"md5sum1": second, "md5sum2": second}
+        assert cache.get_test_results("abc.cpp") == {"md5sum1": second, "md5sum2": second}
+
+
+def test_workdir():
+    """
+    Test if scratch directories are moved to the work directory and back, and if the work directory
+    isn't used when it doesn't have enough free space.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as workdir:
+        os.chdir(tmpdir)
+        cache.create_cache_dirs()
+        with open(paths.get_executions_path("old.out"), "w") as f:
+            f.write("old")
+
+        cache.setup_workdir(workdir)
+        for name in cache.SCRATCH_DIRS:
+            assert os.path.islink(paths.get_cache_path(name))
+            assert os.path.realpath(paths.get_cache_path(name)).startswith(os.path.realpath(workdir))
+        assert os.listdir(paths.get_executions_path()) == []
+        with open(paths.get_executions_path("new.out"), "w") as f:
+            f.write("new")
+        assert len(os.listdir(workdir)) == 1
+
+        # Removed work directory, for example after a reboot.
+        shutil.rmtree(os.path.join(workdir, os.listdir(workdir)[0]))
+        cache.create_cache_dirs()
+        assert os.path.isdir(paths.get_executions_path()) and not os.path.islink(paths.get_executions_path())
+
+        cache.setup_workdir(workdir)
+        cache.setup_workdir(workdir, shutil.disk_usage(workdir).free)
+        for name in cache.SCRATCH_DIRS:
+            assert os.path.isdir(paths.get_cache_path(name))
+            assert not os.path.islink(paths.get_cache_path(name))
+
+        cache.setup_workdir(workdir)
+        cache.setup_workdir(None)
+        for name in cache.SCRATCH_DIRS:
+            assert not os.path.islink(paths.get_cache_path(name))
@@ -1,7 +1,9 @@
 import os
 import pytest
 import tempfile
+import subprocess
 
+from sinol_make.helpers import compile
 from sinol_make.helpers.cache import save_compiled, check_compiled, create_cache_dirs
 from tests import util
 from tests.fixtures import create_package
@@ -37,3 +39,30 @@ def test_large_failed_output(create_package):
 
     with pytest.raises(SystemExit):
         simple_run(["prog/geningen2.cpp"])
+
+
+def test_link_compiled(tmpdir):
+    """
+    Test if identical programs share the executable and if compiling one of them again doesn't change the other.
+    """
+    os.chdir(tmpdir)
+    create_cache_dirs()
+    for name in ["a.cpp", "b.cpp"]:
+        with open(os.path.join(tmpdir, name), "w") as f:
+            f.write("int main() { return 0; }\n")
+    a, b = os.path.join(tmpdir, "a.cpp"), os.path.join(tmpdir, "b.cpp")
+    assert compile.get_compilation_key(a) == compile.get_compilation_key(b)
+    assert compile.get_compilation_key(a) != compile.get_compilation_key(a, "weak")
+
+    with open(os.path.join(tmpdir, "a.compile.log"), "w") as log:
+        assert compile.compile(a, os.path.join(tmpdir, "a.e"), compile_log=log)
+    compile.link_compiled(b, os.path.join(tmpdir, "a.e"), os.path.join(tmpdir, "b.e"))
+    assert compile.is_compiled(b)
+    assert os.path.samefile(os.path.join(tmpdir, "a.e"), os.path.join(tmpdir, "b.e"))
+
+    with open(a, "w") as f:
+        f.write("int main() { return 1; }\n")
+    with open(os.path.join(tmpdir, "a.compile.log"), "w") as log:
+        assert compile.compile(a, os.path.join(tmpdir, "a.e"), compile_log=log)
+    assert not os.path.samefile(os.path.join(tmpdir, "a.e"), os.path.join(tmpdir, "b.e"))
+    assert subprocess.run([os.path.join(tmpdir, "b.e")]).returncode == 0
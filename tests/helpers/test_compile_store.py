@@ -0,0 +1,64 @@
+import os
+import time
+
+from sinol_make.helpers import compile, compile_store, probe_cache
+from sinol_make.helpers.cache import create_cache_dirs
+
+
+def _create_package(path, header):
+    os.makedirs(os.path.join(path, "prog"))
+    with open(os.path.join(path, "prog", "abc.cpp"), "w") as f:
+        f.write('#include "abc.h"\nint main() { return VALUE; }\n')
+    with open(os.path.join(path, "prog", "abc.h"), "w") as f:
+        f.write(header)
+
+
+def _compile(path):
+    os.chdir(path)
+    create_cache_dirs()
+    program = os.path.join(path, "prog", "abc.cpp")
+    output = os.path.join(path, "abc.e")
+    with open(os.path.join(path, "abc.compile.log"), "w") as log:
+        assert compile.compile(program, output, compile_log=log)
+    with open(os.path.join(path, "abc.compile.log"), "r") as log:
+        return "shared compile store" in log.read()
+
+
+def test_compile_store(tmpdir, monkeypatch):
+    """
+    Tests if executables are reused between packages and if programs including different headers aren't.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir.join("cache")))
+    monkeypatch.setenv(compile_store.STORE_SIZE_VARIABLE, "100M")
+    monkeypatch.setattr(probe_cache, "__probes", None)
+    for name, header in [("first", "#define VALUE 0\n"), ("second", "#define VALUE 0\n"), ("third", "#define VALUE 1\n")]:
+        _create_package(str(tmpdir.join(name)), header)
+
+    assert not _compile(str(tmpdir.join("first")))
+    assert _compile(str(tmpdir.join("second")))
+    assert os.access(str(tmpdir.join("second", "abc.e")), os.X_OK)
+    assert not _compile(str(tmpdir.join("third")))
+
+    monkeypatch.delenv(compile_store.STORE_SIZE_VARIABLE)
+    os.remove(str(tmpdir.join("first", ".cache", "md5sums", "abc.cpp")))
+    assert not _compile(str(tmpdir.join("first")))
+
+
+def test_evict(tmpdir, monkeypatch):
+    """
+    Tests if the least recently used executables are removed when the store is too big.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir.join("cache")))
+    executable = str(tmpdir.join("exe"))
+    with open(executable, "w") as f:
+        f.write("x" * 100)
+
+    for key in ["aa1", "bb2", "cc3"]:
+        compile_store.save(key, executable, 1000)
+        time.sleep(0.01)
+    assert compile_store.restore("aa1", str(tmpdir.join("restored")))
+    compile_store.save("dd4", executable, 350)
+    assert compile_store.restore("aa1", str(tmpdir.join("restored")))
+    assert not compile_store.restore("bb2", str(tmpdir.join("restored")))
+    assert compile_store.restore("cc3", str(tmpdir.join("restored")))
+    assert compile_store.restore("dd4", str(tmpdir.join("restored")))
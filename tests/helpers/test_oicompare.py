@@ -1,3 +1,6 @@
+import os
+import re
+import random
 import tempfile
 
 from sinol_make.helpers import oicompare
@@ -29,3 +32,115 @@ def test_oicompare():
                 f1.write(file1)
                 f2.write(file2)
             assert oicompare.compare(tmpdir + f"/file1_{i}.txt", tmpdir + f"/file2_{i}.txt") == expected, f"Swapped test {i} failed"
+
+
+def _strip_line(s):
+    return re.sub(r'[\s\0]+', ' ', s).strip()
+
+
+def _compare_lines(file1_path, file2_path):
+    """
+    Line by line implementation of `oicompare.compare` used before, which is slow, but simple.
+    """
+    with open(file1_path, "r", encoding="utf-8") as file1, \
+            open(file2_path, "r", encoding="utf-8") as file2:
+        eof1 = False
+        eof2 = False
+        while True:
+            try:
+                line1 = _strip_line(next(file1))
+            except StopIteration:
+                eof1 = True
+            try:
+                line2 = _strip_line(next(file2))
+            except StopIteration:
+                eof2 = True
+
+            if eof1 and eof2:
+                return True
+            if eof1:
+                while line2 == "":
+                    try:
+                        line2 = _strip_line(next(file2))
+                    except StopIteration:
+                        eof2 = True
+                        break
+            elif eof2:
+                while line1 == "":
+                    try:
+                        line1 = _strip_line(next(file1))
+                    except StopIteration:
+                        eof1 = True
+                        break
+                    if line1 != "":
+                        break
+
+            if eof1 and eof2:
+                return True
+            if (eof1 and line2 == "") or (eof2 and line1 == ""):
+                continue
+            if (eof1 and line2 != "") or (eof2 and line1 != ""):
+                return False
+            if line1 != line2:
+                return False
+
+
+def test_oicompare_differential(tmpdir):
+    """
+    Compares `oicompare.compare` with the line by line implementation on random files,
+    also with small parts, so lines and whitespace are split between them.
+    """
+    random.seed(0)
+    alphabet = ["a", "b", "1", " ", "  ", "\t", "\n", "\n", "\r", "\r\n", "\0", "\x0b", "\x0c", "\x1c", "\x1f",
+                "\x85", "\xa0", "\u2028", "\u3000", "\u0105", "\n\n"]
+    file1_path = os.path.join(tmpdir, "file1.txt")
+    file2_path = os.path.join(tmpdir, "file2.txt")
+    for i in range(2000):
+        text = "".join(random.choice(alphabet) for _ in range(random.randint(0, 30)))
+        # Most of the pairs differ only in whitespace, so they are likely to be the same.
+        other = "".join(random.choice([" ", "\t", "\0", "\n", ""]) if c.isspace() or c == "\0" else c for c in text)
+        if random.random() < 0.2:
+            other = "".join(random.choice(alphabet) for _ in range(random.randint(0, 30)))
+        with open(file1_path, "w", encoding="utf-8", newline="") as f1, \
+                open(file2_path, "w", encoding="utf-8", newline="") as f2:
+            f1.write(text)
+            f2.write(other)
+        expected = _compare_lines(file1_path, file2_path)
+        for chunk_size in [1, 2, 7, oicompare.COMPARE_CHUNK_SIZE]:
+            assert oicompare.compare(file1_path, file2_path, chunk_size) == expected, \
+                f"Test {i} failed for {text!r} and {other!r} with parts of {chunk_size} bytes"
+
+
+def test_stream_comparator(tmpdir):
+    """
+    Tests if `StreamComparator` gives the same results as `compare` for outputs passed in random parts
+    and if it finds the line with the first difference.
+    """
+    random.seed(0)
+    alphabet = ["a", "1", " ", "\t", "\n", "\n", "\r\n", "\0", "\xa0"]
+    file1_path = os.path.join(tmpdir, "file1.txt")
+    file2_path = os.path.join(tmpdir, "file2.txt")
+    for i in range(1000):
+        text = "".join(random.choice(alphabet) for _ in range(random.randint(0, 30)))
+        other = "".join(random.choice([" ", "\n", ""]) if c.isspace() else c for c in text)
+        with open(file1_path, "w", encoding="utf-8", newline="") as f1, \
+                open(file2_path, "w", encoding="utf-8", newline="") as f2:
+            f1.write(text)
+            f2.write(other)
+        expected = oicompare.compare(file1_path, file2_path)
+        for chunk_size in [1, 5, oicompare.COMPARE_CHUNK_SIZE]:
+            comparator = oicompare.StreamComparator(file2_path, chunk_size)
+            data = text.encode("utf-8")
+            while data:
+                length = random.randint(1, 8)
+                comparator.write(data[:length])
+                data = data[length:]
+            assert comparator.finish() == expected, f"Test {i} failed for {text!r} and {other!r}"
+
+    with open(file2_path, "w") as f:
+        f.write("1 2\n3 4\n5 6\n")
+    for output, line in [("1 2\n3  4\n5 7\n", 3), ("1 2\n3 4\n5 6\n7\n", 4), ("1 2\n", 2), ("1 3", 1)]:
+        comparator = oicompare.StreamComparator(file2_path, 1)
+        comparator.write(output.encode())
+        assert not comparator.finish()
+        assert comparator.difference_line == line, f"Wrong line for {output!r}"
@@ -1,3 +1,4 @@
+import argparse
 import pytest
 
 from ..commands.run.util import create_ins
@@ -216,6 +217,52 @@ def test_get_memory_limit():
         assert package_util.get_memory_limit("in/abc2a.in", config, "py", "abc") == 512
 
 
+def test_get_limits():
+    config = {
+        "time_limit": 1000,
+        "time_limits": {
+            "0": 5000,
+            "2": 2000,
+        },
+        "memory_limit": 256,
+        "memory_limits": {
+            "2": 512,
+        },
+        "override_limits": {
+            "py": {
+                "time_limit": 2000,
+                "memory_limits": {
+                    "0": 256,
+                },
+            }
+        }
+    }
+    tests = ["in/abc0a.in", "in/abc1a.in", "in/abc2a.in", "in/abc2b.in"]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        with open("config.yml", "w") as f:
+            f.write("")
+        limits = package_util.get_limits(tests, ["cpp", "py", "cpp"], config, "abc")
+        assert limits == {
+            "cpp": {"in/abc0a.in": (5000, 256), "in/abc1a.in": (1000, 256), "in/abc2a.in": (2000, 512),
+                    "in/abc2b.in": (2000, 512)},
+            "py": {"in/abc0a.in": (2000, 256), "in/abc1a.in": (2000, 256), "in/abc2a.in": (2000, 512),
+                   "in/abc2b.in": (2000, 512)},
+        }
+        for lang in ["cpp", "py"]:
+            for test in tests:
+                assert limits[lang][test] == (package_util.get_time_limit(test, config, lang, "abc"),
+                                              package_util.get_memory_limit(test, config, lang, "abc"))
+
+        args = argparse.Namespace(tl=1.5, ml=None)
+        assert package_util.get_limits(["in/abc1a.in"], ["cpp"], config, "abc", args) == {"cpp": {"in/abc1a.in": (1500, 256)}}
+
+        del config["time_limit"]
+        with pytest.raises(SystemExit):
+            package_util.get_limits(tests, ["cpp"], config, "abc")
+
+
 @pytest.mark.parametrize("create_package", [util.get_simple_package_path()], indirect=True)
 def test_validate_files(create_package, capsys):
     package_path = create_package
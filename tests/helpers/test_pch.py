@@ -0,0 +1,44 @@
+import os
+import glob
+import subprocess
+
+from sinol_make.helpers import compile, pch, probe_cache
+from sinol_make.helpers.cache import create_cache_dirs
+
+
+def _compile(tmpdir, name, source):
+    program = str(tmpdir.join(name + ".cpp"))
+    output = str(tmpdir.join(name + ".e"))
+    with open(program, "w") as f:
+        f.write(source)
+    with open(str(tmpdir.join(name + ".compile.log")), "w") as log:
+        assert compile.compile(program, output, compile_log=log)
+    return subprocess.run([output], stdout=subprocess.PIPE).stdout.decode()
+
+
+def test_precompiled_header(tmpdir, monkeypatch):
+    """
+    Tests if `bits/stdc++.h` is precompiled once for programs which include it and if they still compile correctly.
+    """
+    os.chdir(tmpdir)
+    create_cache_dirs()
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir.join("cache")))
+    monkeypatch.setattr(probe_cache, "__probes", None)
+    precompiled = os.path.join(pch.get_pch_path(), "*", "include", "bits", "stdc++.h.gch")
+
+    assert _compile(tmpdir, "plain", '#include <cstdio>\nint main() { printf("1"); }\n') == "1"
+    assert glob.glob(precompiled) == []
+
+    monkeypatch.setenv(pch.PCH_VARIABLE, "0")
+    source = '#include <bits/stdc++.h>\nint main() { std::vector<int> v(%d); std::cout << v.size(); }\n'
+    assert _compile(tmpdir, "disabled", source % 2) == "2"
+    assert glob.glob(precompiled) == []
+
+    monkeypatch.delenv(pch.PCH_VARIABLE)
+    assert _compile(tmpdir, "first", source % 3) == "3"
+    headers = glob.glob(precompiled)
+    assert len(headers) == 1
+    modified = os.path.getmtime(headers[0])
+    assert _compile(tmpdir, "second", source % 4) == "4"
+    assert glob.glob(precompiled) == headers
+    assert os.path.getmtime(headers[0]) == modified
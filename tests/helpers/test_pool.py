@@ -0,0 +1,101 @@
+import os
+import time
+
+import pytest
+
+from sinol_make.helpers import pool
+
+
+def _worker_cwd(_):
+    return os.getcwd()
+
+
+def _fail(x):
+    if x == 0:
+        raise ValueError("failed")
+    return x
+
+
+def test_shared_pool(tmpdir):
+    """
+    Tests if the pool is reused and if workers run tasks in the current directory.
+    """
+    first_dir = os.path.join(tmpdir, "first")
+    second_dir = os.path.join(tmpdir, "second")
+    os.makedirs(first_dir)
+    os.makedirs(second_dir)
+    os.chdir(first_dir)
+    assert list(pool.imap(_worker_cwd, range(10), 2)) == [first_dir] * 10
+    first_pool = pool.get_pool(2)
+
+    os.chdir(second_dir)
+    assert pool.starmap(_worker_cwd, [(i,) for i in range(10)], 2) == [second_dir] * 10
+    assert pool.get_pool(2) is first_pool
+
+
+def test_pool_terminated_on_error(tmpdir):
+    """
+    Tests if the pool is replaced after the results of `imap` weren't consumed.
+    """
+    os.chdir(tmpdir)
+    first_pool = pool.get_pool(2)
+    with pytest.raises(ValueError):
+        for _ in pool.imap(_fail, range(10), 2):
+            pass
+    assert pool.get_pool(2) is not first_pool
+    assert list(pool.imap(_fail, range(1, 5), 2)) == [1, 2, 3, 4]
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def test_imap_unordered(tmpdir):
+    """
+    Tests if `imap_unordered` returns results as soon as they are ready, with their indexes and times.
+    """
+    os.chdir(tmpdir)
+    results = list(pool.imap_unordered(_sleep, [0.5, 0, 0], 2))
+    assert [index for index, _, _ in results][-1] == 0
+    assert sorted((index, result) for index, result, _ in results) == [(0, 0.5), (1, 0), (2, 0)]
+    assert [task_time for index, _, task_time in results if index == 0][0] >= 0.5
+
+
+def test_imap_unordered_skip(tmpdir):
+    """
+    Tests if `imap_unordered` doesn't run the tasks which are skipped based on results of previous tasks.
+    """
+    os.chdir(tmpdir)
+    finished = []
+    for index, result, _ in pool.imap_unordered(_sleep, [0, 0, 0, 0], 1, lambda item: len(finished) >= 2):
+        finished.append((index, result))
+    assert finished == [(0, 0), (1, 0), (2, None), (3, None)]
+
+
+
+def _sleep_item(item):
+    return _sleep(item[1])
+
+
+def test_imap_unordered_after(tmpdir):
+    """
+    Tests if tasks start as soon as their prerequisites finish, while other prerequisites are still running,
+    and if tasks of failed prerequisites aren't run.
+    """
+    os.chdir(tmpdir)
+    events = []
+
+    def on_prerequisite(index, result):
+        events.append(("prerequisite", index))
+        return index != 2
+
+    # Items are pairs (indexes of the prerequisites, seconds).
+    items = [([0], 0), ([0], 0), ([0, 2], 0)]
+    for index, result, _ in pool.imap_unordered_after(_sleep_item, items, 2, _sleep, [0, 1, 0],
+                                                       lambda item: item[0], on_prerequisite):
+        events.append(("item", index, result))
+    assert sorted(events) == [("item", 0, 0), ("item", 1, 0), ("item", 2, None),
+                              ("prerequisite", 0), ("prerequisite", 1), ("prerequisite", 2)]
+    assert events.index(("item", 0, 0)) < events.index(("prerequisite", 1))
+    assert events.index(("item", 1, 0)) < events.index(("prerequisite", 1))
@@ -0,0 +1,56 @@
+import os
+import time
+
+from sinol_make.helpers import probe_cache, compiler
+
+
+def test_cached_probe(tmpdir, monkeypatch):
+    """
+    Tests if results of probes are reused between invocations, and if they are computed again
+    when the probed program changes or appears.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir.join("cache")))
+    monkeypatch.setattr(probe_cache, "__probes", None)
+    program = str(tmpdir.join("program"))
+    calls = []
+
+    def probe():
+        calls.append(1)
+        return len(calls)
+
+    assert probe_cache.cached_probe("test", program, probe) == 1
+    assert probe_cache.cached_probe("test", program, probe) == 1
+    with open(program, "w") as f:
+        f.write("#!/bin/sh\n")
+    os.chmod(program, 0o755)
+    assert probe_cache.cached_probe("test", program, probe) == 2
+    assert probe_cache.cached_probe("test", program, probe) == 2
+    assert probe_cache.cached_probe("test", program, probe, extra_key=1) == 3
+
+    # Cache is loaded from the file in a new invocation.
+    monkeypatch.setattr(probe_cache, "__probes", None)
+    assert probe_cache.cached_probe("test", program, probe, extra_key=1) == 3
+    time.sleep(0.01)
+    with open(program, "w") as f:
+        f.write("#!/bin/sh\necho changed\n")
+    assert probe_cache.cached_probe("test", program, probe, extra_key=1) == 4
+    assert len(calls) == 4
+
+
+def test_check_if_installed(tmpdir, monkeypatch):
+    """
+    Tests if compilers which were already found aren't run again.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir.join("cache")))
+    monkeypatch.setattr(probe_cache, "__probes", None)
+    program = str(tmpdir.join("compiler"))
+    counter = str(tmpdir.join("counter"))
+    with open(program, "w") as f:
+        f.write(f"#!/bin/sh\necho run >> {counter}\n")
+    os.chmod(program, 0o755)
+
+    assert compiler.check_if_installed(program)
+    assert compiler.check_if_installed(program)
+    with open(counter, "r") as f:
+        assert f.read() == "run\n"
+    assert not compiler.check_if_installed(str(tmpdir.join("missing")))
@@ -0,0 +1,151 @@
+import os
+import sys
+import time
+import signal
+import resource
+import subprocess
+
+import pytest
+
+from sinol_make.executors import ProcessWaiter
+from sinol_make.executors.cgroups import CgroupExecutor, cgroups_supported
+from sinol_make.executors.detailed import DetailedExecutor
+from sinol_make.executors.wait4 import Wait4Executor
+from sinol_make.structs.status_structs import Status
+
+
+def _cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def test_process_waiter():
+    """
+    Tests if ProcessWaiter waits for the given time and returns as soon as the process exits.
+    """
+    process = subprocess.Popen(["sleep", "0.3"])
+    with ProcessWaiter(process) as waiter:
+        start = time.time()
+        assert not waiter.wait(0.1)
+        assert time.time() - start >= 0.09
+        assert waiter.wait(5)
+        assert time.time() - start < 1
+    assert process.returncode == 0
+
+    # Process which already exited.
+    with ProcessWaiter(process) as waiter:
+        assert waiter.wait(0)
+
+
+def test_executor_doesnt_busy_wait(tmpdir):
+    """
+    Tests if the executor doesn't use the CPU while the program is running and if it kills the program
+    after the hard time limit.
+    """
+    executor = DetailedExecutor()
+    result_file = os.path.join(tmpdir, "result")
+
+    start_cpu = _cpu_time()
+    start = time.time()
+    result = executor.execute(["sleep", "1"], 2000, 4, 65536, result_file, "sleep", str(tmpdir))
+    assert result.Status == Status.OK
+    assert time.time() - start < 2
+    assert _cpu_time() - start_cpu < 0.3
+
+    start = time.time()
+    executor.execute(["sleep", "10"], 100, 0.5, 65536, result_file, "sleep", str(tmpdir))
+    assert time.time() - start < 2
+
+
+def test_wait4_executor(tmpdir):
+    """
+    Tests if the wait4 executor measures time and memory and detects runtime errors and exceeded limits.
+    """
+    executor = Wait4Executor()
+    result_file = os.path.join(tmpdir, "result")
+    python = sys.executable
+
+    result = executor.execute([python, "-c", "for i in range(10**7): pass"], 10000, 20, 262144, result_file,
+                              "python", str(tmpdir))
+    assert result.Status == Status.OK
+    assert result.Time > 0
+    assert 0 < result.Memory < 262144
+    assert not os.path.exists(result_file)
+
+    result = executor.execute([python, "-c", 'a = "x" * (100 * 2**20)'],
+                              10000, 20, 262144, result_file, "python", str(tmpdir))
+    assert result.Status == Status.OK
+    assert result.Memory > 100 * 1024
+
+    # Peak memory usage of the test process mustn't be reported as the memory usage of the program.
+    memory = b"x" * (200 * 2**20)
+    result = executor.execute(["sleep", "0.1"], 10000, 20, 262144, result_file, "sleep", str(tmpdir))
+    assert result.Status == Status.OK
+    assert result.Memory < 100 * 1024
+    del memory
+
+    result = executor.execute([python, "-c", "exit(3)"], 10000, 20, 262144, result_file, "python", str(tmpdir))
+    assert result.Status == Status.RE
+    assert "exited with code 3" in result.Error
+
+    result = executor.execute([python, "-c", "import os; os.abort()"], 10000, 20, 262144, result_file, "python",
+                              str(tmpdir))
+    assert result.Status == Status.RE
+    assert result.ExitSignal == signal.SIGABRT
+
+    start = time.time()
+    result = executor.execute(["sleep", "10"], 100, 0.5, 65536, result_file, "sleep", str(tmpdir))
+    assert result.Status == Status.TL
+    assert time.time() - start < 2
+
+    result = executor.execute([python, "-c", "a = bytearray(512 * 2**20); import time; time.sleep(10)"],
+                              10000, 20, 65536, result_file, "python", str(tmpdir))
+    assert result.Status == Status.ML
+    # Task types compare the time of every result with the time limit.
+    assert result.Time is not None and result.Time < 10000
+    assert executor._results == {}
+
+
+@pytest.mark.skipif(not cgroups_supported(), reason="cgroup v2 with memory controller required")
+def test_cgroup_executor(tmpdir):
+    """
+    Tests if the cgroup executor measures time and memory, enforces the memory limit and removes its cgroups.
+    """
+    executor = CgroupExecutor()
+    result_file = os.path.join(tmpdir, "result")
+    python = sys.executable
+
+    result = executor.execute([python, "-c", 'a = "x" * (100 * 2**20); [i for i in range(10**6)]'],
+                              10000, 20, 262144, result_file, "python", str(tmpdir))
+    assert result.Status == Status.OK
+    assert result.Time > 0
+    assert 100 * 1024 < result.Memory < 262144
+
+    result = executor.execute([python, "-c", 'a = "x" * (100 * 2**20)'], 10000, 20, 65536, result_file,
+                              "python", str(tmpdir))
+    assert result.Status == Status.ML
+
+    result = executor.execute([python, "-c", "import os; os.abort()"], 10000, 20, 262144, result_file, "python",
+                              str(tmpdir))
+    assert result.Status == Status.RE
+    assert result.ExitSignal == signal.SIGABRT
+
+    result = executor.execute(["sleep", "10"], 100, 0.5, 65536, result_file, "sleep", str(tmpdir))
+    assert result.Status == Status.TL
+    assert [name for name in os.listdir(executor.cgroup_path) if name.startswith(f"sinol-make-{os.getpid()}-")] == []
+
+
+def test_executors_dont_use_shell(tmpdir):
+    """
+    Tests if executors run the command directly, so arguments don't have to be quoted.
+    """
+    program = os.path.join(tmpdir, "program with $pace")
+    with open(program, "w") as f:
+        f.write("#!/bin/sh\n[ \"$1\" = \"a b\" ] && [ \"$2\" = \"'c'\" ]\n")
+    os.chmod(program, 0o755)
+    result_file = os.path.join(tmpdir, "result")
+
+    for executor in [DetailedExecutor(), Wait4Executor()]:
+        result = executor.execute([program, "a b", "'c'"], 10000, 20, 65536, result_file, program, str(tmpdir))
+        assert result.Status == Status.OK
+        assert result.Cmdline == f"'{program}' 'a b' ''\"'\"'c'\"'\"''"
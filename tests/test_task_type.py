@@ -1,7 +1,9 @@
 import os
 import pytest
 
-from sinol_make.helpers import oicompare
+from sinol_make.executors.wait4 import Wait4Executor
+from sinol_make.helpers import cache, oicompare
+from sinol_make.structs.status_structs import Status
 from sinol_make.task_type import BaseTaskType
 from sinol_make.task_type.normal import NormalTaskType
 
@@ -32,3 +34,76 @@ def test_oicompare_arguments_order(tmpdir):
     assert correct
     assert points == 100
     assert comment == ""
+
+
+def test_checker_cache(tmpdir):
+    """
+    Tests if verdicts of identical outputs are taken from the cache and if changed outputs are checked again.
+    """
+    os.chdir(tmpdir)
+    cache.create_cache_dirs()
+    paths_ = {name: os.path.join(tmpdir, name) for name in ["in.in", "out1.out", "out2.out", "ans.out"]}
+    for name, content in [("in.in", "1 2\n"), ("out1.out", "3\n"), ("out2.out", "3\n"), ("ans.out", "3\n")]:
+        with open(paths_[name], "w") as f:
+            f.write(content)
+
+    task_type = BaseTaskType.__new__(NormalTaskType)
+    task_type.has_checker = False
+    calls = []
+    check = task_type._check_output
+    task_type._check_output = lambda *args: calls.append(args) or check(*args)
+
+    result, cached = task_type.check_output_cached(paths_["in.in"], paths_["out1.out"], paths_["ans.out"])
+    assert result == (True, 100, "", "") and not cached
+    result, cached = task_type.check_output_cached(paths_["in.in"], paths_["out2.out"], paths_["ans.out"])
+    assert result == (True, 100, "", "") and cached
+    assert len(calls) == 1
+
+    with open(paths_["out2.out"], "w") as f:
+        f.write("4\n")
+    correct, points, _, _ = task_type.check_output(paths_["in.in"], paths_["out2.out"], paths_["ans.out"])
+    assert not correct and points == 0
+    assert len(calls) == 2
+
+
+def test_stream_outputs(tmpdir):
+    """
+    Tests if outputs are compared with answers without being saved, and if only the part of a wrong output
+    starting from the first difference is saved.
+    """
+    os.chdir(tmpdir)
+    executable = os.path.join(tmpdir, "sol.sh")
+    with open(executable, "w") as f:
+        f.write("#!/bin/sh\ncat\n")
+    os.chmod(executable, 0o755)
+    paths_ = {name: os.path.join(tmpdir, name) for name in ["in.in", "out.out", "ans.out", "res.res"]}
+    answer = "".join(f"{i} {i * i}\n" for i in range(200000))
+    with open(paths_["ans.out"], "w") as f:
+        f.write(answer)
+
+    task_type = BaseTaskType.__new__(NormalTaskType)
+    task_type.has_checker = False
+    task_type.stream_outputs = True
+    task_type.executor = Wait4Executor()
+
+    def run(input_):
+        with open(paths_["in.in"], "w") as f:
+            f.write(input_)
+        return task_type.run(10000, 10000, 1024 * 1024, paths_["in.in"], paths_["out.out"], paths_["ans.out"],
+                             paths_["res.res"], executable, tmpdir)
+
+    result = run(answer.replace("\n", "  \n"))
+    assert result.Status == Status.OK
+    assert result.Points == 100
+    assert not os.path.exists(paths_["out.out"])
+
+    lines = answer.splitlines(keepends=True)
+    lines[150000] = "1 2\n"
+    result = run("".join(lines))
+    assert result.Status == Status.WA
+    assert result.Points == 0
+    assert "line 150001" in result.Comment
+    with open(paths_["out.out"], "r") as f:
+        saved = f.read()
+    assert "".join(lines).endswith(saved)
+    assert saved.find("1 2\n") >= 0
@@ -1,8 +1,10 @@
 import os
 import shutil
+import subprocess
 import sys
 import time
 import json
+import hashlib
 import tempfile
 import requests
 import resource
@@ -130,3 +132,105 @@ def test_saving_config_with_subtask_dependencies(create_package, capsys):
     with open(config_path, "r") as config_file:
         config = yaml.load(config_file, Loader=yaml.FullLoader)
     assert config["subtask_dependencies"] == {2: [1], 3: [1, 2]}
+
+
+def test_file_md5_index():
+    """
+    Test if hashes of files which didn't change are read from the hash index.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        file = os.path.join(tmpdir, "test.in")
+        with open(file, "w") as f:
+            f.write("1 2 3")
+        # Without the cache directory the index isn't used.
+        assert util.get_file_md5(file) == util._calculate_file_md5(file)
+        assert not os.path.exists(paths.get_cache_path())
+
+        os.makedirs(paths.get_cache_path())
+        # Recently modified files aren't stored in the index.
+        assert util.get_file_md5(file) == util._calculate_file_md5(file)
+        with open(file, "w") as f:
+            f.write("4 5 6")
+        assert util.get_file_md5(file) == util._calculate_file_md5(file)
+
+        old_time = time.time_ns() - 10 ** 10
+        os.utime(file, ns=(old_time, old_time))
+        md5 = util.get_file_md5(file)
+        # Content is changed without changing the size and modification time,
+        # so the hash from the index is returned.
+        with open(file, "w") as f:
+            f.write("7 8 9")
+        os.utime(file, ns=(old_time, old_time))
+        assert util.get_file_md5(file) == md5
+        os.utime(file, ns=(old_time + 1, old_time + 1))
+        assert util.get_file_md5(file) == util._calculate_file_md5(file) != md5
+
+
+def test_get_files_md5():
+    """
+    Test if md5 sums of many files (including ones larger than a single hashed chunk) are correct.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        contents = {
+            "empty.in": b"",
+            "small.in": b"1 2 3\n",
+            "large.in": os.urandom(3 * 1024 * 1024 + 17),
+        }
+        for name, content in contents.items():
+            with open(name, "wb") as f:
+                f.write(content)
+        expected = {name: hashlib.md5(content).hexdigest() for name, content in contents.items()}
+
+        assert util.get_files_md5(list(contents)) == expected
+        os.makedirs(paths.get_cache_path())
+        old_time = time.time_ns() - 10 ** 10
+        for name in contents:
+            os.utime(name, ns=(old_time, old_time))
+        assert util.get_files_md5(list(contents)) == expected
+        # Second time the hashes are read from the index.
+        assert util.get_files_md5(list(contents)) == expected
+        assert util.get_file_md5("large.in") == expected["large.in"]
+
+
+def test_commands():
+    """
+    Tests if names, short names and help messages of commands in `util.COMMANDS` match the commands.
+    """
+    parser = configure_parsers()
+    subparsers = next(action for action in parser._actions if action.dest == "command")
+    helps = {action.dest: action.help for action in subparsers._choices_actions}
+    assert sorted(os.listdir(os.path.join(os.path.dirname(util.__file__), "commands"))) == \
+           sorted(util.COMMANDS)
+    for name, (short_name, help) in util.COMMANDS.items():
+        command = util.get_command(name)
+        assert command.get_name() == name
+        assert command.get_short_name() == short_name
+        assert helps[name] == help
+
+
+# Budget for the cumulative time (in microseconds) of importing sinol_make, as reported by `-X importtime`.
+IMPORT_TIME_BUDGET = 100000
+
+
+def test_import_time():
+    """
+    Tests if showing the help doesn't import modules of commands or slow dependencies,
+    and if importing sinol-make fits in the budget.
+    """
+    code = "import sinol_make; sinol_make.configure_parsers([]).format_help()"
+    times = []
+    for _ in range(3):
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], stderr=subprocess.PIPE,
+                                 check=True, env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+        imports = {}
+        for line in process.stderr.decode().splitlines():
+            if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+                _, cumulative, module = line[len("import time:"):].split("|")
+                imports[module.strip()] = int(cumulative)
+        for module in ["requests", "yaml", "psutil", "sinol_make.helpers.package_util"]:
+            assert module not in imports, f"{module} is imported on startup"
+        assert not any(module.startswith("sinol_make.commands") for module in imports)
+        times.append(imports["sinol_make"])
+    assert min(times) < IMPORT_TIME_BUDGET, f"Importing sinol_make took {min(times) / 1000:.0f}ms"